@@ -5,9 +5,52 @@ Uses multi-model AI strategy for intelligent analysis
 """
 
 import re
+import sys
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from ai_service import AIService
+from keyword_matcher import KeywordMatcher, GroupMatcher
+
+# Optional dependency: RE2 (google-re2) matches in linear time, so the lazy
+# highlight pattern can't backtrack badly on long resumes
+try:
+    import re2 as _regex
+except ImportError:
+    _regex = re
+
+
+# Precompiled patterns used on every analysis (section/metric patterns
+# run against the already-lowercased resume). Flags are inline so the same
+# pattern strings compile under both RE2 and the stdlib engine.
+_YEARS_RE = _regex.compile(r'(\d+)\+?\s*(?:years?|yrs?|yr)')
+_SECTIONS_RE = _regex.compile(
+    r'(?P<summary>summary|objective|profile)'
+    r'|(?P<experience>experience|work history|employment)'
+    r'|(?P<education>education|academic|qualification)'
+    r'|(?P<skills>skills?|technical skills?|competencies)'
+    r'|(?P<projects>projects?|portfolio)'
+)
+_SECTION_NAMES = ("summary", "experience", "education", "skills", "projects")
+_HIGHLIGHT_RE = _regex.compile(
+    r'(?i)(?:increased|improved|reduced|built|developed|managed|led).*?(?:\d+%|\d+\s*(?:users|projects|team))'
+)
+_PROJECTS_EXTRACT_RE = _regex.compile(r'(?is)projects?[:\n](.*?)(?:\n\n|\n[A-Z])')
+_QUANT_RE = _regex.compile(r'\d+%|\d+\s*(?:users|projects)')
+_GITHUB_RE = _regex.compile(r'(github|git|portfolio)')
+
+
+class _PreparedSkills:
+    """Lowercased skill lookups for the weakness checks, built once per analysis"""
+    
+    def __init__(self, resume_skills: List[str], job_skills: List[str]):
+        # Interned so set lookups usually short-circuit on identity
+        self.resume_skills_lower = frozenset(sys.intern(s.lower()) for s in resume_skills)
+        self.job_skills = tuple((s, sys.intern(s.lower())) for s in job_skills)
 
 
 class AdvancedResumeAnalyzer:
@@ -83,8 +126,90 @@ class AdvancedResumeAnalyzer:
         }
     }
     
+    # Job description phrases used for role detection (checked in order)
+    ROLE_PATTERNS = {
+        "Backend Developer": [
+            "backend", "back-end", "server", "api developer", 
+            "rest api", "microservices", "database"
+        ],
+        "Frontend Developer": [
+            "frontend", "front-end", "react", "vue", "angular",
+            "ui developer", "javascript developer"
+        ],
+        "Data Scientist": [
+            "data scientist", "data science", "machine learning",
+            "data analysis", "statistics"
+        ],
+        "ML Engineer": [
+            "ml engineer", "machine learning engineer", "deep learning",
+            "model deployment", "mlops"
+        ],
+        "Software Engineer": [
+            "software engineer", "sde", "swe", "software developer",
+            "full stack", "fullstack"
+        ]
+    }
+    
+    # Prompt for _get_ai_insights; only the variable parts are filled per call
+    _AI_PROMPT_TEMPLATE = """Analyze this resume for a {role} position and provide deep insights.
+
+RESUME:
+{resume}
+
+JOB DESCRIPTION:
+{jd}
+
+Provide JSON response with:
+1. role_fit: How well the candidate fits the role (1-10 scale)
+2. key_strengths: Top 3-5 unique strengths
+3. critical_gaps: Top 3-5 critical skill gaps
+4. experience_assessment: Assessment of experience level and quality
+5. resume_quality_score: Resume structure and presentation quality (1-10)
+6. specific_recommendations: 3-5 specific, actionable recommendations
+
+Format as JSON only, no markdown."""
+    
+    # Maximum number of memoized analyses kept per analyzer
+    CACHE_SIZE = 128
+    
+    # Background threads for AI insight calls, shared by all analyzers. A call
+    # that outlives the timeout still holds its thread until it returns, so
+    # new calls only start while a thread is free; otherwise the analysis goes
+    # without AI insights instead of queueing behind stalled calls
+    AI_WORKERS = 4
+    _EXECUTOR = ThreadPoolExecutor(max_workers=AI_WORKERS, thread_name_prefix="ai-insights")
+    _AI_SLOTS = threading.BoundedSemaphore(AI_WORKERS)
+    
+    # Seconds to wait for AI insights (covers HF timeout plus Gemini fallback)
+    AI_INSIGHTS_TIMEOUT = 60
+    
     def __init__(self, ai_service: AIService):
         self.ai_service = ai_service
+        # Provider availability is fixed once the service is constructed
+        self._ai_enabled = bool(
+            getattr(ai_service, 'ai_enabled', False) or
+            getattr(ai_service, 'hf_available', False) or
+            getattr(ai_service, 'gemini_available', False)
+        )
+        # LRU of past analyses; analyze_resume runs on worker threads
+        self._cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+    
+    def invalidate(self):
+        """Clear memoized analysis results"""
+        with self._cache_lock:
+            self._cache.clear()
+    
+    def _cache_key(
+        self,
+        resume_text: str,
+        job_description: str,
+        resume_skills: List[str],
+        job_skills: List[str]
+    ) -> bytes:
+        """Hash the analysis inputs into a compact cache key"""
+        raw = "\0".join((resume_text, job_description, "|".join(resume_skills), "|".join(job_skills)))
+        return hashlib.blake2b(raw.encode(), digest_size=16).digest()
     
     def analyze_resume(
         self, 
@@ -103,36 +228,81 @@ class AdvancedResumeAnalyzer:
         - Weak areas
         - Missing fundamentals
         - Resume structure quality
+        
+        Results are memoized, so re-analyzing the same resume/job pair is free.
         """
+        key = self._cache_key(resume_text, job_description, resume_skills, job_skills)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+        if cached is not None:
+            # A copy, so callers that modify the result don't alter the cache
+            return copy.deepcopy(cached)
+        
+        # Lowercase each text once and share it across all helpers
+        resume_lower = resume_text.lower()
+        job_lower = job_description.lower()
+        
         # Detect target role
-        target_role = self._detect_role(job_description)
+        target_role = self._detect_role(job_lower)
+        
+        # Start the AI call first so its network latency overlaps the local
+        # analysis below (the scanners themselves are GIL-bound, so they stay
+        # on this thread)
+        ai_future = None
+        ai_missing = False
+        if self._ai_enabled:
+            if self._AI_SLOTS.acquire(blocking=False):
+                ai_future = self._EXECUTOR.submit(
+                    self._get_ai_insights, resume_text, job_description, target_role
+                )
+                ai_future.add_done_callback(lambda _: self._AI_SLOTS.release())
+            else:
+                ai_missing = True
+        
+        # Check every role requirement against the resume once; strengths,
+        # weaknesses and missing fundamentals are all derived from this map
+        presence = self._scan_requirements(resume_lower, target_role)
         
         # Assess experience level
-        experience_level = self._assess_experience_level(resume_text, target_role)
+        experience_level = self._assess_experience_level(resume_lower, target_role)
         
         # Analyze strengths
-        strengths = self._analyze_strengths(resume_text, resume_skills, target_role)
+        strengths = self._analyze_strengths(
+            resume_text, resume_lower, resume_skills, target_role, presence
+        )
         
         # Analyze weaknesses
-        weaknesses = self._analyze_weaknesses(resume_text, resume_skills, target_role, job_skills)
+        weaknesses = self._analyze_weaknesses(
+            resume_text, resume_lower, _PreparedSkills(resume_skills, job_skills), target_role, presence
+        )
         
         # Identify missing fundamentals
         missing_fundamentals = self._identify_missing_fundamentals(
-            resume_text, resume_skills, target_role
+            presence, resume_skills, target_role
         )
         
         # Assess resume structure quality
-        structure_quality = self._assess_resume_structure(resume_text)
+        structure_quality = self._assess_resume_structure(resume_lower)
         
         # Get AI-powered deep analysis
-        ai_insights = self._get_ai_insights(resume_text, job_description, target_role)
+        ai_insights = {}
+        if ai_future is not None:
+            try:
+                ai_insights = ai_future.result(timeout=self.AI_INSIGHTS_TIMEOUT)
+            except FutureTimeoutError:
+                # Only stops a call that hasn't started; a running one frees
+                # its slot when it returns
+                ai_future.cancel()
+                ai_missing = True
         
         # Calculate role readiness score
         role_readiness = self._calculate_role_readiness(
             strengths, weaknesses, missing_fundamentals, target_role
         )
         
-        return {
+        result = {
             "target_role": target_role,
             "experience_level": experience_level,
             "strengths": strengths,
@@ -143,70 +313,42 @@ class AdvancedResumeAnalyzer:
             "ai_insights": ai_insights,
             "confidence": self._calculate_confidence(resume_text, job_description)
         }
-    
-    def _detect_role(self, job_description: str) -> str:
-        """Detect target role from job description"""
-        job_lower = job_description.lower()
         
-        role_patterns = {
-            "Backend Developer": [
-                "backend", "back-end", "server", "api developer", 
-                "rest api", "microservices", "database"
-            ],
-            "Frontend Developer": [
-                "frontend", "front-end", "react", "vue", "angular",
-                "ui developer", "javascript developer"
-            ],
-            "Data Scientist": [
-                "data scientist", "data science", "machine learning",
-                "data analysis", "statistics"
-            ],
-            "ML Engineer": [
-                "ml engineer", "machine learning engineer", "deep learning",
-                "model deployment", "mlops"
-            ],
-            "Software Engineer": [
-                "software engineer", "sde", "swe", "software developer",
-                "full stack", "fullstack"
-            ]
-        }
-        
-        for role, patterns in role_patterns.items():
-            if any(pattern in job_lower for pattern in patterns):
-                return role
-        
-        return "Software Engineer"  # Default
+        # Don't memoize a result that is only missing AI insights by timeout,
+        # because every AI thread was busy, or because the providers failed
+        # (_get_ai_insights returns {} on errors, _call_ai the placeholder)
+        if self._ai_enabled and (
+            not ai_insights or ai_insights == self.ai_service._get_fallback_response("analysis")
+        ):
+            ai_missing = True
+        if not ai_missing:
+            stored = copy.deepcopy(result)
+            with self._cache_lock:
+                self._cache[key] = stored
+                while len(self._cache) > self.CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        
+        return result
+    
+    def _detect_role(self, job_lower: str) -> str:
+        """Detect target role from lowercased job description"""
+        role = _ROLE_MATCHER.first_group(job_lower)
+        return role or "Software Engineer"  # Default
     
     def _assess_experience_level(
         self, 
-        resume_text: str, 
+        resume_lower: str, 
         target_role: str
     ) -> Dict[str, Any]:
         """Assess candidate's experience level"""
-        resume_lower = resume_text.lower()
-        
         # Check for years of experience
-        years_pattern = r'(\d+)\+?\s*(?:years?|yrs?|yr)'
-        years_matches = re.findall(years_pattern, resume_lower)
         total_years = 0
-        if years_matches:
-            total_years = max([int(y) for y in years_matches])
-        
-        # Check for experience indicators
-        level_indicators = {
-            "fresher": ["intern", "internship", "student", "graduate", "fresher", "entry level"],
-            "junior": ["junior", "associate", "1 year", "2 years"],
-            "mid": ["mid-level", "3 years", "4 years", "5 years", "experienced"],
-            "senior": ["senior", "lead", "architect", "principal", "6+ years", "7+ years"]
-        }
-        
-        detected_level = "mid"  # Default
-        for level, indicators in level_indicators.items():
-            if any(indicator in resume_lower for indicator in indicators):
-                detected_level = level
-                break
+        for match in _YEARS_RE.finditer(resume_lower):
+            years = int(match.group(1))
+            if years > total_years:
+                total_years = years
         
-        # Override with years if available
+        # Level comes from the years bracket; no stated years means fresher
         if total_years == 0:
             detected_level = "fresher"
         elif total_years <= 2:
@@ -231,16 +373,40 @@ class AdvancedResumeAnalyzer:
         }
         return descriptions.get(level, "Professional candidate")
     
+    def _scan_requirements(
+        self,
+        resume_lower: str,
+        target_role: str
+    ) -> Dict[str, Dict[str, Dict[str, bool]]]:
+        """Map each role fundamental/skill to whether it appears in the resume"""
+        if target_role not in _ROLE_REQS_LOWER:
+            target_role = "Software Engineer"
+        
+        matcher = _REQUIREMENT_MATCHERS[target_role]
+        if not matcher.has_automaton:
+            # Without an automaton, the role's generated scanner is fastest
+            return _ROLE_SCANNERS[target_role](resume_lower)
+        
+        role_phrases = _ROLE_REQS_LOWER[target_role]
+        hits = matcher.find_all(resume_lower)
+        
+        return {
+            category: {
+                priority: {phrase: phrase_lower in hits for phrase, phrase_lower in pairs}
+                for priority, pairs in priorities.items()
+            }
+            for category, priorities in role_phrases.items()
+        }
+    
     def _analyze_strengths(
         self, 
         resume_text: str, 
+        resume_lower: str,
         resume_skills: List[str],
-        target_role: str
+        target_role: str,
+        presence: Dict[str, Dict[str, Dict[str, bool]]]
     ) -> Dict[str, Any]:
         """Analyze candidate's strengths"""
-        role_reqs = self.ROLE_REQUIREMENTS.get(target_role, self.ROLE_REQUIREMENTS["Software Engineer"])
-        resume_lower = resume_text.lower()
-        
         strengths = {
             "technical_skills": [],
             "fundamentals": [],
@@ -250,18 +416,20 @@ class AdvancedResumeAnalyzer:
         
         # Check for required fundamentals
         for priority in ["high", "medium", "low"]:
-            for fundamental in role_reqs["fundamentals"].get(priority, []):
-                if fundamental.lower() in resume_lower:
+            for fundamental, present in presence["fundamentals"].get(priority, {}).items():
+                if present:
                     strengths["fundamentals"].append({
                         "skill": fundamental,
                         "priority": priority,
-                        "evidence": self._find_evidence(resume_text, fundamental)
+                        "evidence": self._find_evidence(resume_text, resume_lower, fundamental)
                     })
         
-        # Check for required skills
+        # Check for required skills (any extracted resume skill found in the
+        # text counts for every entry, so that check is done once up front)
+        resume_skill_found = any(s.lower() in resume_lower for s in resume_skills)
         for priority in ["high", "medium", "low"]:
-            for skill in role_reqs["skills"].get(priority, []):
-                if any(s.lower() in resume_lower for s in [skill] + resume_skills):
+            for skill, present in presence["skills"].get(priority, {}).items():
+                if resume_skill_found or present:
                     strengths["technical_skills"].append({
                         "skill": skill,
                         "priority": priority
@@ -278,13 +446,13 @@ class AdvancedResumeAnalyzer:
     def _analyze_weaknesses(
         self,
         resume_text: str,
-        resume_skills: List[str],
+        resume_lower: str,
+        prepared_skills: _PreparedSkills,
         target_role: str,
-        job_skills: List[str]
+        presence: Dict[str, Dict[str, Dict[str, bool]]]
     ) -> Dict[str, Any]:
         """Analyze candidate's weaknesses and gaps"""
-        role_reqs = self.ROLE_REQUIREMENTS.get(target_role, self.ROLE_REQUIREMENTS["Software Engineer"])
-        resume_lower = resume_text.lower()
+        role_phrase_set = _ROLE_ALL_PHRASES.get(target_role, _ROLE_ALL_PHRASES["Software Engineer"])
         
         weaknesses = {
             "missing_fundamentals": [],
@@ -295,8 +463,8 @@ class AdvancedResumeAnalyzer:
         
         # Check missing fundamentals
         for priority in ["high", "medium", "low"]:
-            for fundamental in role_reqs["fundamentals"].get(priority, []):
-                if fundamental.lower() not in resume_lower:
+            for fundamental, present in presence["fundamentals"].get(priority, {}).items():
+                if not present:
                     weaknesses["missing_fundamentals"].append({
                         "skill": fundamental,
                         "priority": priority,
@@ -304,33 +472,32 @@ class AdvancedResumeAnalyzer:
                     })
         
         # Check missing job-specific skills
-        resume_skills_lower = {s.lower() for s in resume_skills}
-        for job_skill in job_skills:
-            if job_skill.lower() not in resume_skills_lower:
+        resume_skills_lower = prepared_skills.resume_skills_lower
+        for job_skill, job_skill_lower in prepared_skills.job_skills:
+            if job_skill_lower not in resume_skills_lower:
                 weaknesses["missing_skills"].append({
                     "skill": job_skill,
-                    "priority": "high" if job_skill.lower() in str(role_reqs).lower() else "medium"
+                    "priority": "high" if job_skill_lower in role_phrase_set else "medium"
                 })
         
         # Identify improvement areas
-        weaknesses["improvement_areas"] = self._identify_improvement_areas(resume_text, target_role)
+        weaknesses["improvement_areas"] = self._identify_improvement_areas(
+            resume_text, resume_lower, target_role
+        )
         
         return weaknesses
     
     def _identify_missing_fundamentals(
         self,
-        resume_text: str,
+        presence: Dict[str, Dict[str, Dict[str, bool]]],
         resume_skills: List[str],
         target_role: str
     ) -> List[Dict[str, Any]]:
         """Identify missing fundamental skills"""
-        role_reqs = self.ROLE_REQUIREMENTS.get(target_role, self.ROLE_REQUIREMENTS["Software Engineer"])
-        resume_lower = resume_text.lower()
-        
         missing = []
         for priority in ["high", "medium", "low"]:
-            for fundamental in role_reqs["fundamentals"].get(priority, []):
-                if fundamental.lower() not in resume_lower:
+            for fundamental, present in presence["fundamentals"].get(priority, {}).items():
+                if not present:
                     missing.append({
                         "skill": fundamental,
                         "priority": priority,
@@ -356,15 +523,17 @@ class AdvancedResumeAnalyzer:
         }
         return explanations.get(skill, f"Important skill for {role} role")
     
-    def _assess_resume_structure(self, resume_text: str) -> Dict[str, Any]:
+    def _assess_resume_structure(self, resume_lower: str) -> Dict[str, Any]:
         """Assess resume structure quality"""
-        sections = {
-            "summary": bool(re.search(r'(summary|objective|profile)', resume_text, re.IGNORECASE)),
-            "experience": bool(re.search(r'(experience|work history|employment)', resume_text, re.IGNORECASE)),
-            "education": bool(re.search(r'(education|academic|qualification)', resume_text, re.IGNORECASE)),
-            "skills": bool(re.search(r'(skills?|technical skills?|competencies)', resume_text, re.IGNORECASE)),
-            "projects": bool(re.search(r'(projects?|portfolio)', resume_text, re.IGNORECASE))
-        }
+        # One pass over the resume for all section headings
+        sections = dict.fromkeys(_SECTION_NAMES, False)
+        remaining = len(sections)
+        for match in _SECTIONS_RE.finditer(resume_lower):
+            if not sections[match.lastgroup]:
+                sections[match.lastgroup] = True
+                remaining -= 1
+                if not remaining:
+                    break
         
         score = sum(sections.values()) / len(sections) * 100
         
@@ -390,36 +559,15 @@ class AdvancedResumeAnalyzer:
         target_role: str
     ) -> Dict[str, Any]:
         """Get AI-powered deep insights"""
-        if not self.ai_service:
+        if not self._ai_enabled:
             return {}
         
-        # Check if AI is enabled
-        ai_enabled = getattr(self.ai_service, 'ai_enabled', False) or (
-            getattr(self.ai_service, 'hf_available', False) or 
-            getattr(self.ai_service, 'gemini_available', False)
+        prompt = self._AI_PROMPT_TEMPLATE.format(
+            role=target_role,
+            resume=resume_text[:2500],
+            jd=job_description[:2000]
         )
         
-        if not ai_enabled:
-            return {}
-        
-        prompt = f"""Analyze this resume for a {target_role} position and provide deep insights.
-
-RESUME:
-{resume_text[:2500]}
-
-JOB DESCRIPTION:
-{job_description[:2000]}
-
-Provide JSON response with:
-1. role_fit: How well the candidate fits the role (1-10 scale)
-2. key_strengths: Top 3-5 unique strengths
-3. critical_gaps: Top 3-5 critical skill gaps
-4. experience_assessment: Assessment of experience level and quality
-5. resume_quality_score: Resume structure and presentation quality (1-10)
-6. specific_recommendations: 3-5 specific, actionable recommendations
-
-Format as JSON only, no markdown."""
-        
         try:
             ai_response = self.ai_service._call_ai(prompt, task="analysis")
             return ai_response if isinstance(ai_response, dict) else {}
@@ -442,8 +590,15 @@ Format as JSON only, no markdown."""
         skill_bonus = min(len(strengths.get("technical_skills", [])) * 3, 15)
         
         # Subtract points for critical gaps
-        critical_penalty = len([m for m in missing_fundamentals if m.get("priority") == "high"]) * 10
-        medium_penalty = len([m for m in missing_fundamentals if m.get("priority") == "medium"]) * 5
+        critical_count = medium_count = 0
+        for missing in missing_fundamentals:
+            priority = missing.get("priority")
+            if priority == "high":
+                critical_count += 1
+            elif priority == "medium":
+                medium_count += 1
+        critical_penalty = critical_count * 10
+        medium_penalty = medium_count * 5
         
         score = base_score + strength_bonus + skill_bonus - critical_penalty - medium_penalty
         score = max(0, min(100, score))
@@ -482,29 +637,43 @@ Format as JSON only, no markdown."""
         
         return min(100, text_length_score + job_length_score + ai_score)
     
-    def _find_evidence(self, resume_text: str, skill: str) -> str:
+    def _find_evidence(self, resume_text: str, resume_lower: str, skill: str) -> str:
         """Find evidence of skill in resume"""
-        lines = resume_text.split('\n')
-        for i, line in enumerate(lines):
-            if skill.lower() in line.lower():
-                # Get context
-                context = ' '.join(lines[max(0, i-1):min(len(lines), i+2)])
-                return context[:100] + "..."
-        return "Mentioned in resume"
+        if len(resume_lower) != len(resume_text):
+            # Lowercasing changed offsets (rare non-ASCII case), scan by line
+            lines = resume_text.split('\n')
+            for i, line in enumerate(lines):
+                if skill.lower() in line.lower():
+                    context = ' '.join(lines[max(0, i-1):min(len(lines), i+2)])
+                    return context[:100] + "..."
+            return "Mentioned in resume"
+        
+        index = resume_lower.find(skill.lower())
+        if index < 0:
+            return "Mentioned in resume"
+        
+        # Context is the matching line plus its neighbours on either side
+        line_start = resume_text.rfind('\n', 0, index) + 1
+        start = resume_text.rfind('\n', 0, line_start - 1) + 1 if line_start else 0
+        line_end = resume_text.find('\n', index)
+        end = -1 if line_end < 0 else resume_text.find('\n', line_end + 1)
+        if end < 0:
+            end = len(resume_text)
+        
+        context = resume_text[start:min(end, start + 100)].replace('\n', ' ')
+        return context + "..."
     
     def _extract_experience_highlights(self, resume_text: str) -> List[str]:
         """Extract experience highlights"""
-        highlights = []
         # Look for quantified achievements
-        pattern = r'(?:increased|improved|reduced|built|developed|managed|led).*?(?:\d+%|\d+\s*(?:users|projects|team))'
-        matches = re.findall(pattern, resume_text, re.IGNORECASE)
+        matches = _HIGHLIGHT_RE.findall(resume_text)
         return matches[:5]
     
     def _extract_projects(self, resume_text: str) -> List[Dict]:
         """Extract project information"""
         projects = []
         # Simple extraction - can be enhanced
-        project_section = re.search(r'projects?[:\n](.*?)(?:\n\n|\n[A-Z])', resume_text, re.IGNORECASE | re.DOTALL)
+        project_section = _PROJECTS_EXTRACT_RE.search(resume_text)
         if project_section:
             project_text = project_section.group(1)
             # Split by lines
@@ -513,20 +682,91 @@ Format as JSON only, no markdown."""
                     projects.append({"name": line.strip(), "description": ""})
         return projects
     
-    def _identify_improvement_areas(self, resume_text: str, target_role: str) -> List[str]:
+    def _identify_improvement_areas(
+        self,
+        resume_text: str,
+        resume_lower: str,
+        target_role: str
+    ) -> List[str]:
         """Identify areas for improvement"""
         areas = []
-        resume_lower = resume_text.lower()
         
         # Check for common issues
-        if not re.search(r'\d+%|\d+\s*(?:users|projects)', resume_lower):
+        if not _QUANT_RE.search(resume_lower):
             areas.append("Add quantified achievements (metrics, numbers)")
         
         if len(resume_text.split()) < 200:
             areas.append("Resume is too short - add more detail")
         
-        if not re.search(r'(github|git|portfolio)', resume_lower):
+        if not _GITHUB_RE.search(resume_lower):
             areas.append("Add links to GitHub or portfolio")
         
         return areas
 
+
+# ROLE_REQUIREMENTS fundamentals/skills as (phrase, lowercased phrase) pairs,
+# so the static tables are only ever lowercased once
+_ROLE_REQS_LOWER = {
+    role: {
+        category: {
+            priority: [(phrase, phrase.lower()) for phrase in phrases]
+            for priority, phrases in reqs.get(category, {}).items()
+        }
+        for category in ("fundamentals", "skills")
+    }
+    for role, reqs in AdvancedResumeAnalyzer.ROLE_REQUIREMENTS.items()
+}
+
+# Every lowercased fundamental/skill per role, plus the alternatives of
+# slash-combined entries ("React/Vue/Angular" -> "react", "vue", "angular")
+_ROLE_ALL_PHRASES = {
+    role: frozenset(
+        term
+        for priorities in categories.values()
+        for pairs in priorities.values()
+        for _, phrase_lower in pairs
+        for term in [phrase_lower] + phrase_lower.split("/")
+    )
+    for role, categories in _ROLE_REQS_LOWER.items()
+}
+
+# One matcher per role, built once at import and shared by every analyzer
+# instance, so a resume is only scanned for its target role's phrases
+_REQUIREMENT_MATCHERS = {
+    role: KeywordMatcher(
+        phrase_lower
+        for priorities in categories.values()
+        for pairs in priorities.values()
+        for _, phrase_lower in pairs
+    )
+    for role, categories in _ROLE_REQS_LOWER.items()
+}
+_ROLE_MATCHER = GroupMatcher(AdvancedResumeAnalyzer.ROLE_PATTERNS)
+
+
+def _compile_role_scanner(categories: Dict[str, Dict[str, List[Tuple[str, str]]]]):
+    """
+    Generate a presence-map function for one role with every check inlined
+    
+    The generated body is a single dict display of `'<phrase>' in resume_lower`
+    tests, so a scan does no table iteration at all. Phrases are embedded with
+    repr(), and only come from the static ROLE_REQUIREMENTS table.
+    """
+    lines = ["def scan(resume_lower):", "    return {"]
+    for category, priorities in categories.items():
+        lines.append(f"        {category!r}: {{")
+        for priority, pairs in priorities.items():
+            checks = ", ".join(f"{phrase!r}: {phrase_lower!r} in resume_lower" for phrase, phrase_lower in pairs)
+            lines.append(f"            {priority!r}: {{{checks}}},")
+        lines.append("        },")
+    lines.append("    }")
+    
+    namespace: Dict[str, Any] = {}
+    exec("\n".join(lines), namespace)
+    return namespace["scan"]
+
+
+_ROLE_SCANNERS = {
+    role: _compile_role_scanner(categories)
+    for role, categories in _ROLE_REQS_LOWER.items()
+}
@@ -4,23 +4,205 @@ Uses FREE-TIER APIs only: Hugging Face Inference API and Google Gemini
 Provides fallback logic between providers
 """
 
-import os
+import re
+import copy
+import time
+import threading
 import requests
 import json
-from typing import Dict, Any, Optional, List
-from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait, FIRST_COMPLETED
+from functools import lru_cache
+from typing import Dict, Any, Final, Optional, List, Sequence, Tuple
+from config import Settings, get_settings
+from llm_cache import LLMCache, SemanticCache
+from keyword_matcher import KeywordMatcher
 
-# Load environment variables
-load_dotenv()
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Body of the first markdown code fence (closing fence optional)
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)(?:```|\Z)", re.DOTALL | re.IGNORECASE)
+_JSON_DECODER = json.JSONDecoder()
+
+# Prompt budgets, in tokens, for the per-request text
+RESUME_TOKEN_BUDGET = 800
+JOB_TOKEN_BUDGET = 800
+IMPROVEMENT_JOB_TOKEN_BUDGET = 600
+# Without tiktoken the budgets map back to the old character limits
+# (800 tokens -> 2000 characters, 600 -> 1500)
+FALLBACK_CHARS_PER_TOKEN = 2.5
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """cl100k_base encoding, loaded on first use; None if unavailable"""
+    if tiktoken is None:
+        return None
+    try:
+        # The first load downloads the vocabulary file
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        print(f"tiktoken unavailable, truncating by characters: {e}")
+        return None
+
+
+@lru_cache(maxsize=64)
+def _encode(text: str) -> Tuple[int, ...]:
+    """Token ids for text; cached since one resume feeds several prompts"""
+    return tuple(_get_encoding().encode(text))
+
+
+def _truncate_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to at most max_tokens tokens"""
+    encoding = _get_encoding()
+    if encoding is None:
+        return text[:int(max_tokens * FALLBACK_CHARS_PER_TOKEN)]
+    tokens = _encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
+
+# Static instructions go first and per-request text last, so repeated calls
+# share an identical prefix that providers can serve from their prompt cache
+ANALYSIS_PROMPT_PREFIX: Final[str] = """Analyze the resume below against the job description and provide insights.
+
+Provide a JSON response with:
+1. overall_assessment: Brief assessment of the match
+2. strengths: List of 3-5 key strengths
+3. weaknesses: List of 3-5 key weaknesses
+4. skill_gaps: List of missing critical skills
+5. improvement_suggestions: List of 3-5 actionable suggestions
+
+Format as JSON only, no markdown."""
+
+RECOMMENDATIONS_PROMPT_PREFIX: Final[str] = """Based on the resume below, provide role-specific skill recommendations for the target role.
+
+Provide JSON response with:
+1. recommended_skills: List of 5-7 skills to learn/improve
+2. learning_priority: Priority order (high/medium/low) for each skill
+3. skill_explanations: Brief explanation why each skill is important
+4. learning_resources: Suggested free resources for each skill
+
+Format as JSON only, no markdown."""
+
+ROADMAP_PROMPT_PREFIX: Final[str] = """Create a learning roadmap for someone transitioning to the target role, covering the missing skills listed below.
+
+Provide JSON response with:
+1. roadmap_steps: Array of learning steps in order
+2. estimated_timeline: Timeline for each step (in weeks)
+3. free_resources: Free learning resources for each step
+4. practice_projects: Suggested projects to practice each skill
+5. milestones: Key milestones to track progress
+
+Format as JSON only, no markdown."""
+
+IMPROVEMENT_PROMPT_PREFIX: Final[str] = """Provide specific, actionable resume improvement advice for the resume and target job below.
+
+Provide JSON response with:
+1. summary_suggestions: How to improve the summary/objective
+2. experience_improvements: Specific improvements for work experience section
+3. skills_section_tips: How to better present skills
+4. keyword_optimization: Important keywords to add
+5. formatting_tips: Formatting and structure suggestions
+
+Format as JSON only, no markdown."""
+
+# Complete prompts, built once; only the per-request fields are formatted in
+ANALYSIS_PROMPT_TEMPLATE: Final[str] = ANALYSIS_PROMPT_PREFIX + "\n---\nRESUME:\n{resume}\n\nJOB DESCRIPTION:\n{job}"
+RECOMMENDATIONS_PROMPT_TEMPLATE: Final[str] = RECOMMENDATIONS_PROMPT_PREFIX + "\n---\nTARGET ROLE: {role}\n\nRESUME:\n{resume}"
+ROADMAP_PROMPT_TEMPLATE: Final[str] = ROADMAP_PROMPT_PREFIX + "\n---\nTARGET ROLE: {role}\n\nMISSING SKILLS:\n{skills}"
+IMPROVEMENT_PROMPT_TEMPLATE: Final[str] = IMPROVEMENT_PROMPT_PREFIX + "\n---\nCURRENT RESUME:\n{resume}\n\nTARGET JOB:\n{job}"
+
+
+class CircuitBreaker:
+    """Skip a provider for a cool-down period after repeated consecutive failures"""
+    
+    def __init__(self, name: str, max_failures: int = 3, cooldown: float = 60.0):
+        """
+        Args:
+            name: Provider name used in log messages
+            max_failures: Consecutive failures that open the circuit
+            cooldown: Seconds the provider is skipped once open
+        """
+        self.name = name
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self.failures = 0
+        self.open_until = 0.0
+        # Set while the single trial call after a cool-down is outstanding
+        self.half_open = False
+        self._lock = threading.Lock()
+    
+    def allow(self) -> bool:
+        """
+        Whether the provider should be tried
+        
+        Once the cool-down has passed exactly one trial call is let through;
+        other callers are held back until it reports, or for another
+        cool-down if it never does.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now < self.open_until:
+                return False
+            if self.open_until:
+                self.half_open = True
+                self.open_until = now + self.cooldown
+            return True
+    
+    def record_failure(self):
+        """Count a failed call, opening the circuit once the limit is reached or the trial fails"""
+        with self._lock:
+            self.failures += 1
+            now = time.monotonic()
+            if self.half_open or (self.failures >= self.max_failures and now >= self.open_until):
+                if self.open_until == 0.0:
+                    print(f"{self.name} failing, skipping it for {self.cooldown:.0f}s")
+                self.open_until = now + self.cooldown
+                self.half_open = False
+    
+    def record_success(self):
+        """Close the circuit after a successful call"""
+        with self._lock:
+            if self.open_until:
+                print(f"{self.name} recovered")
+            self.failures = 0
+            self.open_until = 0.0
+            self.half_open = False
 
 
 class AIService:
     """AI service using free-tier APIs with fallback support"""
     
-    def __init__(self):
+    # Seconds to wait on Hugging Face before also asking Gemini
+    HEDGE_DELAY = 5
+    
+    # Seconds a duplicate request waits for the identical call already in flight
+    INFLIGHT_TIMEOUT = 60
+    
+    GEMINI_GENERATION_CONFIG = {
+        "temperature": 0.7,
+        "max_output_tokens": 1000,
+    }
+    
+    _EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="ai-provider")
+    
+    def __init__(self, settings: Optional[Settings] = None, encoder: Any = None):
+        """
+        Args:
+            settings: App settings; loaded from the environment when omitted
+            encoder: Sentence encoder for the semantic cache, shared with the
+                resume matcher; without one only the exact cache is used
+        """
+        settings = settings or get_settings()
+        
         # API Keys from environment variables
-        self.hf_api_key = os.getenv("HUGGINGFACE_API_KEY", "")
-        self.gemini_api_key = os.getenv("GEMINI_API_KEY", "")
+        self.hf_api_key = settings.huggingface_api_key
+        self.gemini_api_key = settings.gemini_api_key
         
         # Hugging Face API endpoint (free tier)
         self.hf_api_url = "https://api-inference.huggingface.co/models"
@@ -32,11 +214,55 @@ class AIService:
             "analysis": "mistralai/Mistral-7B-Instruct-v0.2"
         }
         
+        # One keep-alive session so repeat calls skip the TCP/TLS handshake;
+        # model-loading 5xx responses are retried, stalled reads are not
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=50,
+            max_retries=Retry(
+                total=2,
+                read=0,
+                backoff_factor=0.3,
+                status_forcelist=[502, 503, 504],
+                allowed_methods=frozenset(["POST"])
+            )
+        ))
+        self._session.headers.update({"Authorization": f"Bearer {self.hf_api_key}"})
+        
         # Provider availability
         self.hf_available = bool(self.hf_api_key)
         self.gemini_available = bool(self.gemini_api_key)
         self.ai_enabled = self.hf_available or self.gemini_available
         
+        # Gemini client is configured once rather than on every call
+        self._gemini_model = None
+        if self.gemini_available:
+            try:
+                import google.generativeai as genai
+                
+                genai.configure(api_key=self.gemini_api_key)
+                self._gemini_model = genai.GenerativeModel('gemini-pro')
+            except Exception as e:
+                print(f"Gemini client unavailable: {str(e)}")
+        
+        # Route around a provider that keeps failing instead of paying its timeout
+        self._hf_breaker = CircuitBreaker("Hugging Face")
+        self._gemini_breaker = CircuitBreaker("Gemini")
+        
+        # Identical prompts already being answered, keyed like the exact cache
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        
+        # Identical prompts are answered from cache instead of a remote call
+        self.cache = LLMCache()
+        
+        # Near-duplicate roadmap requests (same role, similar skill list) reuse a
+        # response too. Prompts carrying a resume never go through it: see SemanticCache
+        self.semantic_cache = None
+        if self.ai_enabled and encoder is not None:
+            self.semantic_cache = SemanticCache(encoder, threshold=settings.semantic_cache_threshold)
+        
         print(f"AI Service initialized - HF: {self.hf_available}, Gemini: {self.gemini_available}, AI Enabled: {self.ai_enabled}")
     
     def analyze_resume(self, resume_text: str, job_description: str) -> Dict[str, Any]:
@@ -50,22 +276,9 @@ class AIService:
         Returns:
             Dictionary with AI analysis
         """
-        prompt = f"""Analyze this resume against the job description and provide insights.
-
-RESUME:
-{resume_text[:2000]}
-
-JOB DESCRIPTION:
-{job_description[:2000]}
-
-Provide a JSON response with:
-1. overall_assessment: Brief assessment of the match
-2. strengths: List of 3-5 key strengths
-3. weaknesses: List of 3-5 key weaknesses
-4. skill_gaps: List of missing critical skills
-5. improvement_suggestions: List of 3-5 actionable suggestions
-
-Format as JSON only, no markdown."""
+        resume = _truncate_tokens(resume_text, RESUME_TOKEN_BUDGET)
+        job = _truncate_tokens(job_description, JOB_TOKEN_BUDGET)
+        prompt = ANALYSIS_PROMPT_TEMPLATE.format(resume=resume, job=job)
         
         return self._call_ai(prompt, task="analysis")
     
@@ -84,18 +297,8 @@ Format as JSON only, no markdown."""
             # Auto-detect role from resume
             target_role = "Software Engineer"  # Default
         
-        prompt = f"""Based on this resume, provide role-specific skill recommendations for a {target_role} position.
-
-RESUME:
-{resume_text[:2000]}
-
-Provide JSON response with:
-1. recommended_skills: List of 5-7 skills to learn/improve
-2. learning_priority: Priority order (high/medium/low) for each skill
-3. skill_explanations: Brief explanation why each skill is important
-4. learning_resources: Suggested free resources for each skill
-
-Format as JSON only, no markdown."""
+        resume = _truncate_tokens(resume_text, RESUME_TOKEN_BUDGET)
+        prompt = RECOMMENDATIONS_PROMPT_TEMPLATE.format(role=target_role, resume=resume)
         
         return self._call_ai(prompt, task="recommendations")
     
@@ -112,21 +315,9 @@ Format as JSON only, no markdown."""
         """
         skills_str = ", ".join(missing_skills[:10])
         
-        prompt = f"""Create a learning roadmap for someone transitioning to {target_role} role.
-
-MISSING SKILLS:
-{skills_str}
-
-Provide JSON response with:
-1. roadmap_steps: Array of learning steps in order
-2. estimated_timeline: Timeline for each step (in weeks)
-3. free_resources: Free learning resources for each step
-4. practice_projects: Suggested projects to practice each skill
-5. milestones: Key milestones to track progress
-
-Format as JSON only, no markdown."""
+        prompt = ROADMAP_PROMPT_TEMPLATE.format(role=target_role, skills=skills_str)
         
-        return self._call_ai(prompt, task="roadmap")
+        return self._call_ai(prompt, task="roadmap", semantic_fields=(skills_str,), scope=target_role)
     
     def get_resume_improvement_advice(self, resume_text: str, job_description: str) -> Dict[str, Any]:
         """
@@ -139,146 +330,261 @@ Format as JSON only, no markdown."""
         Returns:
             Detailed improvement advice
         """
-        prompt = f"""Provide specific, actionable resume improvement advice.
-
-CURRENT RESUME:
-{resume_text[:2000]}
-
-TARGET JOB:
-{job_description[:1500]}
-
-Provide JSON response with:
-1. summary_suggestions: How to improve the summary/objective
-2. experience_improvements: Specific improvements for work experience section
-3. skills_section_tips: How to better present skills
-4. keyword_optimization: Important keywords to add
-5. formatting_tips: Formatting and structure suggestions
-
-Format as JSON only, no markdown."""
+        resume = _truncate_tokens(resume_text, RESUME_TOKEN_BUDGET)
+        job = _truncate_tokens(job_description, IMPROVEMENT_JOB_TOKEN_BUDGET)
+        prompt = IMPROVEMENT_PROMPT_TEMPLATE.format(resume=resume, job=job)
         
         return self._call_ai(prompt, task="improvement")
     
-    def _call_ai(self, prompt: str, task: str = "chat") -> Dict[str, Any]:
+    def _call_ai(
+        self,
+        prompt: str,
+        task: str = "chat",
+        semantic_fields: Optional[Sequence[str]] = None,
+        scope: str = ""
+    ) -> Dict[str, Any]:
         """
         Call AI service with fallback logic
         
         Args:
             prompt: Input prompt
             task: Task type
+            semantic_fields: Short variable parts of the prompt (a skill list)
+                compared by the semantic cache; without them only an exact
+                prompt match is served from cache. Never pass a resume
+            scope: Context a semantic hit must match exactly, e.g. the role
         
         Returns:
             AI response as dictionary
         """
+        model = self.hf_models.get(task, self.hf_models["chat"]) if self.hf_available else "gemini-pro"
+        key = LLMCache.make_key(prompt, task, model)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        
+        # Coalesce duplicates: later callers wait on the first caller's result
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+        
+        if not leader:
+            try:
+                return copy.deepcopy(future.result(timeout=self.INFLIGHT_TIMEOUT))
+            except FutureTimeoutError:
+                return self._get_fallback_response(task)
+        
+        try:
+            result = self._call_providers(prompt, task, model, key, semantic_fields, scope)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+    
+    def _call_providers(
+        self,
+        prompt: str,
+        task: str,
+        model: str,
+        key: str,
+        semantic_fields: Optional[Sequence[str]] = None,
+        scope: str = ""
+    ) -> Dict[str, Any]:
+        """Answer a prompt missing from the exact cache, trying the semantic cache first"""
+        vec = None
+        if self.semantic_cache is not None and semantic_fields:
+            vec = self.semantic_cache.embed(semantic_fields)
+            cached = self.semantic_cache.get(vec, task, scope)
+            if cached is not None:
+                return cached
+        
+        # Gemini's breaker is only asked right before Gemini is called: in the
+        # half-open state allow() hands out the single trial call
+        hf_up = self.hf_available and self._hf_breaker.allow()
+        
+        if hf_up and self.gemini_available:
+            # Don't let a stalled Hugging Face call hold back Gemini
+            result, used_model = self._call_hedged(prompt, task, model)
+            if result:
+                self._remember(key, vec, task, scope, result, used_model)
+                return result
+            return self._get_fallback_response(task)
+        
         # Try Hugging Face first
-        if self.hf_available:
+        if hf_up:
             try:
                 result = self._call_huggingface(prompt, task)
                 if result:
+                    self._remember(key, vec, task, scope, result, model)
                     return result
             except Exception as e:
                 print(f"Hugging Face API error: {str(e)}, trying fallback...")
         
         # Fallback to Gemini
-        if self.gemini_available:
+        if self.gemini_available and self._gemini_breaker.allow():
             try:
                 result = self._call_gemini(prompt)
                 if result:
+                    self._remember(key, vec, task, scope, result, "gemini-pro")
                     return result
             except Exception as e:
                 print(f"Gemini API error: {str(e)}")
         
+        # Fallback responses are not cached so a recovered provider is retried
+        
         # If all fail, return basic response
         return self._get_fallback_response(task)
     
+    def _call_hedged(self, prompt: str, task: str, model: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Start Hugging Face, and start Gemini as well if it is slow or fails
+        (and its circuit breaker allows a call)
+        
+        Args:
+            prompt: Input prompt
+            task: Task type
+            model: Hugging Face model used for the task
+        
+        Returns:
+            First successful result and the model that produced it, or (None, None)
+        """
+        hf_future = self._EXECUTOR.submit(self._call_huggingface, prompt, task)
+        wait([hf_future], timeout=self.HEDGE_DELAY)
+        if hf_future.done() and not hf_future.exception() and hf_future.result():
+            return hf_future.result(), model
+        
+        if not self._gemini_breaker.allow():
+            # Gemini is cooling down, so Hugging Face is the only chance
+            try:
+                result = hf_future.result()
+            except Exception as e:
+                print(f"Hugging Face API error: {str(e)}")
+                return None, None
+            return (result, model) if result else (None, None)
+        
+        gemini_future = self._EXECUTOR.submit(self._call_gemini, prompt)
+        providers = {hf_future: ("Hugging Face", model), gemini_future: ("Gemini", "gemini-pro")}
+        pending = set(providers)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, used_model = providers[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"{name} API error: {str(e)}")
+                    continue
+                if result:
+                    # A running requests call can't be interrupted; its result is just ignored
+                    for other in pending:
+                        other.cancel()
+                    return result, used_model
+        return None, None
+    
+    def _remember(self, key: str, vec, task: str, scope: str, result: Dict[str, Any], model: str):
+        """Store a provider result in the exact and semantic caches"""
+        self.cache.set(key, result, model)
+        if self.semantic_cache is not None:
+            self.semantic_cache.set(vec, task, result, scope)
+    
     def _call_huggingface(self, prompt: str, task: str) -> Optional[Dict[str, Any]]:
         """Call Hugging Face Inference API"""
         try:
             model = self.hf_models.get(task, self.hf_models["chat"])
             url = f"{self.hf_api_url}/{model}"
             
-            headers = {
-                "Authorization": f"Bearer {self.hf_api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            payload = {
-                "inputs": prompt,
-                "parameters": {
-                    "max_new_tokens": 1000,
-                    "temperature": 0.7,
-                    "return_full_text": False
-                }
-            }
-            
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
+            response = self._session.post(url, json=self._hf_payload(prompt), timeout=30)
             
             if response.status_code == 200:
-                result = response.json()
-                
-                # Extract text from response
-                if isinstance(result, list) and len(result) > 0:
-                    text = result[0].get("generated_text", "")
-                elif isinstance(result, dict):
-                    text = result.get("generated_text", str(result))
-                else:
-                    text = str(result)
+                self._hf_breaker.record_success()
+                text = self._extract_hf_text(response.json())
                 
                 # Try to parse JSON from response
                 return self._parse_ai_response(text)
             else:
                 print(f"HF API error: {response.status_code} - {response.text}")
+                self._hf_breaker.record_failure()
                 return None
                 
         except Exception as e:
             print(f"Hugging Face API exception: {str(e)}")
+            self._hf_breaker.record_failure()
             return None
     
+    def _hf_payload(self, prompt: str) -> Dict[str, Any]:
+        """Request body for the Hugging Face text-generation endpoint"""
+        return {
+            "inputs": prompt,
+            "parameters": {
+                "max_new_tokens": 1000,
+                "temperature": 0.7,
+                "return_full_text": False
+            }
+        }
+    
+    def _extract_hf_text(self, result: Any) -> str:
+        """Extract the generated text from a Hugging Face response body"""
+        if isinstance(result, list) and len(result) > 0:
+            return result[0].get("generated_text", "")
+        elif isinstance(result, dict):
+            return result.get("generated_text", str(result))
+        return str(result)
+    
     def _call_gemini(self, prompt: str) -> Optional[Dict[str, Any]]:
         """Call Google Gemini API (free tier)"""
         try:
-            import google.generativeai as genai
+            if self._gemini_model is None:
+                raise RuntimeError("google-generativeai is not installed or configured")
             
-            genai.configure(api_key=self.gemini_api_key)
-            model = genai.GenerativeModel('gemini-pro')
-            
-            response = model.generate_content(
+            response = self._gemini_model.generate_content(
                 prompt,
-                generation_config={
-                    "temperature": 0.7,
-                    "max_output_tokens": 1000,
-                }
+                generation_config=self.GEMINI_GENERATION_CONFIG
             )
             
             text = response.text
+            self._gemini_breaker.record_success()
             
             # Try to parse JSON from response
             return self._parse_ai_response(text)
             
         except Exception as e:
             print(f"Gemini API exception: {str(e)}")
+            self._gemini_breaker.record_failure()
             return None
     
     def _parse_ai_response(self, text: str) -> Dict[str, Any]:
         """Parse AI response text and extract JSON"""
+        # Remove markdown code blocks if present
+        text = text.strip()
+        match = _FENCE_RE.search(text)
+        if match:
+            text = match.group(1).strip()
+        
         try:
-            # Try to find JSON in the response
-            text = text.strip()
-            
-            # Remove markdown code blocks if present
-            if "```json" in text:
-                text = text.split("```json")[1].split("```")[0].strip()
-            elif "```" in text:
-                text = text.split("```")[1].split("```")[0].strip()
-            
-            # Try to parse as JSON
             return json.loads(text)
-            
         except json.JSONDecodeError:
-            # If not JSON, return as text response
-            return {
-                "response": text,
-                "parsed": False
-            }
+            pass
+        
+        # JSON object embedded in surrounding prose; raw_decode stops where it ends
+        start = text.find("{")
+        if start != -1:
+            try:
+                return _JSON_DECODER.raw_decode(text, start)[0]
+            except json.JSONDecodeError:
+                pass
+        
+        # If not JSON, return as text response
+        return {
+            "response": text,
+            "parsed": False
+        }
     
     def _get_fallback_response(self, task: str) -> Dict[str, Any]:
         """Get fallback response when AI APIs are unavailable"""
@@ -361,7 +667,8 @@ class RoleAnalyzer:
             Role-specific analysis
         """
         # Get role skills
-        role_skills = self.ROLE_SKILLS.get(target_role, self.ROLE_SKILLS["Software Engineer"])
+        role = target_role if target_role in self.ROLE_SKILLS else "Software Engineer"
+        role_skills = self.ROLE_SKILLS[role]
         
         # Get AI recommendations
         ai_recs = self.ai_service.get_role_recommendations(resume_text, target_role)
@@ -371,24 +678,17 @@ class RoleAnalyzer:
             "target_role": target_role,
             "required_skills": role_skills,
             "ai_recommendations": ai_recs,
-            "skill_gaps": self._identify_skill_gaps(resume_text, role_skills),
+            "skill_gaps": self._identify_skill_gaps(resume_text, role),
             "learning_path": self._suggest_learning_path(role_skills, ai_recs)
         }
     
-    def _identify_skill_gaps(self, resume_text: str, role_skills: Dict) -> List[str]:
-        """Identify missing skills for the role"""
-        resume_lower = resume_text.lower()
-        gaps = []
-        
-        # Check core skills
-        for skill in role_skills.get("core", []):
-            if skill.lower() not in resume_lower:
-                gaps.append(skill)
+    def _identify_skill_gaps(self, resume_text: str, role: str) -> List[str]:
+        """Identify missing core skills and languages for the role"""
+        required, matcher = _SKILL_GAP_MATCHERS[role]
         
-        # Check languages
-        for lang in role_skills.get("languages", []):
-            if lang.lower() not in resume_lower:
-                gaps.append(lang)
+        # One scan of the resume for all of the role's skills
+        found = matcher.find_all(resume_text.lower())
+        gaps = [skill for skill, skill_lower in required if skill_lower not in found]
         
         return gaps[:5]  # Top 5 gaps
     
@@ -407,3 +707,14 @@ class RoleAnalyzer:
         
         return path
 
+
+def _build_skill_gap_matchers() -> Dict[str, Tuple[List[Tuple[str, str]], KeywordMatcher]]:
+    """Per role: (skill, lowercased skill) pairs checked for gaps, and their matcher"""
+    matchers = {}
+    for role, skills in RoleAnalyzer.ROLE_SKILLS.items():
+        required = [(skill, skill.lower()) for skill in skills.get("core", []) + skills.get("languages", [])]
+        matchers[role] = (required, KeywordMatcher(lower for _, lower in required))
+    return matchers
+
+
+_SKILL_GAP_MATCHERS = _build_skill_gap_matchers()
@@ -5,42 +5,109 @@ Handles user registration, login, and session management
 
 import json
 import os
+import sqlite3
+import hmac
 import hashlib
 import secrets
-from typing import Optional, Dict
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Tuple
 from datetime import datetime, timedelta
 
 
 class AuthManager:
     """Manage user authentication and sessions"""
     
-    def __init__(self, db_path: str = "users.json"):
+    SESSION_TTL = timedelta(days=7)
+    MAX_SESSIONS = 100_000
+    
+    # Expired sessions are swept once every this many session operations
+    SESSION_GC_INTERVAL = 256
+    
+    def __init__(self, db_path: str = "users.db", legacy_path: str = "users.json"):
         self.db_path = os.path.join(os.path.dirname(__file__), db_path)
-        self.sessions = {}  # In-memory session storage
+        self.legacy_path = os.path.join(os.path.dirname(__file__), legacy_path)
+        # In-memory session storage: token -> (expiry unix timestamp, session info).
+        # Every session has the same TTL, so insertion order is expiry order
+        self.sessions: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._session_ops = 0
+        # Sessions are touched from the event loop and from threadpool threads
+        # (sync dependencies, to_thread handlers)
+        self._sessions_lock = threading.Lock()
+        
+        # One connection shared by all requests; writes are serialized by the lock
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._write_lock = threading.Lock()
         self._ensure_db_exists()
     
     def _ensure_db_exists(self):
-        """Create users database file if it doesn't exist"""
-        if not os.path.exists(self.db_path):
-            with open(self.db_path, 'w') as f:
-                json.dump({}, f)
-    
-    def _hash_password(self, password: str) -> str:
-        """Hash password using SHA-256"""
-        return hashlib.sha256(password.encode()).hexdigest()
+        """Create the users table, importing users.json on first run"""
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # Emails are stored lowercased, so the primary key is the lookup index
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS users("
+            "email TEXT PRIMARY KEY, password_hash TEXT, name TEXT, created_at TEXT, salt TEXT)"
+        )
+        # Databases created before salted hashing lack the salt column
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(users)")}
+        if "salt" not in columns:
+            self._conn.execute("ALTER TABLE users ADD COLUMN salt TEXT")
+        self._conn.commit()
+        
+        if os.path.exists(self.legacy_path) and self._conn.execute("SELECT 1 FROM users LIMIT 1").fetchone() is None:
+            self._import_legacy_users()
     
-    def _load_users(self) -> Dict:
-        """Load users from database"""
+    def _import_legacy_users(self):
+        """Copy users from the old JSON database into SQLite"""
         try:
-            with open(self.db_path, 'r') as f:
-                return json.load(f)
-        except:
-            return {}
+            with open(self.legacy_path, 'r') as f:
+                users = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not import {self.legacy_path}: {str(e)}")
+            return
+        
+        with self._write_lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO users(email, password_hash, name, created_at) VALUES (?, ?, ?, ?)",
+                [
+                    (email, user.get("password_hash"), user.get("name"), user.get("created_at"))
+                    for email, user in users.items()
+                ]
+            )
+        print(f"Imported {len(users)} users from {self.legacy_path}")
+    
+    def _hash_password(self, password: str, salt: bytes) -> str:
+        """Hash password using scrypt, deliberately slow to resist brute force"""
+        return hashlib.scrypt(password.encode(), salt=salt, n=16384, r=8, p=1, dklen=32).hex()
     
-    def _save_users(self, users: Dict):
-        """Save users to database"""
-        with open(self.db_path, 'w') as f:
-            json.dump(users, f, indent=2)
+    def _verify_password(self, user: Dict, password: str) -> bool:
+        """Check a password against the stored hash in constant time"""
+        if user["salt"] is None:
+            # Unsalted SHA-256 hash from before scrypt; upgraded on successful login
+            candidate = hashlib.sha256(password.encode()).hexdigest()
+        else:
+            candidate = self._hash_password(password, bytes.fromhex(user["salt"]))
+        return hmac.compare_digest(candidate, user["password_hash"] or "")
+    
+    def _set_password(self, email_lower: str, password: str):
+        """Store a fresh salt and scrypt hash for a user"""
+        salt = secrets.token_bytes(16)
+        with self._write_lock, self._conn:
+            self._conn.execute(
+                "UPDATE users SET password_hash = ?, salt = ? WHERE email = ?",
+                (self._hash_password(password, salt), salt.hex(), email_lower)
+            )
+    
+    def _get_user(self, email_lower: str) -> Optional[Dict]:
+        """Look up a user by lowercased email"""
+        row = self._conn.execute(
+            "SELECT password_hash, name, salt FROM users WHERE email = ?", (email_lower,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"email": email_lower, "password_hash": row[0], "name": row[1], "salt": row[2]}
     
     def register(self, email: str, password: str, name: str) -> Dict:
         """
@@ -54,10 +121,8 @@ class AuthManager:
         Returns:
             Dict with success status and message
         """
-        users = self._load_users()
-        
         # Check if user already exists
-        if email.lower() in users:
+        if self._get_user(email.lower()) is not None:
             return {
                 "success": False,
                 "message": "Email already registered"
@@ -70,15 +135,19 @@ class AuthManager:
                 "message": "Password must be at least 8 characters"
             }
         
-        # Create user
-        users[email.lower()] = {
-            "email": email.lower(),
-            "password_hash": self._hash_password(password),
-            "name": name,
-            "created_at": datetime.now().isoformat()
-        }
-        
-        self._save_users(users)
+        # Create user; OR IGNORE keeps a concurrent duplicate from raising
+        salt = secrets.token_bytes(16)
+        password_hash = self._hash_password(password, salt)
+        with self._write_lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO users(email, password_hash, name, created_at, salt) VALUES (?, ?, ?, ?, ?)",
+                (email.lower(), password_hash, name, datetime.now().isoformat(), salt.hex())
+            )
+        if cursor.rowcount == 0:
+            return {
+                "success": False,
+                "message": "Email already registered"
+            }
         
         return {
             "success": True,
@@ -118,34 +187,41 @@ class AuthManager:
             }
         
         try:
-            users = self._load_users()
             email_lower = email.lower()
             
             # Check if user exists
-            if email_lower not in users:
+            user = self._get_user(email_lower)
+            if user is None:
                 return {
                     "success": False,
                     "message": "Invalid email or password"
                 }
             
-            user = users[email_lower]
-            
             # Verify password
-            password_hash = self._hash_password(password)
-            if user["password_hash"] != password_hash:
+            if not self._verify_password(user, password):
                 return {
                     "success": False,
                     "message": "Invalid email or password"
                 }
             
+            if user["salt"] is None:
+                self._set_password(email_lower, password)
+            
             # Create session
             session_token = secrets.token_urlsafe(32)
-            self.sessions[session_token] = {
-                "email": email_lower,
-                "name": user["name"],
-                "created_at": datetime.now().isoformat(),
-                "expires_at": (datetime.now() + timedelta(days=7)).isoformat()
-            }
+            now = datetime.now()
+            with self._sessions_lock:
+                self.sessions[session_token] = (time.time() + self.SESSION_TTL.total_seconds(), {
+                    "email": email_lower,
+                    "name": user["name"],
+                    "created_at": now.isoformat(),
+                    "expires_at": (now + self.SESSION_TTL).isoformat()
+                })
+                
+                # Drop the oldest sessions beyond the cap
+                while len(self.sessions) > self.MAX_SESSIONS:
+                    self.sessions.popitem(last=False)
+                self._maybe_gc_sessions()
             
             return {
                 "success": True,
@@ -177,30 +253,42 @@ class AuthManager:
         if not session_token:
             return None
         
-        if session_token not in self.sessions:
-            return None
-        
-        try:
-            session = self.sessions[session_token]
+        # Sessions live only in memory, so this is already an O(1) lookup with
+        # no database or hashing; a separate TTL cache in front would add nothing
+        with self._sessions_lock:
+            self._maybe_gc_sessions()
+            entry = self.sessions.get(session_token)
+            if entry is None:
+                return None
             
             # Check if session expired
-            if "expires_at" in session:
-                expires_at = datetime.fromisoformat(session["expires_at"])
-                if datetime.now() > expires_at:
-                    del self.sessions[session_token]
-                    return None
-            
-            return session
-        except Exception as e:
-            # If there's an error verifying session, remove it and return None
-            print(f"Error verifying session: {str(e)}")
-            if session_token in self.sessions:
-                del self.sessions[session_token]
-            return None
+            expires_at_ts, session = entry
+            if expires_at_ts < time.time():
+                self.sessions.pop(session_token, None)
+                return None
+        
+        return session
+    
+    def _maybe_gc_sessions(self):
+        """
+        Every SESSION_GC_INTERVAL calls, drop expired sessions from the oldest end
+        
+        Must be called with _sessions_lock held
+        """
+        self._session_ops += 1
+        if self._session_ops % self.SESSION_GC_INTERVAL:
+            return
+        
+        now = time.time()
+        while self.sessions:
+            token, (expires_at_ts, _) = next(iter(self.sessions.items()))
+            if expires_at_ts >= now:
+                break
+            self.sessions.pop(token, None)
     
     def logout(self, session_token: str):
         """Logout user by removing session"""
-        if session_token in self.sessions:
-            del self.sessions[session_token]
+        with self._sessions_lock:
+            self.sessions.pop(session_token, None)
 
 
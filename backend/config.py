@@ -0,0 +1,73 @@
+"""
+Configuration Module
+Loads .env once and exposes the environment settings used by the services
+"""
+
+import os
+import re
+from functools import lru_cache
+from typing import List, Optional
+from dotenv import load_dotenv
+
+
+class Settings:
+    """Environment configuration, read once per process"""
+
+    def __init__(self):
+        # AI providers
+        self.huggingface_api_key = os.getenv("HUGGINGFACE_API_KEY", "")
+        self.gemini_api_key = os.getenv("GEMINI_API_KEY", "")
+        self.openai_api_key = os.getenv("OPENAI_API_KEY", "")
+        self.llm_model_name = os.getenv("LLM_MODEL_NAME", "")
+        # Sentence Transformer model used for resume/job similarity
+        self.embedding_model = os.getenv("EMB_MODEL", "all-MiniLM-L6-v2")
+        self.semantic_cache_threshold = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+
+        # SMTP email
+        self.smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
+        self.smtp_port = int(os.getenv("SMTP_PORT", "587"))
+        self.sender_email = os.getenv("SENDER_EMAIL", "")
+        self.sender_password = os.getenv("SENDER_PASSWORD", "")
+
+        # EmailJS
+        self.emailjs_service_id = os.getenv("EMAILJS_SERVICE_ID", "")
+        self.emailjs_template_id = os.getenv("EMAILJS_TEMPLATE_ID", "")
+        self.emailjs_public_key = os.getenv("EMAILJS_PUBLIC_KEY", "")
+
+        # Server
+        origins = os.getenv("ALLOWED_ORIGINS")
+        origins = [o.strip() for o in origins.split(",") if o.strip()] if origins else [
+            "http://localhost:3000",
+            "http://localhost:8080",
+            "http://127.0.0.1:8080",
+        ]
+        # CORS compares allow_origins by exact string, so wildcard entries such as
+        # "https://*.vercel.app" only take effect as part of allowed_origin_regex
+        self.allowed_origins: List[str] = [o for o in origins if "*" not in o]
+        patterns = [
+            re.escape(o).replace(r"\*", "[a-z0-9-]+")
+            for o in origins if "*" in o
+        ]
+        extra_regex = os.getenv("ALLOWED_ORIGIN_REGEX")
+        if extra_regex:
+            patterns.append(extra_regex)
+        self.allowed_origin_regex: Optional[str] = "|".join(f"(?:{p})" for p in patterns) or None
+        # Accounts allowed to use the admin routes; none by default
+        self.admin_emails = frozenset(
+            e.strip().lower() for e in os.getenv("ADMIN_EMAILS", "").split(",") if e.strip()
+        )
+        self.port = int(os.getenv("PORT", 8000))
+        # Login sessions live in each worker process, so more than one worker
+        # breaks login; main.py refuses to start that way
+        self.web_concurrency = int(os.getenv("WEB_CONCURRENCY", "1"))
+        # Torch intra-op threads per worker; by default the cores are split between workers
+        self.torch_threads = int(os.getenv(
+            "TORCH_THREADS", str(max(1, (os.cpu_count() or 1) // max(1, self.web_concurrency)))
+        ))
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load .env (first call only) and return the shared settings"""
+    load_dotenv()
+    return Settings()
@@ -4,26 +4,72 @@ Sends email notifications using SMTP or EmailJS (free tier)
 """
 
 import smtplib
-import os
+import atexit
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Optional
 from emailjs_service import EmailJSService
+from config import Settings, get_settings
+
+LOGIN_SUBJECT = "Login Successful – career-IQ"
+
+LOGIN_BODY_TEMPLATE = """Hello {name},
+
+You have successfully logged in to career-IQ.
+
+Your future will be bright with the right skills and opportunities.
+Let's build your career smarter with AI.
+
+– career-IQ Team"""
 
 
 class EmailService:
     """Send emails via SMTP or EmailJS (free tier)"""
     
-    def __init__(self):
+    def __init__(self, settings: Optional[Settings] = None):
+        settings = settings or get_settings()
+        
         # Email configuration - can be set via environment variables
-        self.smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-        self.smtp_port = int(os.getenv("SMTP_PORT", "587"))
-        self.sender_email = os.getenv("SENDER_EMAIL", "")
-        self.sender_password = os.getenv("SENDER_PASSWORD", "")
+        self.smtp_server = settings.smtp_server
+        self.smtp_port = settings.smtp_port
+        self.sender_email = settings.sender_email
+        self.sender_password = settings.sender_password
         self.use_tls = True
         
         # Try EmailJS first (free, no backend SMTP needed)
-        self.emailjs = EmailJSService()
+        self.emailjs = EmailJSService(settings)
+        
+        # Notifications are sent in the background so requests don't wait on SMTP
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="email")
+        atexit.register(self._executor.shutdown, wait=False)
+        
+        # SMTP connection kept open between sends, opened on first use
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._smtp_lock = threading.Lock()
+        atexit.register(self._close_smtp)
+    
+    def send_login_notification_async(self, recipient_email: str, recipient_name: str) -> Future:
+        """
+        Queue a login notification email and return immediately
+        
+        Args:
+            recipient_email: Recipient email address
+            recipient_name: Recipient name
+        
+        Returns:
+            Future resolving to the send_login_notification result
+        """
+        future = self._executor.submit(self.send_login_notification, recipient_email, recipient_name)
+        future.add_done_callback(self._log_send_error)
+        return future
+    
+    @staticmethod
+    def _log_send_error(future: Future):
+        """Report a background send that raised, since nobody awaits the future"""
+        if not future.cancelled() and future.exception() is not None:
+            print(f"✗ Login notification failed: {str(future.exception())}")
     
     def send_login_notification(self, recipient_email: str, recipient_name: str) -> bool:
         """
@@ -41,18 +87,9 @@ class EmailService:
             return self.emailjs.send_login_notification(recipient_email, recipient_name)
         
         # Fallback to SMTP
-        subject = "Login Successful – career-IQ"
+        body = LOGIN_BODY_TEMPLATE.format(name=recipient_name)
         
-        body = f"""Hello {recipient_name},
-
-You have successfully logged in to career-IQ.
-
-Your future will be bright with the right skills and opportunities.
-Let's build your career smarter with AI.
-
-– career-IQ Team"""
-        
-        return self._send_email(recipient_email, subject, body)
+        return self._send_email(recipient_email, LOGIN_SUBJECT, body)
     
     def _send_email(self, recipient: str, subject: str, body: str) -> bool:
         """
@@ -92,11 +129,7 @@ Let's build your career smarter with AI.
             msg.attach(MIMEText(body, 'plain'))
             
             # Send email
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                if self.use_tls:
-                    server.starttls()
-                server.login(self.sender_email, self.sender_password)
-                server.send_message(msg)
+            self._deliver(msg)
             
             # Log successful email send
             print(f"✓ Login notification email sent successfully to {recipient}")
@@ -113,5 +146,44 @@ Let's build your career smarter with AI.
         except Exception as e:
             print(f"✗ Error sending email: {str(e)}")
             return False
-
-
+    
+    def _deliver(self, msg: MIMEMultipart):
+        """Send over the shared SMTP connection, reconnecting if the server dropped it"""
+        with self._smtp_lock:
+            for attempt in range(2):
+                if self._smtp is None:
+                    server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+                    try:
+                        if self.use_tls:
+                            server.starttls()
+                        server.login(self.sender_email, self.sender_password)
+                    except Exception:
+                        server.close()
+                        raise
+                    self._smtp = server
+                
+                try:
+                    self._smtp.send_message(msg)
+                    return
+                except smtplib.SMTPServerDisconnected:
+                    # Idle connection timed out server-side; the message wasn't accepted
+                    self._smtp = None
+                    if attempt:
+                        raise
+                except Exception:
+                    self._close_smtp_locked()
+                    raise
+    
+    def _close_smtp(self):
+        """Close the shared SMTP connection"""
+        with self._smtp_lock:
+            self._close_smtp_locked()
+    
+    def _close_smtp_locked(self):
+        """Close the shared SMTP connection (caller holds the lock)"""
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                self._smtp.close()
+            self._smtp = None
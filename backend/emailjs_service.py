@@ -4,39 +4,79 @@ Free email service for sending notifications
 Uses EmailJS (free tier) - no backend SMTP needed
 """
 
+import queue
+import atexit
+import threading
 import requests
-import os
-from typing import Optional
-from dotenv import load_dotenv
-
-load_dotenv()
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional, Tuple
+from config import Settings, get_settings
 
 
 class EmailJSService:
     """Send emails using EmailJS (free tier)"""
     
-    def __init__(self):
-        self.service_id = os.getenv("EMAILJS_SERVICE_ID", "")
-        self.template_id = os.getenv("EMAILJS_TEMPLATE_ID", "")
-        self.public_key = os.getenv("EMAILJS_PUBLIC_KEY", "")
+    def __init__(self, settings: Optional[Settings] = None):
+        settings = settings or get_settings()
+        self.service_id = settings.emailjs_service_id
+        self.template_id = settings.emailjs_template_id
+        self.public_key = settings.emailjs_public_key
         self.api_url = "https://api.emailjs.com/api/v1.0/email/send"
         self.enabled = bool(self.service_id and self.template_id and self.public_key)
+        
+        # Keep-alive session; POSTs are only retried when the connection
+        # could not be made, never after a response (or a read timeout),
+        # so an email is never sent twice
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=50,
+            max_retries=Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.3)
+        ))
+        
+        # Notifications are queued and posted by a background thread over the
+        # warm connection, each as soon as it arrives
+        self._queue: "queue.Queue[Tuple[str, str]]" = queue.Queue()
+        if self.enabled:
+            threading.Thread(target=self._flush_loop, name="emailjs-flush", daemon=True).start()
+            atexit.register(self._flush_pending)
     
     def send_login_notification(self, recipient_email: str, recipient_name: str) -> bool:
         """
-        Send login notification email via EmailJS
+        Queue a login notification email for the background sender
         
         Args:
             recipient_email: Recipient email address
             recipient_name: Recipient name
         
         Returns:
-            True if email sent successfully, False otherwise
+            True if the email was queued, False if EmailJS is not configured
         """
         if not self.enabled:
             print("EmailJS not configured. Skipping email notification.")
             return False
         
+        self._queue.put((recipient_email, recipient_name))
+        return True
+    
+    def _flush_loop(self):
+        """Background thread: send each notification as soon as it is queued"""
+        while True:
+            recipient_email, recipient_name = self._queue.get()
+            self._post(recipient_email, recipient_name)
+    
+    def _flush_pending(self):
+        """Send whatever is still queued (at interpreter exit)"""
+        while True:
+            try:
+                recipient_email, recipient_name = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            self._post(recipient_email, recipient_name)
+    
+    def _post(self, recipient_email: str, recipient_name: str) -> bool:
+        """Send one login notification through the EmailJS API"""
         template_params = {
             "to_email": recipient_email,
             "to_name": recipient_name,
@@ -45,7 +85,7 @@ class EmailJSService:
         }
         
         try:
-            response = requests.post(
+            response = self._session.post(
                 self.api_url,
                 json={
                     "service_id": self.service_id,
@@ -0,0 +1,288 @@
+"""
+Keyword Matcher Module
+Finds which phrases from a fixed vocabulary occur in a text
+Uses a Numba-compiled Aho-Corasick DFA or pyahocorasick when installed
+"""
+
+from bisect import bisect_right
+from collections import deque
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional, Set, FrozenSet
+
+# Optional dependencies, in order of preference: Numba-compiled DFA scan,
+# pyahocorasick, then plain substring scans
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _scan_bytes(data, byte_class, transitions, out_start, out_phrase, n_phrases):
+        """Run the DFA over data, flagging every phrase index that ends somewhere"""
+        found = np.zeros(n_phrases, dtype=np.bool_)
+        state = 0
+        for byte in data:
+            state = transitions[state, byte_class[byte]]
+            for k in range(out_start[state], out_start[state + 1]):
+                found[out_phrase[k]] = True
+        return found
+
+    @njit(cache=True)
+    def _scan_line_masks(data, byte_class, transitions, out_start, out_phrase, phrase_bits, n_lines):
+        """Run the DFA over newline-separated lines, OR-ing the bits of each line's phrases"""
+        masks = np.zeros(n_lines, dtype=np.int64)
+        line = 0
+        state = 0
+        for byte in data:
+            if byte == 10:
+                # Phrases never contain a newline, so matching restarts per line
+                line += 1
+                state = 0
+                continue
+            state = transitions[state, byte_class[byte]]
+            for k in range(out_start[state], out_start[state + 1]):
+                masks[line] |= phrase_bits[out_phrase[k]]
+        return masks
+
+
+class _CompiledDFA:
+    """Dense Aho-Corasick DFA over UTF-8 bytes, scanned by the Numba kernel"""
+
+    def __init__(self, phrases: List[str]):
+        self.phrases = phrases
+        encoded = [p.encode("utf-8") for p in phrases]
+
+        # Only bytes used by some phrase get their own column; class 0 is "other"
+        alphabet = sorted({b for p in encoded for b in p})
+        self.byte_class = np.zeros(256, dtype=np.int32)
+        for index, byte in enumerate(alphabet):
+            self.byte_class[byte] = index + 1
+        n_classes = len(alphabet) + 1
+
+        # Trie of phrases
+        goto: List[Dict[int, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for index, phrase in enumerate(encoded):
+            state = 0
+            for byte in phrase:
+                column = self.byte_class[byte]
+                nxt = goto[state].get(column)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto.append({})
+                    outputs.append([])
+                    goto[state][column] = nxt
+                state = nxt
+            outputs[state].append(index)
+
+        # Breadth-first failure links, folded straight into dense transitions
+        transitions = np.zeros((len(goto), n_classes), dtype=np.int32)
+        fail = [0] * len(goto)
+        queue = deque()
+        for column, nxt in goto[0].items():
+            transitions[0, column] = nxt
+            queue.append(nxt)
+        while queue:
+            state = queue.popleft()
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            for column in range(n_classes):
+                nxt = goto[state].get(column)
+                if nxt is None:
+                    transitions[state, column] = transitions[fail[state], column]
+                else:
+                    fail[nxt] = transitions[fail[state], column]
+                    transitions[state, column] = nxt
+                    queue.append(nxt)
+        self.transitions = transitions
+
+        # Per-state outputs in CSR form
+        self.out_start = np.zeros(len(goto) + 1, dtype=np.int32)
+        flat: List[int] = []
+        for state, state_outputs in enumerate(outputs):
+            flat.extend(state_outputs)
+            self.out_start[state + 1] = len(flat)
+        self.out_phrase = np.array(flat, dtype=np.int32)
+
+    def scan(self, text: str) -> Set[str]:
+        data = np.frombuffer(text.encode("utf-8"), dtype=np.uint8)
+        found = _scan_bytes(
+            data, self.byte_class, self.transitions,
+            self.out_start, self.out_phrase, len(self.phrases)
+        )
+        return {self.phrases[i] for i in np.flatnonzero(found)}
+
+    def scan_lines(self, text: str, phrase_bits) -> List[int]:
+        data = np.frombuffer(text.encode("utf-8"), dtype=np.uint8)
+        masks = _scan_line_masks(
+            data, self.byte_class, self.transitions,
+            self.out_start, self.out_phrase, phrase_bits, text.count("\n") + 1
+        )
+        return masks.tolist()
+
+
+class KeywordMatcher:
+    """Match a fixed set of lowercase phrases against text in one pass"""
+
+    def __init__(self, phrases: Iterable[str]):
+        # Deduplicate so each phrase is only ever scanned once
+        self.phrases: FrozenSet[str] = frozenset(p for p in phrases if p)
+
+        # Phrases bucketed by length, so short texts skip phrases that can't fit
+        self._by_length = sorted(self.phrases, key=len)
+        self._lengths = [len(p) for p in self._by_length]
+
+        self._dfa = None
+        self._automaton = None
+        if njit is not None and self.phrases:
+            self._dfa = _CompiledDFA(sorted(self.phrases))
+        elif ahocorasick is not None and self.phrases:
+            automaton = ahocorasick.Automaton()
+            for phrase in self.phrases:
+                automaton.add_word(phrase, phrase)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    @property
+    def has_automaton(self) -> bool:
+        """Whether matching runs through a single-pass automaton"""
+        return self._dfa is not None or self._automaton is not None
+
+    def find_all(self, text: str) -> Set[str]:
+        """
+        Find all vocabulary phrases occurring in text
+
+        Args:
+            text: Already-lowercased text to scan
+
+        Returns:
+            Set of phrases that occur as substrings of text
+        """
+        if not text:
+            return set()
+
+        if self._dfa is not None:
+            return self._dfa.scan(text)
+
+        if self._automaton is not None:
+            return {phrase for _, phrase in self._automaton.iter(text)}
+
+        # Substring search runs in C, so one scan per distinct phrase beats
+        # a pure-Python automaton for vocabularies of this size
+        fits = bisect_right(self._lengths, len(text))
+        return {phrase for phrase in self._by_length[:fits] if phrase in text}
+
+
+class GroupMatcher(KeywordMatcher):
+    """Find the first group, in priority order, with a phrase present in text"""
+
+    def __init__(self, groups: Dict[str, List[str]]):
+        self.groups = list(groups.items())
+        # line_groups packs one bit per group into an int64 mask
+        if len(self.groups) > 62:
+            raise ValueError(f"GroupMatcher supports at most 62 groups, got {len(self.groups)}")
+
+        # Highest-priority (lowest index) group each phrase belongs to, and
+        # every group listing it (once per listing) for group_counts
+        self._rank: Dict[str, int] = {}
+        self._owners: Dict[str, List[int]] = {}
+        for index, (_, phrases) in enumerate(self.groups):
+            for phrase in phrases:
+                self._rank.setdefault(phrase, index)
+                self._owners.setdefault(phrase, []).append(index)
+
+        super().__init__(self._rank)
+        # Per-phrase group bits for line_groups, built on first use
+        self._phrase_bits = None
+
+    def first_group(self, text: str) -> Optional[str]:
+        """
+        Find the highest-priority group matching the text
+
+        Args:
+            text: Already-lowercased text to scan
+
+        Returns:
+            Name of the first group with a phrase in text, or None
+        """
+        if not text:
+            return None
+
+        if self._dfa is not None:
+            ranks = [self._rank[phrase] for phrase in self._dfa.scan(text)]
+            return self.groups[min(ranks)][0] if ranks else None
+
+        if self._automaton is not None:
+            best = len(self.groups)
+            for _, phrase in self._automaton.iter(text):
+                rank = self._rank[phrase]
+                if rank < best:
+                    best = rank
+                    if best == 0:
+                        # Nothing can outrank the first group
+                        break
+            return self.groups[best][0] if best < len(self.groups) else None
+
+        # In priority order, so scanning stops at the first group that hits
+        for name, phrases in self.groups:
+            if any(phrase in text for phrase in phrases):
+                return name
+        return None
+
+    def group_counts(self, text: str) -> List[int]:
+        """
+        Count, per group, how many of its phrases occur in the text
+
+        Args:
+            text: Already-lowercased text to scan
+
+        Returns:
+            Phrase count for each group, indexed like self.groups
+        """
+        counts = [0] * len(self.groups)
+        for phrase in self.find_all(text):
+            for index in self._owners[phrase]:
+                counts[index] += 1
+        return counts
+
+    def line_groups(self, text: str) -> List[int]:
+        """
+        Find which groups have a phrase on each line of the text, in one pass
+
+        Args:
+            text: Already-lowercased text; phrases must not contain newlines
+
+        Returns:
+            One bitmask per '\\n'-separated line, with bit i set when the
+            i-th group (at most 62) has a phrase on that line
+        """
+        if self._dfa is not None:
+            if self._phrase_bits is None:
+                self._phrase_bits = np.array(
+                    [sum(1 << index for index in set(self._owners[p])) for p in self._dfa.phrases],
+                    dtype=np.int64
+                )
+            return self._dfa.scan_lines(text, self._phrase_bits)
+
+        masks = [0] * (text.count("\n") + 1)
+        if self._automaton is not None:
+            # A match never spans a newline, so its end offset fixes its line
+            line_ends = list(accumulate(len(line) + 1 for line in text.split("\n")))
+            for end, phrase in self._automaton.iter(text):
+                line = bisect_right(line_ends, end)
+                for index in self._owners[phrase]:
+                    masks[line] |= 1 << index
+            return masks
+
+        for line, line_text in enumerate(text.split("\n")):
+            for phrase in self.find_all(line_text):
+                for index in self._owners[phrase]:
+                    masks[line] |= 1 << index
+        return masks
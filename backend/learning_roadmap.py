@@ -3,16 +3,230 @@ Personalized Learning Roadmap Generator
 Creates 30/60/90 day learning plans
 """
 
-from typing import Dict, Any, List
+import copy
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Final, List, Tuple
 from datetime import datetime, timedelta
-from ai_service import AIService
+from ai_service import AIService, CircuitBreaker
+
+
+# Instructions come first and are identical on every call, so providers can
+# cache the prompt prefix; only the trailing role and skills vary
+AI_ROADMAP_PROMPT_PREFIX: Final[str] = """Create a personalized 90-day learning roadmap for becoming the target role below, covering the missing skills listed.
+
+Provide JSON with:
+1. weekly_breakdown: Week-by-week learning plan
+2. daily_schedule: Suggested daily time allocation
+3. project_timeline: When to build projects
+4. milestones: Key milestones to track progress
+5. resources: Specific resources for each week
+
+Format as JSON only."""
+
+AI_ROADMAP_PROMPT_TEMPLATE: Final[str] = AI_ROADMAP_PROMPT_PREFIX + "\n---\nTARGET ROLE: {role}\n\nMISSING SKILLS:\n{skills}"
+
+# Static scaffolding of the 30/60/90 day plans, built once at import. The plan
+# builders copy these and only fill in the skill-dependent fields (the None
+# placeholders keep the output's key order).
+_ALL_LEARNED_SKILLS = "All learned skills"
+_ALL_SKILLS_AND_SPECIALIZATION = "All skills + specialization"
+
+_PLAN_30_WEEK1_TASKS = (
+    "Complete online course or tutorial",
+    "Practice with small exercises"
+)
+
+_PLAN_30_WEEKS = (
+    {
+        "week": 1,
+        "focus": "Foundation Building",
+        "skills": None,
+        "tasks": None,
+        "projects": None,
+        "milestone": None
+    },
+    {
+        "week": 2,
+        "focus": "Hands-on Practice",
+        "skills": None,
+        "tasks": (
+            "Build small practice projects",
+            "Solve coding problems related to skills",
+            "Review and reinforce concepts"
+        ),
+        "projects": None,
+        "milestone": "Complete first project"
+    },
+    {
+        "week": 3,
+        "focus": "Advanced Learning",
+        "skills": None,
+        "tasks": (
+            "Learn advanced concepts",
+            "Study best practices",
+            "Review industry standards"
+        ),
+        "projects": None,
+        "milestone": "Gain deeper understanding"
+    },
+    {
+        "week": 4,
+        "focus": "Integration & Portfolio",
+        "skills": None,
+        "tasks": (
+            "Build a portfolio project",
+            "Add projects to GitHub",
+            "Update resume with new skills"
+        ),
+        "projects": None,
+        "milestone": "Complete portfolio project and update resume"
+    }
+)
+
+_PLAN_30_SUMMARY = {
+    "duration": "30 days",
+    "weeks": None,
+    "total_projects": 2,
+    "focus_areas": None,
+    "success_criteria": "Complete 2 projects and add skills to resume"
+}
+
+_PLAN_60_PHASES = (
+    {
+        "weeks": "1-2",
+        "focus": "Core Fundamentals",
+        "skills": None,
+        "tasks": (
+            "Complete comprehensive courses",
+            "Practice daily coding problems",
+            "Build understanding of core concepts"
+        ),
+        "projects": ("Build 1 foundational project",),
+        "milestone": "Strong foundation in core skills"
+    },
+    {
+        "weeks": "3-4",
+        "focus": "Practical Application",
+        "skills": None,
+        "tasks": (
+            "Build real-world projects",
+            "Implement best practices",
+            "Get code reviews"
+        ),
+        "projects": ("Build 2-3 practical projects",),
+        "milestone": "Portfolio with 3+ projects"
+    },
+    {
+        "weeks": "5-6",
+        "focus": "Advanced Topics & Specialization",
+        "skills": None,
+        "tasks": (
+            "Learn advanced concepts",
+            "Study system design (if applicable)",
+            "Prepare for interviews"
+        ),
+        "projects": ("Build 1 advanced project",),
+        "milestone": "Ready for technical interviews"
+    },
+    {
+        "weeks": "7-8",
+        "focus": "Mastery & Portfolio Building",
+        "skills": None,
+        "tasks": (
+            "Refine portfolio projects",
+            "Write technical blog posts",
+            "Contribute to open source",
+            "Update resume comprehensively"
+        ),
+        "projects": ("Polish all projects", "Add to portfolio"),
+        "milestone": "Strong portfolio ready for job applications"
+    }
+)
+
+_PLAN_60_SUMMARY = {
+    "duration": "60 days",
+    "phases": None,
+    "total_projects": 5,
+    "focus_areas": None,
+    "success_criteria": "Complete 5+ projects, strong portfolio, interview-ready"
+}
+
+_PLAN_90_PHASES = (
+    {
+        "phase": "Foundation",
+        "duration": "Days 1-30",
+        "focus": "Build Strong Foundation",
+        "skills": None,
+        "tasks": (
+            "Complete comprehensive courses",
+            "Daily coding practice",
+            "Build foundational projects"
+        ),
+        "projects": 3,
+        "milestone": "Strong foundation established"
+    },
+    {
+        "phase": "Application",
+        "duration": "Days 31-60",
+        "focus": "Real-World Application",
+        "skills": None,
+        "tasks": (
+            "Build complex projects",
+            "Implement best practices",
+            "Get mentorship/feedback"
+        ),
+        "projects": 4,
+        "milestone": "Portfolio with 7+ projects"
+    },
+    {
+        "phase": "Mastery",
+        "duration": "Days 61-90",
+        "focus": "Mastery & Specialization",
+        "skills": None,
+        "tasks": (
+            "Advanced projects",
+            "Open source contributions",
+            "Technical writing",
+            "Interview preparation",
+            "Resume optimization"
+        ),
+        "projects": 3,
+        "milestone": "Job-ready with strong portfolio"
+    }
+)
+
+_PLAN_90_SUMMARY = {
+    "duration": "90 days",
+    "phases": None,
+    "total_projects": 10,
+    "focus_areas": None,
+    "success_criteria": "Complete 10+ projects, strong portfolio, interview-ready, job applications ready"
+}
 
 
 class LearningRoadmapGenerator:
     """Generate personalized learning roadmaps"""
     
+    # Maximum number of AI roadmaps memoized per generator
+    CACHE_SIZE = 512
+    
+    # Background threads for AI roadmap calls, shared by all generators
+    _EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ai-roadmap")
+    
     def __init__(self, ai_service: AIService):
         self.ai_service = ai_service
+        # LRU of AI roadmaps; _get_ai_roadmap runs on the executor's threads
+        self._ai_cache: "OrderedDict[Tuple[str, Tuple[str, ...]], Dict[str, Any]]" = OrderedDict()
+        self._ai_cache_lock = threading.Lock()
+        # Stops calling into a broken AI path after repeated errors
+        self._ai_breaker = CircuitBreaker("AI roadmap", max_failures=5)
+    
+    def invalidate(self):
+        """Clear memoized AI roadmaps"""
+        with self._ai_cache_lock:
+            self._ai_cache.clear()
     
     def generate_roadmap(
         self,
@@ -23,15 +237,23 @@ class LearningRoadmapGenerator:
     ) -> Dict[str, Any]:
         """Generate personalized learning roadmap"""
         
+        # Start the AI-enhanced roadmap first so the network call overlaps the local plans
+        ai_future = None
+        if self.ai_service and self.ai_service.ai_enabled:
+            ai_future = self._EXECUTOR.submit(self._get_ai_roadmap, target_role, missing_skills)
+        
+        # Bucket the fundamentals by priority once for all three plans
+        buckets: Dict[str, List[Dict[str, Any]]] = {"high": [], "medium": [], "low": []}
+        for fundamental in missing_fundamentals:
+            buckets.setdefault(fundamental.get("priority"), []).append(fundamental)
+        
         # Generate roadmaps for different timeframes
-        roadmap_30 = self._generate_30_day_plan(target_role, experience_level, missing_skills, missing_fundamentals)
-        roadmap_60 = self._generate_60_day_plan(target_role, experience_level, missing_skills, missing_fundamentals)
-        roadmap_90 = self._generate_90_day_plan(target_role, experience_level, missing_skills, missing_fundamentals)
+        roadmap_30 = self._generate_30_day_plan(target_role, experience_level, missing_skills, buckets)
+        roadmap_60 = self._generate_60_day_plan(target_role, experience_level, missing_skills, buckets)
+        roadmap_90 = self._generate_90_day_plan(target_role, experience_level, missing_skills, buckets)
         
         # Get AI-enhanced roadmap if available
-        ai_roadmap = {}
-        if self.ai_service and self.ai_service.ai_enabled:
-            ai_roadmap = self._get_ai_roadmap(target_role, missing_skills)
+        ai_roadmap = ai_future.result() if ai_future is not None else {}
         
         return {
             "30_day": roadmap_30,
@@ -47,80 +269,55 @@ class LearningRoadmapGenerator:
         target_role: str,
         experience_level: str,
         missing_skills: List[str],
-        missing_fundamentals: List[Dict[str, Any]]
+        buckets: Dict[str, List[Dict[str, Any]]]
     ) -> Dict[str, Any]:
         """Generate 30-day learning plan"""
         
         # Prioritize high-priority fundamentals
-        high_priority = [m for m in missing_fundamentals if m.get("priority") == "high"][:2]
-        medium_priority = [m for m in missing_fundamentals if m.get("priority") == "medium"][:1]
-        
-        weeks = []
+        high_priority = buckets["high"][:2]
+        medium_priority = buckets["medium"][:1]
         
-        # Week 1: Foundation
         week1_skills = [h["skill"] for h in high_priority[:1]]
-        weeks.append({
-            "week": 1,
-            "focus": "Foundation Building",
-            "skills": week1_skills,
-            "tasks": [
-                f"Learn basics of {week1_skills[0] if week1_skills else 'core skills'}",
-                "Complete online course or tutorial",
-                "Practice with small exercises"
-            ],
-            "projects": [],
-            "milestone": f"Understand fundamentals of {week1_skills[0] if week1_skills else 'core concepts'}"
-        })
-        
-        # Week 2: Practice
-        weeks.append({
-            "week": 2,
-            "focus": "Hands-on Practice",
-            "skills": week1_skills,
-            "tasks": [
-                "Build small practice projects",
-                "Solve coding problems related to skills",
-                "Review and reinforce concepts"
-            ],
-            "projects": [f"Build 1 small project using {week1_skills[0] if week1_skills else 'learned skills'}"],
-            "milestone": "Complete first project"
-        })
-        
-        # Week 3: Advanced Topics
         week3_skills = [h["skill"] for h in high_priority[1:]] + [m["skill"] for m in medium_priority]
-        weeks.append({
-            "week": 3,
-            "focus": "Advanced Learning",
-            "skills": week3_skills[:2] if week3_skills else week1_skills,
-            "tasks": [
-                "Learn advanced concepts",
-                "Study best practices",
-                "Review industry standards"
-            ],
-            "projects": [],
-            "milestone": "Gain deeper understanding"
-        })
+        first_skill = week1_skills[0] if week1_skills else None
         
-        # Week 4: Integration
-        weeks.append({
-            "week": 4,
-            "focus": "Integration & Portfolio",
-            "skills": week1_skills + week3_skills[:1],
-            "tasks": [
-                "Build a portfolio project",
-                "Add projects to GitHub",
-                "Update resume with new skills"
-            ],
-            "projects": [f"Build 1 portfolio project showcasing {week1_skills[0] if week1_skills else 'skills'}"],
-            "milestone": "Complete portfolio project and update resume"
-        })
+        week1, week2, week3, week4 = _PLAN_30_WEEKS
+        weeks = [
+            # Week 1: Foundation
+            {
+                **week1,
+                "skills": week1_skills,
+                "tasks": [f"Learn basics of {first_skill or 'core skills'}", *_PLAN_30_WEEK1_TASKS],
+                "projects": [],
+                "milestone": f"Understand fundamentals of {first_skill or 'core concepts'}"
+            },
+            # Week 2: Practice
+            {
+                **week2,
+                "skills": week1_skills,
+                "tasks": list(week2["tasks"]),
+                "projects": [f"Build 1 small project using {first_skill or 'learned skills'}"]
+            },
+            # Week 3: Advanced Topics
+            {
+                **week3,
+                "skills": week3_skills[:2] if week3_skills else week1_skills,
+                "tasks": list(week3["tasks"]),
+                "projects": []
+            },
+            # Week 4: Integration
+            {
+                **week4,
+                "skills": week1_skills + week3_skills[:1],
+                "tasks": list(week4["tasks"]),
+                "projects": [f"Build 1 portfolio project showcasing {first_skill or 'skills'}"]
+            }
+        ]
         
         return {
-            "duration": "30 days",
+            **_PLAN_30_SUMMARY,
             "weeks": weeks,
-            "total_projects": 2,
-            "focus_areas": [h["skill"] for h in high_priority[:2]],
-            "success_criteria": "Complete 2 projects and add skills to resume"
+            "focus_areas": [h["skill"] for h in high_priority[:2]]
         }
     
     def _generate_60_day_plan(
@@ -128,79 +325,37 @@ class LearningRoadmapGenerator:
         target_role: str,
         experience_level: str,
         missing_skills: List[str],
-        missing_fundamentals: List[Dict[str, Any]]
+        buckets: Dict[str, List[Dict[str, Any]]]
     ) -> Dict[str, Any]:
         """Generate 60-day learning plan"""
         
         # More comprehensive plan
-        high_priority = [m for m in missing_fundamentals if m.get("priority") == "high"][:3]
-        medium_priority = [m for m in missing_fundamentals if m.get("priority") == "medium"][:2]
-        
-        weeks = []
-        
-        # Weeks 1-2: Foundation
-        weeks.append({
-            "weeks": "1-2",
-            "focus": "Core Fundamentals",
-            "skills": [h["skill"] for h in high_priority[:2]],
-            "tasks": [
-                "Complete comprehensive courses",
-                "Practice daily coding problems",
-                "Build understanding of core concepts"
-            ],
-            "projects": ["Build 1 foundational project"],
-            "milestone": "Strong foundation in core skills"
-        })
+        high_priority = buckets["high"][:3]
+        medium_priority = buckets["medium"][:2]
         
-        # Weeks 3-4: Application
-        weeks.append({
-            "weeks": "3-4",
-            "focus": "Practical Application",
-            "skills": [h["skill"] for h in high_priority],
-            "tasks": [
-                "Build real-world projects",
-                "Implement best practices",
-                "Get code reviews"
-            ],
-            "projects": ["Build 2-3 practical projects"],
-            "milestone": "Portfolio with 3+ projects"
-        })
+        high_skills = [h["skill"] for h in high_priority]
+        medium_skills = [m["skill"] for m in medium_priority]
         
-        # Weeks 5-6: Advanced & Specialization
-        weeks.append({
-            "weeks": "5-6",
-            "focus": "Advanced Topics & Specialization",
-            "skills": [m["skill"] for m in medium_priority] + missing_skills[:2],
-            "tasks": [
-                "Learn advanced concepts",
-                "Study system design (if applicable)",
-                "Prepare for interviews"
-            ],
-            "projects": ["Build 1 advanced project"],
-            "milestone": "Ready for technical interviews"
-        })
-        
-        # Weeks 7-8: Mastery & Portfolio
-        weeks.append({
-            "weeks": "7-8",
-            "focus": "Mastery & Portfolio Building",
-            "skills": "All learned skills",
-            "tasks": [
-                "Refine portfolio projects",
-                "Write technical blog posts",
-                "Contribute to open source",
-                "Update resume comprehensively"
-            ],
-            "projects": ["Polish all projects", "Add to portfolio"],
-            "milestone": "Strong portfolio ready for job applications"
-        })
+        phase_skills = (
+            high_skills[:2],                     # Weeks 1-2: Foundation
+            high_skills,                         # Weeks 3-4: Application
+            medium_skills + missing_skills[:2],  # Weeks 5-6: Advanced & Specialization
+            _ALL_LEARNED_SKILLS                  # Weeks 7-8: Mastery & Portfolio
+        )
+        weeks = [
+            {
+                **template,
+                "skills": skills,
+                "tasks": list(template["tasks"]),
+                "projects": list(template["projects"])
+            }
+            for template, skills in zip(_PLAN_60_PHASES, phase_skills)
+        ]
         
         return {
-            "duration": "60 days",
+            **_PLAN_60_SUMMARY,
             "phases": weeks,
-            "total_projects": 5,
-            "focus_areas": [h["skill"] for h in high_priority] + [m["skill"] for m in medium_priority],
-            "success_criteria": "Complete 5+ projects, strong portfolio, interview-ready"
+            "focus_areas": high_skills + medium_skills
         }
     
     def _generate_90_day_plan(
@@ -208,70 +363,31 @@ class LearningRoadmapGenerator:
         target_role: str,
         experience_level: str,
         missing_skills: List[str],
-        missing_fundamentals: List[Dict[str, Any]]
+        buckets: Dict[str, List[Dict[str, Any]]]
     ) -> Dict[str, Any]:
         """Generate 90-day comprehensive learning plan"""
         
         # Comprehensive transformation plan
-        high_priority = [m for m in missing_fundamentals if m.get("priority") == "high"]
-        medium_priority = [m for m in missing_fundamentals if m.get("priority") == "medium"]
-        low_priority = [m for m in missing_fundamentals if m.get("priority") == "low"][:2]
-        
-        phases = []
-        
-        # Phase 1: Foundation (Days 1-30)
-        phases.append({
-            "phase": "Foundation",
-            "duration": "Days 1-30",
-            "focus": "Build Strong Foundation",
-            "skills": [h["skill"] for h in high_priority[:3]],
-            "tasks": [
-                "Complete comprehensive courses",
-                "Daily coding practice",
-                "Build foundational projects"
-            ],
-            "projects": 3,
-            "milestone": "Strong foundation established"
-        })
+        high_priority = buckets["high"]
+        medium_priority = buckets["medium"]
         
-        # Phase 2: Application (Days 31-60)
-        phases.append({
-            "phase": "Application",
-            "duration": "Days 31-60",
-            "focus": "Real-World Application",
-            "skills": [h["skill"] for h in high_priority] + [m["skill"] for m in medium_priority[:2]],
-            "tasks": [
-                "Build complex projects",
-                "Implement best practices",
-                "Get mentorship/feedback"
-            ],
-            "projects": 4,
-            "milestone": "Portfolio with 7+ projects"
-        })
+        high_skills = [h["skill"] for h in high_priority]
+        medium_skills = [m["skill"] for m in medium_priority]
         
-        # Phase 3: Mastery (Days 61-90)
-        phases.append({
-            "phase": "Mastery",
-            "duration": "Days 61-90",
-            "focus": "Mastery & Specialization",
-            "skills": "All skills + specialization",
-            "tasks": [
-                "Advanced projects",
-                "Open source contributions",
-                "Technical writing",
-                "Interview preparation",
-                "Resume optimization"
-            ],
-            "projects": 3,
-            "milestone": "Job-ready with strong portfolio"
-        })
+        phase_skills = (
+            high_skills[:3],                    # Phase 1: Foundation (Days 1-30)
+            high_skills + medium_skills[:2],    # Phase 2: Application (Days 31-60)
+            _ALL_SKILLS_AND_SPECIALIZATION      # Phase 3: Mastery (Days 61-90)
+        )
+        phases = [
+            {**template, "skills": skills, "tasks": list(template["tasks"])}
+            for template, skills in zip(_PLAN_90_PHASES, phase_skills)
+        ]
         
         return {
-            "duration": "90 days",
+            **_PLAN_90_SUMMARY,
             "phases": phases,
-            "total_projects": 10,
-            "focus_areas": [h["skill"] for h in high_priority] + [m["skill"] for m in medium_priority],
-            "success_criteria": "Complete 10+ projects, strong portfolio, interview-ready, job applications ready"
+            "focus_areas": high_skills + medium_skills
         }
     
     def _get_ai_roadmap(
@@ -283,25 +399,45 @@ class LearningRoadmapGenerator:
         if not self.ai_service or not self.ai_service.ai_enabled:
             return {}
         
+        # Same role and skill set in any order or case reuses the roadmap
+        key = (target_role, tuple(sorted(s.lower() for s in missing_skills[:10])))
+        with self._ai_cache_lock:
+            cached = self._ai_cache.get(key)
+            if cached is not None:
+                self._ai_cache.move_to_end(key)
+        if cached is not None:
+            # A copy, so a response that is modified doesn't alter the cache
+            return copy.deepcopy(cached)
+        
+        # Cached roadmaps are served even while the circuit is open; allow()
+        # is only asked right before a call, since half-open it hands out the trial
+        if not self._ai_breaker.allow():
+            return {}
+        
         skills_str = ", ".join(missing_skills[:10])
         
-        prompt = f"""Create a personalized 90-day learning roadmap for becoming a {target_role}.
-
-MISSING SKILLS:
-{skills_str}
-
-Provide JSON with:
-1. weekly_breakdown: Week-by-week learning plan
-2. daily_schedule: Suggested daily time allocation
-3. project_timeline: When to build projects
-4. milestones: Key milestones to track progress
-5. resources: Specific resources for each week
-
-Format as JSON only."""
+        prompt = AI_ROADMAP_PROMPT_TEMPLATE.format(role=target_role, skills=skills_str)
         
         try:
-            return self.ai_service._call_ai(prompt, task="roadmap")
-        except:
+            roadmap = self.ai_service._call_ai(prompt, task="roadmap")
+        except Exception as e:
+            print(f"AI roadmap failed: {str(e)}")
+            self._ai_breaker.record_failure()
             return {}
+        
+        # _call_ai reports provider errors by returning the placeholder rather
+        # than raising, so that counts as a failure (and is never cached)
+        if not roadmap or roadmap == self.ai_service._get_fallback_response("roadmap"):
+            self._ai_breaker.record_failure()
+            return roadmap
+        self._ai_breaker.record_success()
+        
+        stored = copy.deepcopy(roadmap)
+        with self._ai_cache_lock:
+            self._ai_cache[key] = stored
+            while len(self._ai_cache) > self.CACHE_SIZE:
+                self._ai_cache.popitem(last=False)
+        
+        return roadmap
 
 
@@ -0,0 +1,269 @@
+"""
+LLM Response Cache Module
+Exact-match LRU cache for AI responses with JSON file persistence,
+plus an embedding-similarity cache for near-duplicate prompts
+"""
+
+import os
+import copy
+import json
+import atexit
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(__file__), "data", "llm_cache.json")
+
+
+class LLMCache:
+    """In-memory LRU of AI responses, written through to a JSON file"""
+
+    PROMPT_VERSION = "v1"
+
+    # Writes are batched: the file is rewritten at most once per this many
+    # seconds, on a background thread, rather than on every set()
+    SAVE_DELAY = 2.0
+
+    def __init__(
+        self,
+        path: Optional[str] = DEFAULT_CACHE_PATH,
+        max_entries: int = 1000,
+        ttl: timedelta = timedelta(days=7)
+    ):
+        """
+        Args:
+            path: JSON file used for persistence, or None for memory only
+            max_entries: Maximum number of responses kept
+            ttl: How long a cached response stays valid
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Serializes file writes, so an older snapshot never replaces a newer one
+        self._save_lock = threading.Lock()
+        self._save_timer: Optional[threading.Timer] = None
+        self._load()
+        if self.path:
+            atexit.register(self.flush)
+
+    @staticmethod
+    def make_key(prompt: str, task: str, model: str) -> str:
+        """Hash the task, model and prompt into a cache key"""
+        return hashlib.sha256(f"{task}|{model}|{prompt}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached response for key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and datetime.fromisoformat(entry["expiresAt"]) < datetime.now():
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            # Callers may mutate the dict they get back
+            return copy.deepcopy(entry["response"])
+
+    def set(self, key: str, response: Any, model: str = ""):
+        """Store a response and persist the cache"""
+        now = datetime.now()
+        with self._lock:
+            self._entries[key] = {
+                "inputHash": key,
+                "promptVersion": self.PROMPT_VERSION,
+                "modelId": model,
+                "response": copy.deepcopy(response),
+                "createdAt": now.isoformat(),
+                "expiresAt": (now + self.ttl).isoformat()
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._schedule_save()
+
+    def clear(self):
+        """Drop all cached responses"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+            self._schedule_save()
+
+    def flush(self):
+        """Write any pending changes to disk now"""
+        with self._lock:
+            timer, self._save_timer = self._save_timer, None
+        if timer is not None:
+            timer.cancel()
+            self._save()
+
+    def _load(self):
+        """Load unexpired entries written by a previous run"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable LLM cache file: {str(e)}")
+            return
+
+        now = datetime.now()
+        for entry in entries:
+            try:
+                if entry.get("promptVersion") != self.PROMPT_VERSION:
+                    continue
+                if datetime.fromisoformat(entry["expiresAt"]) < now:
+                    continue
+                self._entries[entry["inputHash"]] = entry
+            except (AttributeError, KeyError, TypeError, ValueError):
+                continue
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _schedule_save(self):
+        """Start the delayed background save unless one is pending (caller holds the lock)"""
+        if not self.path or self._save_timer is not None:
+            return
+        self._save_timer = threading.Timer(self.SAVE_DELAY, self._save_pending)
+        self._save_timer.daemon = True
+        self._save_timer.start()
+
+    def _save_pending(self):
+        """Timer callback: write the cache unless flush() already did"""
+        with self._lock:
+            if self._save_timer is None:
+                return
+            self._save_timer = None
+        self._save()
+
+    def _save(self):
+        """Write the cache to disk atomically"""
+        with self._save_lock:
+            with self._lock:
+                # Entries are replaced, never modified, so the snapshot can be
+                # serialized without holding the cache lock
+                entries = list(self._entries.values())
+            tmp_path = None
+            try:
+                directory = os.path.dirname(self.path)
+                os.makedirs(directory, exist_ok=True)
+                # A temp file of its own, so workers sharing the cache path
+                # never write into the same file
+                with tempfile.NamedTemporaryFile(
+                    'w', dir=directory, prefix=os.path.basename(self.path) + ".", suffix=".tmp", delete=False
+                ) as f:
+                    tmp_path = f.name
+                    json.dump(entries, f)
+                os.replace(tmp_path, self.path)
+            except (OSError, TypeError, ValueError) as e:
+                print(f"Could not persist LLM cache: {str(e)}")
+                if tmp_path and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+
+class SemanticCache:
+    """
+    In-memory cache returning a stored response for a sufficiently similar request
+
+    Requests are compared on their variable fields only, each embedded
+    separately, since the shared instructions would otherwise dominate the
+    embedding. A hit needs every field to be similar, and the same task and
+    scope (e.g. the role). The encoder only reads the first 256 tokens, so
+    fields must be short (skill lists), never a resume: two resumes sharing a
+    template would look identical and one user would get another's response.
+    """
+
+    def __init__(
+        self,
+        encoder: Any,
+        threshold: float = 0.92,
+        max_entries: int = 1000
+    ):
+        """
+        Args:
+            encoder: Sentence encoder with SentenceTransformer's encode(), shared
+                with the resume matcher rather than loading a second copy
+            threshold: Minimum cosine similarity for a hit
+            max_entries: Maximum number of responses kept
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._model = encoder
+        # Per entry: (task, scope), field embeddings (one unit row per field), response
+        self._keys: List[tuple] = []
+        self._vectors: List[Any] = []
+        self._responses: List[Any] = []
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether an embedding model is available"""
+        return self._model is not None
+
+    def embed(self, fields: Sequence[str]):
+        """Embed each variable field of a request as a unit row, or None when disabled"""
+        if self._model is None or not fields:
+            return None
+        return np.asarray(self._model.encode(list(fields), normalize_embeddings=True))
+
+    def get(self, vecs, task: str, scope: str = "") -> Optional[Any]:
+        """
+        Find the most similar cached request for the same task and scope
+
+        Args:
+            vecs: Field embeddings of the request, from embed()
+            task: Task type the response must have been produced for
+            scope: Exact-match context such as the target role
+
+        Returns:
+            Cached response, or None when some field isn't similar enough
+        """
+        if vecs is None:
+            return None
+        with self._lock:
+            key = (task, scope)
+            candidates = [
+                i for i, entry_key in enumerate(self._keys)
+                if entry_key == key and self._vectors[i].shape == vecs.shape
+            ]
+            if candidates:
+                # Rows are normalized, so per-field dot products are cosines;
+                # a request is as similar as its least similar field
+                stacked = np.stack([self._vectors[i] for i in candidates])
+                sims = np.einsum('nkd,kd->nk', stacked, vecs).min(axis=1)
+                best = int(np.argmax(sims))
+                if sims[best] >= self.threshold:
+                    self.hits += 1
+                    return copy.deepcopy(self._responses[candidates[best]])
+            self.misses += 1
+            return None
+
+    def set(self, vecs, task: str, response: Any, scope: str = ""):
+        """Add a request's field embeddings and its response, dropping the oldest beyond the cap"""
+        if vecs is None:
+            return
+        with self._lock:
+            self._keys.append((task, scope))
+            self._vectors.append(vecs)
+            self._responses.append(copy.deepcopy(response))
+            overflow = len(self._keys) - self.max_entries
+            if overflow > 0:
+                del self._keys[:overflow]
+                del self._vectors[:overflow]
+                del self._responses[:overflow]
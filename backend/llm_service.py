@@ -3,10 +3,16 @@ LLM Service Module
 Supports multiple LLM providers: Gemini, OpenAI, and Hugging Face
 """
 
-import os
 import json
-from typing import Optional, Dict, Any
+import asyncio
+from typing import Optional, Dict, Any, Tuple
 from enum import Enum
+from config import Settings, get_settings
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
 
 
 class LLMProvider(Enum):
@@ -20,36 +26,29 @@ class LLMProvider(Enum):
 class LLMService:
     """Service for interacting with various LLM APIs"""
     
-    def __init__(self):
-        self.provider = self._detect_provider()
-        self.api_key = self._get_api_key()
-        self.model_name = os.getenv("LLM_MODEL_NAME", "")
+    def __init__(self, settings: Optional[Settings] = None):
+        settings = settings or get_settings()
+        # Settings are read once per process, so the provider is resolved here only
+        self.provider, self.api_key = self._detect_provider(settings)
+        self.model_name = settings.llm_model_name
         
-    def _detect_provider(self) -> LLMProvider:
-        """Detect which LLM provider to use based on available API keys"""
-        gemini_key = os.getenv("GEMINI_API_KEY")
-        openai_key = os.getenv("OPENAI_API_KEY")
-        hf_key = os.getenv("HUGGINGFACE_API_KEY")
+        # SDK clients are built on first use and reused, keeping their connection pools warm
+        self._client = None
+        self._genai_model = None
+        self._http = None
         
+    @staticmethod
+    def _detect_provider(settings: Settings) -> Tuple[LLMProvider, Optional[str]]:
+        """Detect which LLM provider to use, and its API key, from the configured keys"""
         # Priority: Gemini > OpenAI > Hugging Face
-        if gemini_key:
-            return LLMProvider.GEMINI
-        elif openai_key:
-            return LLMProvider.OPENAI
-        elif hf_key:
-            return LLMProvider.HUGGINGFACE
+        if settings.gemini_api_key:
+            return LLMProvider.GEMINI, settings.gemini_api_key
+        elif settings.openai_api_key:
+            return LLMProvider.OPENAI, settings.openai_api_key
+        elif settings.huggingface_api_key:
+            return LLMProvider.HUGGINGFACE, settings.huggingface_api_key
         else:
-            return LLMProvider.NONE
-    
-    def _get_api_key(self) -> Optional[str]:
-        """Get the API key for the detected provider"""
-        if self.provider == LLMProvider.GEMINI:
-            return os.getenv("GEMINI_API_KEY")
-        elif self.provider == LLMProvider.OPENAI:
-            return os.getenv("OPENAI_API_KEY")
-        elif self.provider == LLMProvider.HUGGINGFACE:
-            return os.getenv("HUGGINGFACE_API_KEY")
-        return None
+            return LLMProvider.NONE, None
     
     async def generate_text(self, prompt: str, max_tokens: int = 1000) -> str:
         """
@@ -79,12 +78,13 @@ class LLMService:
     async def _call_gemini(self, prompt: str, max_tokens: int) -> str:
         """Call Google Gemini API"""
         try:
-            import google.generativeai as genai
+            if self._genai_model is None:
+                import google.generativeai as genai
+                
+                genai.configure(api_key=self.api_key)
+                self._genai_model = genai.GenerativeModel('gemini-pro')
             
-            genai.configure(api_key=self.api_key)
-            model = genai.GenerativeModel('gemini-pro')
-            
-            response = model.generate_content(
+            response = await self._genai_model.generate_content_async(
                 prompt,
                 generation_config={
                     'max_output_tokens': max_tokens,
@@ -101,13 +101,14 @@ class LLMService:
     async def _call_openai(self, prompt: str, max_tokens: int) -> str:
         """Call OpenAI API"""
         try:
-            import openai
-            
-            client = openai.OpenAI(api_key=self.api_key)
+            if self._client is None:
+                import openai
+                
+                self._client = openai.AsyncOpenAI(api_key=self.api_key)
             
             model = self.model_name or "gpt-3.5-turbo"
             
-            response = client.chat.completions.create(
+            response = await self._client.chat.completions.create(
                 model=model,
                 messages=[
                     {"role": "system", "content": "You are a helpful career advisor and skill development expert."},
@@ -126,8 +127,6 @@ class LLMService:
     async def _call_huggingface(self, prompt: str, max_tokens: int) -> str:
         """Call Hugging Face Inference API"""
         try:
-            import requests
-            
             model = self.model_name or "mistralai/Mistral-7B-Instruct-v0.2"
             api_url = f"https://api-inference.huggingface.co/models/{model}"
             
@@ -142,10 +141,7 @@ class LLMService:
                 }
             }
             
-            response = requests.post(api_url, headers=headers, json=payload, timeout=30)
-            response.raise_for_status()
-            
-            result = response.json()
+            result = await self._post_json(api_url, headers, payload)
             
             # Handle different response formats
             if isinstance(result, list) and len(result) > 0:
@@ -160,6 +156,32 @@ class LLMService:
         except Exception as e:
             raise Exception(f"Hugging Face API error: {str(e)}")
     
+    async def _post_json(self, url: str, headers: Dict[str, str], payload: Dict[str, Any]) -> Any:
+        """POST a JSON payload without blocking the event loop and return the decoded body"""
+        if aiohttp is None:
+            import requests
+            
+            def post():
+                response = requests.post(url, headers=headers, json=payload, timeout=30)
+                response.raise_for_status()
+                return response.json()
+            return await asyncio.to_thread(post)
+        
+        if self._http is None:
+            self._http = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+        async with self._http.post(url, headers=headers, json=payload) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+    
+    async def close(self):
+        """Close the HTTP session and SDK client, if they were opened"""
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+    
     def _get_fallback_response(self, prompt: str) -> str:
         """Fallback response when no LLM is configured"""
         return (
@@ -3,16 +3,18 @@ Career-IQ Backend API
 FastAPI server for resume analysis and job matching with authentication
 """
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, Form, Header
+from fastapi import FastAPI, File, UploadFile, HTTPException, Form, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, RedirectResponse
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import uvicorn
 import os
-from typing import Optional, Any
-import numpy as np
-from dotenv import load_dotenv
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict
+from config import get_settings
 
-load_dotenv()
+settings = get_settings()
 
 from resume_parser import ResumeParser
 from skill_extractor import SkillExtractor
@@ -22,17 +24,15 @@ from email_service import EmailService
 from llm_service import LLMService
 from role_advisor import RoleAdvisor
 
-app = FastAPI(title="Career-IQ API", version="2.0.0")
+# orjson serializes numpy scalars and arrays natively, in C
+app = FastAPI(title="Career-IQ API", version="2.0.0", default_response_class=ORJSONResponse)
 
-allowed_origins = os.getenv("ALLOWED_ORIGINS", "").split(",") if os.getenv("ALLOWED_ORIGINS") else [
-    "http://localhost:3000",
-    "http://localhost:8080",
-    "http://127.0.0.1:8080",
-]
+allowed_origins = settings.allowed_origins
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,
+    allow_origin_regex=settings.allowed_origin_regex,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -46,26 +46,77 @@ email_service = EmailService()
 llm_service = LLMService()
 role_advisor = RoleAdvisor(llm_service)
 
-UPLOADS_DIR = os.path.join(os.path.dirname(__file__), "uploads")
-os.makedirs(UPLOADS_DIR, exist_ok=True)
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+UPLOAD_CHUNK_BYTES = 1 << 20
 
+# Missing or non-Bearer Authorization headers resolve to None instead of a 403
+bearer_scheme = HTTPBearer(auto_error=False)
 
-def convert_to_json_serializable(obj: Any) -> Any:
-    if isinstance(obj, (np.integer, np.floating)):
-        return float(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    elif isinstance(obj, dict):
-        return {k: convert_to_json_serializable(v) for k, v in obj.items()}
-    elif isinstance(obj, (list, tuple)):
-        return [convert_to_json_serializable(i) for i in obj]
-    return obj
+
+def get_session_token(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)
+) -> Optional[str]:
+    return credentials.credentials if credentials else None
+
+
+def get_current_user(token: Optional[str] = Depends(get_session_token)) -> Optional[Dict]:
+    return auth_manager.verify_session(token) if token else None
+
+
+def require_user(
+    token: Optional[str] = Depends(get_session_token),
+    user: Optional[Dict] = Depends(get_current_user)
+) -> Dict:
+    if not token:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    if not user:
+        raise HTTPException(status_code=401, detail="Session expired")
+    return user
+
+
+def require_admin(user: Dict = Depends(require_user)) -> Dict:
+    # Only accounts listed in ADMIN_EMAILS; any user can sign up, so being
+    # logged in is not enough
+    if user["email"] not in settings.admin_emails:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return user
+
+
+@app.on_event("startup")
+async def configure_worker_threads():
+    # asyncio.to_thread runs on the default executor; the analyze stages are
+    # CPU-bound, so size it to the cores rather than asyncio's cores + 4
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="analyze")
+    )
+    # spaCy loads lazily; start it now so the first request doesn't wait for it
+    asyncio.get_running_loop().run_in_executor(None, skill_extractor.load_nlp)
+    if settings.web_concurrency > 1:
+        # The uvicorn CLI also reads WEB_CONCURRENCY, bypassing the check below
+        print(f"WARNING: WEB_CONCURRENCY={settings.web_concurrency}, but sessions are per process; "
+              "a token issued by one worker is rejected by the others. Run a single worker.")
+
+
+@app.on_event("shutdown")
+async def close_ai_sessions():
+    await llm_service.close()
+
+
+# Static responses are built once; a Response holds no per-request state
+ROOT_REDIRECT = RedirectResponse(
+    url="http://localhost:8080/index.html",
+    headers={"Cache-Control": "public, max-age=300"}
+)
+HEALTH_RESPONSE = ORJSONResponse(
+    {"status": "healthy"},
+    headers={"Cache-Control": "public, max-age=5"}
+)
 
 
 # ✅ ROOT REDIRECT (FIXED)
 @app.get("/")
 async def root():
-    return RedirectResponse(url="http://localhost:8080/index.html")
+    return ROOT_REDIRECT
 
 
 # ✅ CALLBACK ROUTE (MAIN FIX)
@@ -80,7 +131,9 @@ async def register(
     password: str = Form(...),
     name: str = Form(...)
 ):
-    result = auth_manager.register(email, password, name)
+    # scrypt takes tens of milliseconds of CPU; hash on a worker thread so
+    # the event loop keeps serving other requests
+    result = await asyncio.to_thread(auth_manager.register, email, password, name)
     if result["success"]:
         return JSONResponse(content=result, status_code=201)
     return JSONResponse(content=result, status_code=400)
@@ -91,37 +144,36 @@ async def login(
     email: str = Form(...),
     password: str = Form(...)
 ):
-    result = auth_manager.login(email, password)
+    result = await asyncio.to_thread(auth_manager.login, email, password)
     if result["success"]:
-        try:
-            email_service.send_login_notification(
-                result["user"]["email"],
-                result["user"]["name"]
-            )
-        except:
-            pass
+        email_service.send_login_notification_async(
+            result["user"]["email"],
+            result["user"]["name"]
+        )
         return JSONResponse(content=result)
     return JSONResponse(content=result, status_code=401)
 
 
 @app.get("/api/verify")
-async def verify_session(authorization: Optional[str] = Header(None)):
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Invalid token")
-
-    token = authorization.replace("Bearer ", "")
-    user = auth_manager.verify_session(token)
-
-    if not user:
-        raise HTTPException(status_code=401, detail="Session expired")
-
+async def verify_session(user: Dict = Depends(require_user)):
     return {"success": True, "user": user}
 
 
 @app.post("/api/logout")
-async def logout(authorization: Optional[str] = Header(None)):
-    token = authorization.replace("Bearer ", "")
-    auth_manager.logout(token)
+async def logout(token: Optional[str] = Depends(get_session_token)):
+    if token:
+        auth_manager.logout(token)
+    return {"success": True}
+
+
+@app.post("/api/admin/cache/clear")
+async def clear_caches(user: Dict = Depends(require_admin)):
+    if matcher.roadmap_generator:
+        matcher.roadmap_generator.invalidate()
+    if matcher.advanced_analyzer:
+        matcher.advanced_analyzer.invalidate()
+    role_advisor.invalidate()
+    resume_parser.invalidate()
     return {"success": True}
 
 
@@ -129,7 +181,7 @@ async def logout(authorization: Optional[str] = Header(None)):
 async def analyze_resume(
     resume: UploadFile = File(...),
     job_description: str = Form(...),
-    authorization: Optional[str] = Header(None)
+    user: Optional[Dict] = Depends(get_current_user)
 ):
     if not resume.filename:
         raise HTTPException(status_code=400, detail="No file uploaded")
@@ -138,21 +190,41 @@ async def analyze_resume(
     if file_ext not in [".pdf", ".docx", ".doc"]:
         raise HTTPException(status_code=400, detail="Invalid file type")
 
-    file_path = os.path.join(UPLOADS_DIR, resume.filename)
-    with open(file_path, "wb") as f:
-        f.write(await resume.read())
-
-    resume_text = resume_parser.parse(file_path)
-    structured_data = resume_parser.parse_structured(file_path)
+    # Read in chunks so an oversized upload is rejected before it is fully buffered;
+    # the parser works on the bytes directly, so nothing is written to disk
+    buf = bytearray()
+    while chunk := await resume.read(UPLOAD_CHUNK_BYTES):
+        buf += chunk
+        if len(buf) > MAX_UPLOAD_BYTES:
+            raise HTTPException(status_code=413, detail="File too large")
+    # bytes rather than the bytearray: io.BytesIO shares a bytes buffer instead of copying it
+    data = bytes(buf)
+    del buf
+
+    # CPU-bound stages run on worker threads; the document is parsed once for
+    # both its text and its structured sections
+    parsed = await resume_parser.parse_all_bytes_async(data, file_ext)
+    resume_text, structured_data = parsed["text"], parsed["structured"]
+    # The raw upload is no longer needed; free it before the slower stages run
+    del data
+
+    # One spaCy pass over both texts
+    resume_skills, job_skills = await asyncio.to_thread(
+        skill_extractor.extract_skills_batch, [resume_text, job_description]
+    )
 
-    resume_skills = skill_extractor.extract_skills(resume_text)
-    job_skills = skill_extractor.extract_skills(job_description)
+    detected_role = role_advisor.detect_role(job_description, resume_text)
 
-    match_result = matcher.match(resume_text, job_description, resume_skills, job_skills)
+    async def role_skills_and_gaps():
+        role_skills = await role_advisor.generate_role_skills(detected_role)
+        return role_skills, await role_advisor.analyze_skill_gaps(resume_skills, role_skills)
 
-    detected_role = role_advisor.detect_role(job_description, resume_text)
-    role_skills = await role_advisor.generate_role_skills(detected_role)
-    skill_gaps = await role_advisor.analyze_skill_gaps(resume_skills, role_skills)
+    # Skill gaps only need the role skills, so they are worked out while the
+    # matcher is still running; only the roadmap waits for the match score
+    match_result, (role_skills, skill_gaps) = await asyncio.gather(
+        asyncio.to_thread(matcher.match, resume_text, job_description, resume_skills, job_skills),
+        role_skills_and_gaps()
+    )
     roadmap = await role_advisor.generate_roadmap(
         detected_role, skill_gaps, resume_skills, match_result.get("match_score", 0)
     )
@@ -168,15 +240,20 @@ async def analyze_resume(
         }
     }
 
-    os.remove(file_path)
-    return convert_to_json_serializable(result)
+    # Returned as a response directly, so FastAPI's jsonable_encoder (which
+    # rejects numpy integers) is skipped and orjson sees the numpy values
+    return ORJSONResponse(content=result)
 
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy"}
+    return HEALTH_RESPONSE
 
 
 if __name__ == "__main__":
-    port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    if settings.web_concurrency > 1:
+        # Sessions live in this process's AuthManager, so a token issued by one
+        # worker would be rejected by the others with "Session expired"
+        raise SystemExit("WEB_CONCURRENCY > 1 is not supported: login sessions are kept in process")
+    # The default "auto" loop and http settings pick uvloop and httptools when installed
+    uvicorn.run("main:app", host="0.0.0.0", port=settings.port, workers=settings.web_concurrency)
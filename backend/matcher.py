@@ -4,36 +4,134 @@ Uses BERT embeddings and cosine similarity to match resumes with job description
 Enhanced with FREE-TIER AI services for intelligent analysis
 """
 
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+import torch
+from config import Settings, get_settings
+from onnx_encoder import load_encoder
 from skill_recommender import SkillRecommender
 from ai_service import AIService, RoleAnalyzer
 from advanced_analyzer import AdvancedResumeAnalyzer
 from smart_suggestions import SmartSuggestionGenerator
 from learning_roadmap import LearningRoadmapGenerator
+from keyword_matcher import GroupMatcher
+
+
+# Resume tips that are the same for every analysis, built once at import
+_GENERAL_TIPS = (
+    {
+        "tip": "Use Action Verbs",
+        "description": "Replace passive language with action verbs: 'Developed', 'Implemented', 'Designed', 'Optimized', 'Led'"
+    },
+    {
+        "tip": "Quantify Achievements",
+        "description": "Add numbers: 'Improved performance by 30%', 'Managed team of 5', 'Reduced costs by $10K'"
+    },
+    {
+        "tip": "Match Keywords",
+        "description": "Use the exact same keywords from the job description in your resume (naturally, not forced)"
+    },
+    {
+        "tip": "Highlight Relevant Experience",
+        "description": "Move the most relevant experience to the top of your resume"
+    },
+    {
+        "tip": "Add Projects Section",
+        "description": "If you're missing required skills, add a 'Projects' section showing you've worked with those technologies"
+    }
+)
+
+# Improvement tips by skill keyword, checked in order against the lowercased skill
+_SKILL_TIPS = {
+    "python": "Start with Python basics on freeCodeCamp or Codecademy. Build 2-3 small projects (calculator, todo app, web scraper).",
+    "javascript": "Learn JavaScript fundamentals on MDN Web Docs. Practice by building interactive web pages.",
+    "react": "Complete React's official tutorial. Build a portfolio website or todo app to practice.",
+    "aws": "Start with AWS Free Tier. Follow AWS's 'Getting Started' guides. Try deploying a simple website.",
+    "docker": "Install Docker Desktop. Follow Docker's 'Get Started' tutorial. Containerize a simple web app.",
+    "machine learning": "Take Andrew Ng's Machine Learning course on Coursera. Start with simple projects like house price prediction.",
+    "sql": "Practice on SQLBolt or LeetCode. Learn JOINs, subqueries, and window functions.",
+    "git": "Complete GitHub's 'Hello World' guide. Practice by creating a GitHub repository and making commits."
+}
+
+_GENERIC_TIP_TEMPLATE = (
+    "To learn {skill}:\n"
+    "  1. Find a beginner-friendly tutorial or course\n"
+    "  2. Practice with small projects\n"
+    "  3. Add it to your resume once you've built something with it\n"
+    "  4. Consider getting a certification if available"
+)
+
+# Keep workers x threads at about the core count instead of every worker using all cores
+torch.set_num_threads(get_settings().torch_threads)
 
 
 class ResumeJobMatcher:
     """Advanced resume-job matcher with deep analysis and intelligent suggestions"""
     
-    def __init__(self):
-        # Initialize Sentence Transformer model (open-source, local)
-        # Using a lightweight model for better performance
-        try:
-            self.model = SentenceTransformer('all-MiniLM-L6-v2')
-        except Exception as e:
-            print(f"Error loading model: {str(e)}")
-            # Fallback to a different model if available
-            self.model = SentenceTransformer('paraphrase-MiniLM-L3-v2')
+    # Maximum number of text embeddings memoized
+    EMBEDDING_CACHE_SIZE = 2048
+    
+    # Background threads for the independent legacy AI calls, shared by all matchers
+    _EXECUTOR = ThreadPoolExecutor(max_workers=6, thread_name_prefix="ai-legacy")
+    
+    # The model only sees its first max_seq_length (256) tokens; text well past
+    # that is cut before encoding so the tokenizer doesn't process it for nothing
+    EMBED_MAX_CHARS = 4000
+    
+    # A resume at or above this score with at most this many missing skills
+    # has little left to improve, so the AI-backed deep analysis is skipped
+    SKIP_ANALYSIS_MIN_SCORE = 90
+    SKIP_ANALYSIS_MAX_MISSING = 2
+    
+    # Below this score the rule-based recommendations already cover what the
+    # AI resume improvement advice would say
+    SKIP_IMPROVEMENT_BELOW_SCORE = 30
+    
+    # Job description phrases used for role detection (checked in order)
+    ROLE_KEYWORDS = {
+        "Software Engineer": ["software engineer", "sde", "swe", "software developer", "backend engineer", "full stack"],
+        "Data Scientist": ["data scientist", "data science", "machine learning engineer", "ml engineer"],
+        "Frontend Developer": ["frontend", "front-end", "react developer", "ui developer"],
+        "Backend Developer": ["backend", "back-end", "api developer", "server developer"],
+        "DevOps Engineer": ["devops", "sre", "site reliability", "cloud engineer", "infrastructure"]
+    }
+    
+    def __init__(self, settings: Optional[Settings] = None):
+        settings = settings or get_settings()
+        
+        # Prefer the INT8 ONNX export of MiniLM when it has been built (see onnx_encoder.py)
+        self.model = load_encoder()
+        if self.model is not None:
+            self.model_name = 'all-MiniLM-L6-v2-int8'
+        else:
+            # Initialize Sentence Transformer model (open-source, local). A load
+            # failure is raised rather than masked by a silently different model
+            self.model_name = settings.embedding_model
+            self.model = SentenceTransformer(self.model_name)
+        
+        # Embeddings keyed by a hash of model name and text, least recently used first
+        self._embedding_cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._embedding_lock = threading.Lock()
+        # The model reads at most max_seq_length word-pieces, and every word is
+        # at least one piece, so words beyond that many can't change the embedding
+        self._embed_window_words = getattr(self.model, "max_seq_length", None)
+        
+        # The first encode loads weights and initializes kernels; do it now in
+        # the background so startup isn't blocked and the first request is fast
+        threading.Thread(target=self._warm_up, name="matcher-warmup", daemon=True).start()
         
         # Initialize skill recommender
         self.skill_recommender = SkillRecommender()
         
         # Initialize AI service (free-tier APIs)
         try:
-            self.ai_service = AIService()
+            # Shares the embedding model for the semantic cache
+            self.ai_service = AIService(encoder=self.model)
             self.role_analyzer = RoleAnalyzer(self.ai_service)
             self.ai_enabled = True
         except Exception as e:
@@ -73,24 +171,27 @@ class ResumeJobMatcher:
             Dictionary with match score, matched skills, missing skills, and recommendations
         """
         # Calculate semantic similarity using embeddings
-        resume_embedding = self.model.encode([resume_text])
-        job_embedding = self.model.encode([job_description])
+        resume_embedding, job_embedding = self._encode_cached([
+            resume_text[:self.EMBED_MAX_CHARS],
+            job_description[:self.EMBED_MAX_CHARS]
+        ])
         
-        # Cosine similarity score (0-1 range)
-        similarity_score = cosine_similarity(resume_embedding, job_embedding)[0][0]
+        # Cosine similarity score (0-1 range); the embeddings are unit length
+        similarity_score = float(np.dot(resume_embedding.astype(np.float32), job_embedding.astype(np.float32)))
         
         # Convert numpy float32 to native Python float, then to percentage
         match_score = float(round(float(similarity_score) * 100, 2))
         
-        # Find matched and missing skills
-        resume_skills_set = {s.lower() for s in resume_skills}
-        job_skills_set = {s.lower() for s in job_skills}
+        # Find matched and missing skills; each list is lowercased once into a
+        # lowercase -> original map so the comparisons are plain set operations
+        resume_map = {s.lower(): s for s in resume_skills}
+        job_map = {s.lower(): s for s in job_skills}
         
-        matched_skills = sorted([s for s in job_skills if s.lower() in resume_skills_set])
-        missing_skills = sorted([s for s in job_skills if s.lower() not in resume_skills_set])
+        matched_skills = sorted(job_map[k] for k in job_map.keys() & resume_map.keys())
+        missing_skills = sorted(job_map[k] for k in job_map.keys() - resume_map.keys())
         
         # Additional skills in resume (not in job description)
-        extra_skills = sorted([s for s in resume_skills if s.lower() not in job_skills_set])
+        extra_skills = sorted(resume_map[k] for k in resume_map.keys() - job_map.keys())
         
         # Generate detailed recommendations (rule-based)
         detailed_recommendations = self._generate_recommendations(
@@ -100,12 +201,37 @@ class ResumeJobMatcher:
         # Get skill recommendations
         skill_recommendations = self.skill_recommender.recommend_skills(missing_skills)
         
+        # Legacy AI features (for backward compatibility). The three calls are
+        # independent, so they run in the background alongside the advanced analysis
+        ai_futures: Dict[str, Future] = {}
+        if self.ai_enabled and self.ai_service:
+            ai_futures["ai_analysis"] = self._EXECUTOR.submit(
+                self.ai_service.analyze_resume, resume_text, job_description
+            )
+            
+            # Get role-based recommendations
+            target_role = self._detect_role(job_description)
+            if target_role:
+                ai_futures["role_analysis"] = self._EXECUTOR.submit(
+                    self.role_analyzer.analyze_for_role, resume_text, target_role
+                )
+            
+            # Get resume improvement advice
+            if match_score >= self.SKIP_IMPROVEMENT_BELOW_SCORE:
+                ai_futures["resume_improvement"] = self._EXECUTOR.submit(
+                    self.ai_service.get_resume_improvement_advice, resume_text, job_description
+                )
+        
         # Perform advanced analysis
         advanced_analysis = None
         smart_suggestions = None
         learning_roadmap = None
+        analysis_skipped = None
         
-        if self.advanced_analyzer:
+        if (match_score >= self.SKIP_ANALYSIS_MIN_SCORE
+                and len(missing_skills) <= self.SKIP_ANALYSIS_MAX_MISSING):
+            analysis_skipped = "high_match"
+        elif self.advanced_analyzer:
             try:
                 # Deep resume analysis
                 advanced_analysis = self.advanced_analyzer.analyze_resume(
@@ -138,28 +264,15 @@ class ResumeJobMatcher:
                 import traceback
                 traceback.print_exc()
         
-        # Legacy AI features (for backward compatibility)
-        ai_analysis = None
-        role_analysis = None
-        resume_improvement = None
-        
-        if self.ai_enabled and self.ai_service:
+        legacy_ai = {}
+        for name, future in ai_futures.items():
             try:
-                # Get AI-powered resume analysis
-                ai_analysis = self.ai_service.analyze_resume(resume_text, job_description)
-                
-                # Get role-based recommendations
-                target_role = self._detect_role(job_description)
-                if target_role:
-                    role_analysis = self.role_analyzer.analyze_for_role(resume_text, target_role)
-                
-                # Get resume improvement advice
-                resume_improvement = self.ai_service.get_resume_improvement_advice(
-                    resume_text, job_description
-                )
-                
+                legacy_ai[name] = future.result()
             except Exception as e:
                 print(f"AI analysis error (using fallback): {str(e)}")
+        ai_analysis = legacy_ai.get("ai_analysis")
+        role_analysis = legacy_ai.get("role_analysis")
+        resume_improvement = legacy_ai.get("resume_improvement")
         
         return {
             "match_score": match_score,
@@ -173,6 +286,7 @@ class ResumeJobMatcher:
             "matched_skill_count": len(matched_skills),
             # Advanced analysis features
             "advanced_analysis": advanced_analysis,
+            "advanced_analysis_skipped": analysis_skipped,
             "smart_suggestions": smart_suggestions,
             "learning_roadmap": learning_roadmap,
             # Legacy AI features (for compatibility)
@@ -182,23 +296,67 @@ class ResumeJobMatcher:
             "ai_enabled": self.ai_enabled
         }
     
-    def _detect_role(self, job_description: str) -> Optional[str]:
-        """Detect target role from job description"""
-        job_lower = job_description.lower()
+    def _warm_up(self):
+        """Run one throwaway encode so the model's one-time setup happens off the request path"""
+        try:
+            self.model.encode(["warmup"], convert_to_numpy=True, normalize_embeddings=True, show_progress_bar=False)
+        except Exception as e:
+            print(f"Model warmup failed: {str(e)}")
+    
+    def _encode_cached(self, texts: List[str]) -> List[np.ndarray]:
+        """
+        Embed texts, reusing stored embeddings for texts the model sees identically
         
-        role_keywords = {
-            "Software Engineer": ["software engineer", "sde", "swe", "software developer", "backend engineer", "full stack"],
-            "Data Scientist": ["data scientist", "data science", "machine learning engineer", "ml engineer"],
-            "Frontend Developer": ["frontend", "front-end", "react developer", "ui developer"],
-            "Backend Developer": ["backend", "back-end", "api developer", "server developer"],
-            "DevOps Engineer": ["devops", "sre", "site reliability", "cloud engineer", "infrastructure"]
-        }
+        Texts are keyed by their words within the model's input window, so an
+        edit past the window reuses the embedding while any edit the model would
+        see gets a fresh one. All texts not yet cached are encoded together in
+        one batched model call.
+        Embeddings are kept as float16, half the memory of float32; fresh ones are
+        downcast too, so a score never depends on whether the text was cached.
+        
+        Args:
+            texts: Texts to embed
         
-        for role, keywords in role_keywords.items():
-            if any(keyword in job_lower for keyword in keywords):
-                return role
+        Returns:
+            One unit-length 1-D float16 embedding per text, in input order
+        """
+        # The tokenizer splits on whitespace, so runs of whitespace don't change the embedding
+        words = [text.split()[:self._embed_window_words] for text in texts]
+        keys = [hashlib.sha256(f"{self.model_name}\x00{' '.join(w)}".encode()).digest() for w in words]
+        embeddings: List[Optional[np.ndarray]] = [None] * len(texts)
+        with self._embedding_lock:
+            for i, key in enumerate(keys):
+                cached = self._embedding_cache.get(key)
+                if cached is not None:
+                    self._embedding_cache.move_to_end(key)
+                    embeddings[i] = cached
         
-        return "Software Engineer"  # Default
+        misses = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if misses:
+            # Inference mode is per thread and skips autograd bookkeeping entirely
+            with torch.inference_mode():
+                encoded = self.model.encode(
+                    [texts[i] for i in misses],
+                    batch_size=len(misses),
+                    convert_to_numpy=True,
+                    normalize_embeddings=True,
+                    show_progress_bar=False
+                )
+            with self._embedding_lock:
+                for i, embedding in zip(misses, encoded.astype(np.float16)):
+                    embeddings[i] = embedding
+                    if keys[i] in self._embedding_cache:
+                        # Same text encoded concurrently by another request
+                        continue
+                    self._embedding_cache[keys[i]] = embedding
+                while len(self._embedding_cache) > self.EMBEDDING_CACHE_SIZE:
+                    self._embedding_cache.popitem(last=False)
+        return embeddings
+    
+    def _detect_role(self, job_description: str) -> Optional[str]:
+        """Detect target role from job description"""
+        role = _ROLE_MATCHER.first_group(job_description.lower())
+        return role or "Software Engineer"  # Default
     
     def _generate_recommendations(
         self,
@@ -236,12 +394,12 @@ class ResumeJobMatcher:
         
         # Detailed resume changes
         if missing_skills:
-            top_missing = missing_skills[:5]
+            top_missing = ', '.join(missing_skills[:5])
             detailed_recommendations["resume_changes"].append({
                 "title": "Add Missing Skills Section",
-                "description": f"Create a dedicated 'Technical Skills' section and include: {', '.join(top_missing)}. "
+                "description": f"Create a dedicated 'Technical Skills' section and include: {top_missing}. "
                              "Even if you're a beginner, mention if you've taken courses or worked on projects with these technologies.",
-                "action": f"Add these keywords to your resume: {', '.join(top_missing)}"
+                "action": f"Add these keywords to your resume: {top_missing}"
             })
         
         # Skill improvement recommendations
@@ -269,55 +427,17 @@ class ResumeJobMatcher:
                 })
         
         # General tips
-        detailed_recommendations["general_tips"] = [
-            {
-                "tip": "Use Action Verbs",
-                "description": "Replace passive language with action verbs: 'Developed', 'Implemented', 'Designed', 'Optimized', 'Led'"
-            },
-            {
-                "tip": "Quantify Achievements",
-                "description": "Add numbers: 'Improved performance by 30%', 'Managed team of 5', 'Reduced costs by $10K'"
-            },
-            {
-                "tip": "Match Keywords",
-                "description": "Use the exact same keywords from the job description in your resume (naturally, not forced)"
-            },
-            {
-                "tip": "Highlight Relevant Experience",
-                "description": "Move the most relevant experience to the top of your resume"
-            },
-            {
-                "tip": "Add Projects Section",
-                "description": "If you're missing required skills, add a 'Projects' section showing you've worked with those technologies"
-            }
-        ]
+        detailed_recommendations["general_tips"] = list(_GENERAL_TIPS)
         
         return detailed_recommendations
     
     def _get_skill_improvement_tip(self, skill: str) -> str:
         """Get beginner-friendly improvement tip for a skill"""
-        skill_lower = skill.lower()
-        
-        tips = {
-            "python": "Start with Python basics on freeCodeCamp or Codecademy. Build 2-3 small projects (calculator, todo app, web scraper).",
-            "javascript": "Learn JavaScript fundamentals on MDN Web Docs. Practice by building interactive web pages.",
-            "react": "Complete React's official tutorial. Build a portfolio website or todo app to practice.",
-            "aws": "Start with AWS Free Tier. Follow AWS's 'Getting Started' guides. Try deploying a simple website.",
-            "docker": "Install Docker Desktop. Follow Docker's 'Get Started' tutorial. Containerize a simple web app.",
-            "machine learning": "Take Andrew Ng's Machine Learning course on Coursera. Start with simple projects like house price prediction.",
-            "sql": "Practice on SQLBolt or LeetCode. Learn JOINs, subqueries, and window functions.",
-            "git": "Complete GitHub's 'Hello World' guide. Practice by creating a GitHub repository and making commits."
-        }
-        
-        for key, tip in tips.items():
-            if key in skill_lower:
-                return tip
-        
-        return (
-            f"To learn {skill}:\n"
-            "  1. Find a beginner-friendly tutorial or course\n"
-            "  2. Practice with small projects\n"
-            "  3. Add it to your resume once you've built something with it\n"
-            "  4. Consider getting a certification if available"
-        )
+        key = _TIP_MATCHER.first_group(skill.lower())
+        if key is not None:
+            return _SKILL_TIPS[key]
+        return _GENERIC_TIP_TEMPLATE.format(skill=skill)
+
 
+_ROLE_MATCHER = GroupMatcher(ResumeJobMatcher.ROLE_KEYWORDS)
+_TIP_MATCHER = GroupMatcher({key: [key] for key in _SKILL_TIPS})
@@ -0,0 +1,129 @@
+"""
+ONNX Sentence Encoder Module
+INT8-quantized MiniLM sentence embeddings on ONNX Runtime, a faster CPU
+stand-in for SentenceTransformer.encode
+
+Export the model once with:
+    python onnx_encoder.py
+"""
+
+import os
+import shutil
+import tempfile
+from typing import List, Optional
+import numpy as np
+
+try:
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+    from optimum.onnxruntime import ORTModelForFeatureExtraction
+    from transformers import AutoTokenizer
+except ImportError:
+    ORTModelForFeatureExtraction = None
+
+
+DEFAULT_MODEL_DIR = os.path.join(os.path.dirname(__file__), "models", "minilm-int8")
+
+
+class ONNXSentenceEncoder:
+    """Mean-pooled sentence embeddings from a quantized ONNX transformer"""
+
+    def __init__(self, model_dir: str = DEFAULT_MODEL_DIR, max_seq_length: int = 256):
+        """
+        Args:
+            model_dir: Directory written by export_quantized()
+            max_seq_length: Tokens kept per text, matching all-MiniLM-L6-v2
+        """
+        if ORTModelForFeatureExtraction is None:
+            raise ImportError("optimum[onnxruntime] package not installed. Run: pip install optimum[onnxruntime]")
+        self.max_seq_length = max_seq_length
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.model = ORTModelForFeatureExtraction.from_pretrained(
+            model_dir, file_name="model.onnx", provider="CPUExecutionProvider"
+        )
+
+    def encode(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = False,
+        show_progress_bar: bool = False
+    ) -> np.ndarray:
+        """
+        Embed texts, with the same call signature as SentenceTransformer.encode
+
+        Args:
+            texts: Texts to embed
+            batch_size: Texts per ONNX Runtime call
+            convert_to_numpy: Accepted for compatibility; output is always numpy
+            normalize_embeddings: Scale each embedding to unit length
+            show_progress_bar: Accepted for compatibility; ignored
+
+        Returns:
+            Array of shape (len(texts), dim)
+        """
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            inputs = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np"
+            )
+            hidden = self.model(**inputs).last_hidden_state
+
+            # Mean over real tokens only, as SentenceTransformer's pooling layer does
+            mask = inputs["attention_mask"][..., None].astype(hidden.dtype)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            if normalize_embeddings:
+                pooled = pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            batches.append(pooled.astype(np.float32))
+
+        return np.concatenate(batches) if batches else np.zeros((0, 0), dtype=np.float32)
+
+
+def export_quantized(
+    model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+    model_dir: str = DEFAULT_MODEL_DIR
+):
+    """
+    Export a Hugging Face model to ONNX and quantize its weights to INT8
+
+    Args:
+        model_name: Hugging Face model to export
+        model_dir: Output directory loaded by ONNXSentenceEncoder
+    """
+    if ORTModelForFeatureExtraction is None:
+        raise ImportError("optimum[onnxruntime] package not installed. Run: pip install optimum[onnxruntime]")
+
+    export_dir = tempfile.mkdtemp()
+    try:
+        ORTModelForFeatureExtraction.from_pretrained(model_name, export=True).save_pretrained(export_dir)
+        os.makedirs(model_dir, exist_ok=True)
+        # Dynamic quantization: INT8 weights, activations quantized on the fly
+        quantize_dynamic(
+            os.path.join(export_dir, "model.onnx"),
+            os.path.join(model_dir, "model.onnx"),
+            weight_type=QuantType.QInt8
+        )
+        shutil.copy(os.path.join(export_dir, "config.json"), model_dir)
+        AutoTokenizer.from_pretrained(model_name).save_pretrained(model_dir)
+    finally:
+        shutil.rmtree(export_dir, ignore_errors=True)
+    print(f"Quantized model written to {model_dir}")
+
+
+def load_encoder(model_dir: str = DEFAULT_MODEL_DIR) -> Optional[ONNXSentenceEncoder]:
+    """Load the quantized encoder, or None when it isn't exported or ONNX Runtime is missing"""
+    if ORTModelForFeatureExtraction is None or not os.path.exists(os.path.join(model_dir, "model.onnx")):
+        return None
+    try:
+        return ONNXSentenceEncoder(model_dir)
+    except Exception as e:
+        print(f"Could not load ONNX encoder, using SentenceTransformer: {str(e)}")
+        return None
+
+
+if __name__ == "__main__":
+    export_quantized()
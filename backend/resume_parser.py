@@ -3,18 +3,87 @@ Enhanced Resume Parser Module
 Extracts structured data from PDF and DOCX resume files
 """
 
+import asyncio
+import hashlib
+import io
 import os
 import re
-from typing import Optional, Dict, List
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Dict, List, Tuple
 import PyPDF2
 from docx import Document
+from keyword_matcher import GroupMatcher
+
+# PyMuPDF's C extractor is much faster than PyPDF2; PyPDF2 remains the fallback
+try:
+    import pymupdf as fitz
+except ImportError:
+    try:
+        # Releases before 1.24.3 only provide the legacy module name
+        import fitz
+    except ImportError:
+        fitz = None
+
+# Section headings are plain substrings of the lowercased line; every line of
+# a resume is classified in one pass (a Numba DFA scan when installed)
+_SECTION_MATCHER = GroupMatcher({
+    "education": ['education', 'academic', 'qualification', 'degree', 'university', 'college'],
+    "experience": ['experience', 'employment', 'work history', 'career', 'professional'],
+    "skills": ['skills', 'competencies', 'expertise', 'proficiencies'],
+    "projects": ['project', 'portfolio', 'work samples']
+})
+# Bits of a line_groups() mask, in the group order above
+_EDUCATION_HEADING, _EXPERIENCE_HEADING, _SKILLS_HEADING, _PROJECTS_HEADING = 1, 2, 4, 8
+
+# Compiled once at import; the re module's own cache is bounded and shared.
+# Each pattern list is one alternation, so a line is scanned once. The degree
+# and job title patterns only see lowercased lines, so they skip IGNORECASE
+# and its case-folded comparison of every character
+_INSTITUTION_RE = re.compile(r'university|college|institute|school', re.IGNORECASE)
+_DEGREE_RE = re.compile(
+    r'\b(?:b\.?s\.?|b\.?a\.?|b\.?e\.?|m\.?s\.?|m\.?a\.?|m\.?e\.?|ph\.?d\.?|bachelor|master|doctorate'
+    r'|bs|ba|be|ms|ma|me|phd|bsc|msc|btech|mtech)\b'
+)
+_JOB_TITLE_RE = re.compile(
+    r'\b(?:software engineer|developer|analyst|manager|engineer|consultant|intern|associate'
+    r'|sde|swe|qa|devops|data scientist|product manager)\b'
+)
+# Contact details are searched separately: matches of different kinds can
+# overlap (a phone number as an email's local part, "Austin, TX@x.io"), so a
+# fused single scan would miss some. Phones are tried in priority order, the
+# first format found anywhere in the text winning
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_PHONE_RES = (
+    re.compile(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'),
+    re.compile(r'\b\(\d{3}\)\s?\d{3}[-.]?\d{4}\b'),
+    re.compile(r'\b\+\d{1,3}[-.\s]?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}\b')
+)
+_LOCATION_RE = re.compile(r'\b[A-Z][a-z]+,\s*[A-Z]{2}\b')
+_YEAR_RE = re.compile(r'\b(19|20)\d{2}\b')
+_DURATION_RES = (
+    re.compile(r'\b\d{4}\s*[-–]\s*\d{4}\b', re.IGNORECASE),
+    re.compile(r'\b\d{4}\s*[-–]\s*(present|current|now)\b', re.IGNORECASE),
+    re.compile(r'\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{4}\s*[-–]', re.IGNORECASE)
+)
 
 
 class ResumeParser:
     """Parse resume files and extract structured information"""
     
+    # Parsed files memoized by content, for re-uploads and retries
+    CACHE_SIZE = 128
+    
     def __init__(self):
         self.supported_formats = ['.pdf', '.docx', '.doc']
+        # (blake2b digest of file, extension) -> parse_all result, least recently used first
+        self._cache: "OrderedDict[Tuple[bytes, str], Dict[str, Any]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+    
+    def invalidate(self):
+        """Clear memoized parse results"""
+        with self._cache_lock:
+            self._cache.clear()
     
     def parse(self, file_path: str) -> Optional[str]:
         """
@@ -26,16 +95,49 @@ class ResumeParser:
         Returns:
             Extracted text from resume, or None if parsing fails
         """
-        if not os.path.exists(file_path):
+        data = self._read_file(file_path)
+        if data is None:
             return None
         
         file_ext = os.path.splitext(file_path)[1].lower()
+        return self.parse_bytes(data, file_ext)
+    
+    def _read_file(self, file_path: str) -> Optional[bytes]:
+        """Read a whole resume file, or None if it is missing or unreadable"""
+        if not os.path.exists(file_path):
+            return None
         
+        # One read() for the whole file; the PDF and DOCX readers then seek
+        # around an in-memory buffer instead of issuing many small reads
+        try:
+            with open(file_path, 'rb') as f:
+                return f.read()
+        except OSError as e:
+            print(f"Error reading resume file: {str(e)}")
+            return None
+    
+    def parse_bytes(self, data: bytes, file_ext: str) -> Optional[str]:
+        """
+        Parse resume file contents already in memory and extract text
+        
+        Args:
+            data: Raw bytes of the resume file
+            file_ext: Lowercased file extension, e.g. '.pdf'
+        
+        Returns:
+            Extracted text from resume, or None if parsing fails
+        """
+        if not data:
+            return None
+        return self._parse_source(io.BytesIO(data), file_ext)
+    
+    def _parse_source(self, source, file_ext: str) -> Optional[str]:
+        """Dispatch a path or binary stream to the parser for its format"""
         try:
             if file_ext == '.pdf':
-                return self._parse_pdf(file_path)
+                return self._parse_pdf(source)
             elif file_ext in ['.docx', '.doc']:
-                return self._parse_docx(file_path)
+                return self._parse_docx(source)
             else:
                 return None
         except Exception as e:
@@ -52,78 +154,209 @@ class ResumeParser:
         Returns:
             Dictionary with structured resume data
         """
-        resume_text = self.parse(file_path)
+        return self.parse_all(file_path)["structured"]
+    
+    def parse_structured_bytes(self, data: bytes, file_ext: str) -> Optional[Dict]:
+        """
+        Parse resume file contents already in memory and extract structured data
+        
+        Args:
+            data: Raw bytes of the resume file
+            file_ext: Lowercased file extension, e.g. '.pdf'
+        
+        Returns:
+            Dictionary with structured resume data
+        """
+        return self.parse_all_bytes(data, file_ext)["structured"]
+    
+    def parse_all(self, file_path: str) -> Dict[str, Any]:
+        """
+        Parse resume file once, returning both its text and structured data
+        
+        Args:
+            file_path: Path to the resume file
+        
+        Returns:
+            Dictionary with "text" (or None) and "structured" (or None)
+        """
+        data = self._read_file(file_path)
+        if data is None:
+            return {"text": None, "structured": None}
+        
+        file_ext = os.path.splitext(file_path)[1].lower()
+        return self.parse_all_bytes(data, file_ext)
+    
+    def parse_all_bytes(self, data: bytes, file_ext: str) -> Dict[str, Any]:
+        """
+        Parse resume file contents once, returning both its text and structured data
+        
+        Args:
+            data: Raw bytes of the resume file
+            file_ext: Lowercased file extension, e.g. '.pdf'
+        
+        Returns:
+            Dictionary with "text" (or None) and "structured" (or None);
+            the structured data is shared with the cache, so don't modify it
+        """
+        if not data:
+            return {"text": None, "structured": None}
+        
+        key = (hashlib.blake2b(data, digest_size=16).digest(), file_ext)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return dict(cached)
+        
+        resume_text = self.parse_bytes(data, file_ext)
+        result = {"text": resume_text, "structured": self._structure(resume_text)}
+        # Failed parses aren't kept, so a retry parses the file again
+        if resume_text is not None:
+            with self._cache_lock:
+                self._cache[key] = result
+                while len(self._cache) > self.CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        return dict(result)
+    
+    async def parse_async(self, file_path: str) -> Optional[str]:
+        """
+        Parse resume file on a worker thread, without blocking the event loop
+        
+        Args:
+            file_path: Path to the resume file
+        
+        Returns:
+            Extracted text from resume, or None if parsing fails
+        """
+        return await asyncio.to_thread(self.parse, file_path)
+    
+    async def parse_structured_async(self, file_path: str) -> Optional[Dict]:
+        """
+        Parse resume and extract structured data on a worker thread
+        
+        Args:
+            file_path: Path to the resume file
+        
+        Returns:
+            Dictionary with structured resume data
+        """
+        return await asyncio.to_thread(self.parse_structured, file_path)
+    
+    async def parse_all_bytes_async(self, data: bytes, file_ext: str) -> Dict[str, Any]:
+        """
+        Parse resume file contents on a worker thread, returning text and structured data
+        
+        Args:
+            data: Raw bytes of the resume file
+            file_ext: Lowercased file extension, e.g. '.pdf'
+        
+        Returns:
+            Dictionary with "text" (or None) and "structured" (or None)
+        """
+        return await asyncio.to_thread(self.parse_all_bytes, data, file_ext)
+    
+    async def parse_many(self, file_paths: List[str]) -> List[Optional[str]]:
+        """
+        Parse several resume files concurrently
+        
+        Args:
+            file_paths: Paths to the resume files
+        
+        Returns:
+            Extracted text (or None) for each path, in the same order
+        """
+        return list(await asyncio.gather(*(self.parse_async(path) for path in file_paths)))
+    
+    def _structure(self, resume_text: Optional[str]) -> Optional[Dict]:
+        """Split extracted resume text into its structured sections"""
         if not resume_text:
             return None
         
+        # Split, lowercased and classified once, shared by the line-based extractors.
+        # A heading is a short line containing a section keyword
+        lines = resume_text.split('\n')
+        resume_lower = resume_text.lower()
+        lowered = [line.strip() for line in resume_lower.split('\n')]
+        headings = [
+            mask if len(line_lower) < 50 else 0
+            for mask, line_lower in zip(_SECTION_MATCHER.line_groups(resume_lower), lowered)
+        ]
         return {
             "full_text": resume_text,
-            "education": self._extract_education(resume_text),
-            "experience": self._extract_experience(resume_text),
-            "skills": self._extract_skills_section(resume_text),
-            "projects": self._extract_projects(resume_text),
+            "education": self._extract_education(lines, lowered, headings),
+            "experience": self._extract_experience(lines, lowered, headings),
+            "skills": self._extract_skills_section(lines, headings),
+            "projects": self._extract_projects(lines, headings),
             "contact_info": self._extract_contact_info(resume_text)
         }
     
-    def _parse_pdf(self, file_path: str) -> str:
-        """Extract text from PDF file"""
-        text = ""
+    def _parse_pdf(self, source) -> str:
+        """Extract text from a PDF file path or binary stream"""
+        if fitz is not None:
+            try:
+                return self._parse_pdf_fitz(source)
+            except Exception as e:
+                print(f"PyMuPDF could not read PDF, retrying with PyPDF2: {str(e)}")
+                if hasattr(source, "seek"):
+                    source.seek(0)
+        
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
+            pdf_reader = PyPDF2.PdfReader(source)
+            # Joined once at the end; repeated += copies the text for every page
+            pages = [page.extract_text() or "" for page in pdf_reader.pages]
         except Exception as e:
             print(f"Error reading PDF: {str(e)}")
             raise
-        return text.strip()
+        return "\n".join(pages).strip()
+    
+    def _parse_pdf_fitz(self, source) -> str:
+        """Extract text from a PDF file path or binary stream with PyMuPDF"""
+        if hasattr(source, "read"):
+            doc = fitz.open(stream=source.read(), filetype="pdf")
+        else:
+            doc = fitz.open(source)
+        with doc:
+            return "\n".join(page.get_text("text") for page in doc).strip()
     
-    def _parse_docx(self, file_path: str) -> str:
-        """Extract text from DOCX file"""
-        text = ""
+    def _parse_docx(self, source) -> str:
+        """Extract text from a DOCX file path or binary stream"""
         try:
-            doc = Document(file_path)
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
+            doc = Document(source)
+            paragraphs = [paragraph.text for paragraph in doc.paragraphs]
         except Exception as e:
             print(f"Error reading DOCX: {str(e)}")
             raise
-        return text.strip()
+        return "\n".join(paragraphs).strip()
     
-    def _extract_education(self, text: str) -> List[Dict]:
+    def _extract_education(self, lines: List[str], lowered: List[str], headings: List[int]) -> List[Dict]:
         """Extract education information"""
         education = []
-        lines = text.split('\n')
         
         # Look for education section
-        education_keywords = ['education', 'academic', 'qualification', 'degree', 'university', 'college']
         in_education_section = False
         
         for i, line in enumerate(lines):
-            line_lower = line.lower().strip()
-            
             # Check if we're entering education section
-            if any(keyword in line_lower for keyword in education_keywords) and len(line_lower) < 50:
+            if headings[i] & _EDUCATION_HEADING:
                 in_education_section = True
                 continue
             
             # Extract degree/university information
             if in_education_section:
                 # Look for degree patterns
-                degree_patterns = [
-                    r'\b(b\.?s\.?|b\.?a\.?|b\.?e\.?|m\.?s\.?|m\.?a\.?|m\.?e\.?|ph\.?d\.?|bachelor|master|doctorate)\b',
-                    r'\b(bs|ba|be|ms|ma|me|phd|bsc|msc|btech|mtech)\b'
-                ]
-                
-                if any(re.search(pattern, line_lower, re.IGNORECASE) for pattern in degree_patterns):
-                    # Try to extract degree and institution
+                if _DEGREE_RE.search(lowered[i]):
+                    # Try to extract degree and institution; the institution comes from
+                    # the lines around this one, so it is looked up once for all parts
                     parts = line.split('|') if '|' in line else [line]
+                    institution = None
                     for part in parts:
                         part = part.strip()
                         if part and len(part) > 5:
+                            if institution is None:
+                                institution = self._extract_institution(lines, i)
                             education.append({
                                 "degree": part,
-                                "institution": self._extract_institution(lines, i),
+                                "institution": institution,
                                 "year": self._extract_year(part)
                             })
                             if len(education) >= 3:  # Limit to top 3
@@ -133,31 +366,22 @@ class ResumeParser:
         
         return education[:3] if education else [{"degree": "Not specified", "institution": "Not specified"}]
     
-    def _extract_experience(self, text: str) -> List[Dict]:
+    def _extract_experience(self, lines: List[str], lowered: List[str], headings: List[int]) -> List[Dict]:
         """Extract work experience"""
         experience = []
-        lines = text.split('\n')
         
         # Look for experience section
-        exp_keywords = ['experience', 'employment', 'work history', 'career', 'professional']
         in_exp_section = False
         
         for i, line in enumerate(lines):
-            line_lower = line.lower().strip()
-            
             # Check if we're entering experience section
-            if any(keyword in line_lower for keyword in exp_keywords) and len(line_lower) < 50:
+            if headings[i] & _EXPERIENCE_HEADING:
                 in_exp_section = True
                 continue
             
             # Look for job title patterns
             if in_exp_section:
-                job_title_patterns = [
-                    r'\b(software engineer|developer|analyst|manager|engineer|consultant|intern|associate)\b',
-                    r'\b(sde|swe|qa|devops|data scientist|product manager)\b'
-                ]
-                
-                if any(re.search(pattern, line_lower, re.IGNORECASE) for pattern in job_title_patterns):
+                if _JOB_TITLE_RE.search(lowered[i]):
                     if len(line.strip()) > 5 and len(line.strip()) < 100:
                         experience.append({
                             "title": line.strip(),
@@ -170,28 +394,25 @@ class ResumeParser:
         
         return experience[:5] if experience else [{"title": "Not specified", "company": "Not specified"}]
     
-    def _extract_skills_section(self, text: str) -> List[str]:
+    def _extract_skills_section(self, lines: List[str], headings: List[int]) -> List[str]:
         """Extract skills from skills section"""
         skills = []
-        lines = text.split('\n')
         
         # Look for skills section
-        skills_keywords = ['skills', 'technical skills', 'competencies', 'expertise', 'proficiencies']
         in_skills_section = False
         
         for i, line in enumerate(lines):
-            line_lower = line.lower().strip()
-            
-            if any(keyword in line_lower for keyword in skills_keywords) and len(line_lower) < 50:
+            if headings[i] & _SKILLS_HEADING:
                 in_skills_section = True
                 continue
             
             if in_skills_section:
                 # Extract skills (comma or pipe separated, or bullet points)
                 if line.strip():
-                    # Split by common delimiters
-                    line_skills = re.split(r'[,|•\-\n]', line)
-                    for skill in line_skills:
+                    # Split by common delimiters ('\n' can't occur within a line); the
+                    # replace chain is faster than a regex split or str.translate here
+                    normalized = line.replace('|', ',').replace('•', ',').replace('-', ',')
+                    for skill in normalized.split(','):
                         skill = skill.strip()
                         if skill and len(skill) > 2 and len(skill) < 50:
                             skills.append(skill)
@@ -202,19 +423,15 @@ class ResumeParser:
         
         return skills[:20] if skills else []
     
-    def _extract_projects(self, text: str) -> List[Dict]:
+    def _extract_projects(self, lines: List[str], headings: List[int]) -> List[Dict]:
         """Extract projects"""
         projects = []
-        lines = text.split('\n')
         
         # Look for projects section
-        project_keywords = ['projects', 'project', 'portfolio', 'work samples']
         in_project_section = False
         
         for i, line in enumerate(lines):
-            line_lower = line.lower().strip()
-            
-            if any(keyword in line_lower for keyword in project_keywords) and len(line_lower) < 50:
+            if headings[i] & _PROJECTS_HEADING:
                 in_project_section = True
                 continue
             
@@ -232,39 +449,22 @@ class ResumeParser:
         return projects[:5] if projects else []
     
     def _extract_contact_info(self, text: str) -> Dict:
-        """Extract contact information"""
-        contact = {
-            "email": self._extract_email(text),
-            "phone": self._extract_phone(text),
-            "location": self._extract_location(text)
+        """Extract email, phone and location (city, state)"""
+        email = _EMAIL_RE.search(text)
+        location = _LOCATION_RE.search(text)
+        
+        phone = "Not found"
+        for pattern in _PHONE_RES:
+            match = pattern.search(text)
+            if match:
+                phone = match.group()
+                break
+        
+        return {
+            "email": email.group() if email else "Not found",
+            "phone": phone,
+            "location": location.group() if location else "Not found"
         }
-        return contact
-    
-    def _extract_email(self, text: str) -> str:
-        """Extract email address"""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        matches = re.findall(email_pattern, text)
-        return matches[0] if matches else "Not found"
-    
-    def _extract_phone(self, text: str) -> str:
-        """Extract phone number"""
-        phone_patterns = [
-            r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b',
-            r'\b\(\d{3}\)\s?\d{3}[-.]?\d{4}\b',
-            r'\b\+\d{1,3}[-.\s]?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}\b'
-        ]
-        for pattern in phone_patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                return matches[0]
-        return "Not found"
-    
-    def _extract_location(self, text: str) -> str:
-        """Extract location"""
-        # Simple extraction - look for city, state patterns
-        location_pattern = r'\b[A-Z][a-z]+,\s*[A-Z]{2}\b'
-        matches = re.findall(location_pattern, text)
-        return matches[0] if matches else "Not found"
     
     def _extract_institution(self, lines: List[str], index: int) -> str:
         """Extract institution name from nearby lines"""
@@ -272,7 +472,7 @@ class ResumeParser:
             line = lines[i].strip()
             if line and len(line) > 3:
                 # Check if it looks like an institution
-                if any(word in line.lower() for word in ['university', 'college', 'institute', 'school']):
+                if _INSTITUTION_RE.search(line):
                     return line
         return "Not specified"
     
@@ -286,25 +486,17 @@ class ResumeParser:
     
     def _extract_year(self, text: str) -> str:
         """Extract year"""
-        year_pattern = r'\b(19|20)\d{2}\b'
-        matches = re.findall(year_pattern, text)
-        if matches:
-            # Get the full year
-            full_years = re.findall(r'\b(19|20)\d{2}\b', text)
-            return full_years[0] if full_years else "Not specified"
-        return "Not specified"
+        # The first match's group, as re.findall would report it
+        match = _YEAR_RE.search(text)
+        return match.group(1) if match else "Not specified"
     
     def _extract_duration(self, text: str) -> str:
         """Extract duration/date range"""
-        duration_patterns = [
-            r'\b\d{4}\s*[-–]\s*\d{4}\b',
-            r'\b\d{4}\s*[-–]\s*(present|current|now)\b',
-            r'\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{4}\s*[-–]'
-        ]
-        for pattern in duration_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                return matches[0] if isinstance(matches[0], str) else text[matches[0].span()[0]:matches[0].span()[1]]
+        for pattern in _DURATION_RES:
+            match = pattern.search(text)
+            if match:
+                # Like re.findall: the captured group when the pattern has one
+                return match.group(1) if pattern.groups else match.group()
         return "Not specified"
     
     def _extract_description(self, lines: List[str], index: int) -> str:
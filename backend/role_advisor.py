@@ -3,10 +3,28 @@ Role-Based Skill Advisor Module
 Detects target role and generates personalized skill roadmaps using LLM
 """
 
-import re
+import os
 import json
+from datetime import timedelta
+from types import MappingProxyType
 from typing import Dict, List, Any, Optional
 from llm_service import LLMService
+from llm_cache import LLMCache, DEFAULT_CACHE_PATH
+from keyword_matcher import GroupMatcher
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _extract_json(text: str) -> Optional[Dict[str, Any]]:
+    """JSON object starting at the first '{' of an LLM reply, or None; prose after it is ignored"""
+    start = text.find('{')
+    if start == -1:
+        return None
+    try:
+        data = _JSON_DECODER.raw_decode(text, start)[0]
+    except json.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
 
 
 class RoleAdvisor:
@@ -26,8 +44,76 @@ class RoleAdvisor:
         "Data Engineer": ["data engineer", "etl", "data pipeline"]
     }
     
-    def __init__(self, llm_service: LLMService):
+    # Rule-based role skills used without an LLM, as (role name keywords,
+    # skills) in priority order; the first entry with a keyword in the role wins.
+    # Read-only (mapping proxies of tuples) as they are shared by every call;
+    # callers get a plain dict copy, which orjson can serialize
+    FALLBACK_ROLE_SKILLS = (
+        (("sde", "software", "developer"), MappingProxyType({
+            "core_skills": ("Problem Solving", "Data Structures", "Algorithms", "System Design Basics", "Object-Oriented Programming"),
+            "programming_languages": ("Python", "Java", "C++", "JavaScript"),
+            "tools_technologies": ("Git", "Linux", "REST APIs", "Databases (SQL)", "Docker"),
+            "concepts": ("Time Complexity", "Space Complexity", "Design Patterns", "Version Control"),
+            "description": "Software Development Engineer - Build and maintain software applications"
+        })),
+        (("data scientist",), MappingProxyType({
+            "core_skills": ("Statistics", "Machine Learning", "Data Analysis", "Data Visualization"),
+            "programming_languages": ("Python", "R", "SQL"),
+            "tools_technologies": ("Pandas", "NumPy", "Scikit-learn", "Jupyter", "TensorFlow"),
+            "concepts": ("Supervised Learning", "Unsupervised Learning", "Feature Engineering"),
+            "description": "Data Scientist - Extract insights from data using statistical and ML methods"
+        })),
+        (("ml engineer",), MappingProxyType({
+            "core_skills": ("Machine Learning", "Deep Learning", "MLOps", "Model Deployment"),
+            "programming_languages": ("Python", "C++"),
+            "tools_technologies": ("TensorFlow", "PyTorch", "Docker", "Kubernetes", "AWS"),
+            "concepts": ("Neural Networks", "Model Training", "Model Serving", "A/B Testing"),
+            "description": "ML Engineer - Design and deploy machine learning systems at scale"
+        })),
+        (("frontend",), MappingProxyType({
+            "core_skills": ("HTML", "CSS", "JavaScript", "Responsive Design", "UI/UX"),
+            "programming_languages": ("JavaScript", "TypeScript"),
+            "tools_technologies": ("React", "Vue.js", "Angular", "Webpack", "npm"),
+            "concepts": ("Component Architecture", "State Management", "DOM Manipulation"),
+            "description": "Frontend Developer - Build user interfaces and client-side applications"
+        })),
+        (("backend",), MappingProxyType({
+            "core_skills": ("API Design", "Database Design", "Server Architecture", "Authentication"),
+            "programming_languages": ("Python", "Java", "Node.js", "Go"),
+            "tools_technologies": ("Django", "Flask", "Express", "PostgreSQL", "Redis"),
+            "concepts": ("REST APIs", "GraphQL", "Microservices", "Caching"),
+            "description": "Backend Developer - Build server-side applications and APIs"
+        }))
+    )
+    
+    GENERIC_ROLE_SKILLS = MappingProxyType({
+        "core_skills": ("Problem Solving", "Communication", "Technical Skills"),
+        "programming_languages": ("Python", "JavaScript"),
+        "tools_technologies": ("Git", "Linux"),
+        "concepts": ("Best Practices", "Industry Standards")
+    })
+    
+    # LLM results memoized across restarts, how many are kept and for how long
+    CACHE_PATH = os.path.join(os.path.dirname(DEFAULT_CACHE_PATH), "role_advisor_cache.json")
+    CACHE_SIZE = 256
+    CACHE_TTL = timedelta(days=7)
+    
+    def __init__(self, llm_service: LLMService, cache_path: Optional[str] = CACHE_PATH):
+        """
+        Args:
+            llm_service: LLM client used for role skills and roadmaps
+            cache_path: JSON file persisting LLM results, or None for memory only
+        """
         self.llm_service = llm_service
+        self.cache = LLMCache(cache_path, max_entries=self.CACHE_SIZE, ttl=self.CACHE_TTL)
+    
+    def invalidate(self):
+        """Clear memoized LLM role skills and roadmaps"""
+        self.cache.clear()
+    
+    def _cache_key(self, task: str, key: str) -> str:
+        """Cache key for an LLM result, scoped to the active provider"""
+        return LLMCache.make_key(key, task, self.llm_service.provider.value)
     
     def detect_role(self, job_description: str, resume_text: str = "") -> str:
         """
@@ -42,17 +128,13 @@ class RoleAdvisor:
         """
         combined_text = (job_description + " " + resume_text).lower()
         
-        # Count matches for each role
-        role_scores = {}
-        for role, keywords in self.ROLE_KEYWORDS.items():
-            score = sum(1 for keyword in keywords if keyword in combined_text)
-            if score > 0:
-                role_scores[role] = score
+        # Count matches for each role, with one scan over the text
+        role_scores = _ROLE_MATCHER.group_counts(combined_text)
         
-        if role_scores:
-            # Return role with highest score
-            detected_role = max(role_scores, key=role_scores.get)
-            return detected_role
+        best_score = max(role_scores)
+        if best_score:
+            # Return role with highest score; index() picks the first on a tie
+            return _ROLE_MATCHER.groups[role_scores.index(best_score)][0]
         
         # Default to SDE if no clear match
         return "Software Development Engineer"
@@ -68,6 +150,12 @@ class RoleAdvisor:
             Dictionary with role skills categorized
         """
         if self.llm_service.is_available():
+            # Only a handful of roles exist, so after warm-up this skips the LLM call
+            cache_key = self._cache_key("role_skills", role)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+            
             prompt = f"""You are a career advisor. For the role of {role}, provide a comprehensive list of required skills.
 
 Format your response as JSON with the following structure:
@@ -84,9 +172,9 @@ Focus on beginner-to-job-ready level skills. Return ONLY valid JSON, no addition
             try:
                 response = await self.llm_service.generate_text(prompt, max_tokens=800)
                 # Try to extract JSON from response
-                json_match = re.search(r'\{.*\}', response, re.DOTALL)
-                if json_match:
-                    skills_data = json.loads(json_match.group())
+                skills_data = _extract_json(response)
+                if skills_data is not None:
+                    self.cache.set(cache_key, skills_data, self.llm_service.provider.value)
                     return skills_data
             except Exception as e:
                 print(f"Error generating role skills with LLM: {str(e)}")
@@ -98,55 +186,15 @@ Focus on beginner-to-job-ready level skills. Return ONLY valid JSON, no addition
         """Fallback role skills when LLM is not available"""
         role_lower = role.lower()
         
-        if "sde" in role_lower or "software" in role_lower or "developer" in role_lower:
-            return {
-                "core_skills": ["Problem Solving", "Data Structures", "Algorithms", "System Design Basics", "Object-Oriented Programming"],
-                "programming_languages": ["Python", "Java", "C++", "JavaScript"],
-                "tools_technologies": ["Git", "Linux", "REST APIs", "Databases (SQL)", "Docker"],
-                "concepts": ["Time Complexity", "Space Complexity", "Design Patterns", "Version Control"],
-                "description": "Software Development Engineer - Build and maintain software applications"
-            }
-        elif "data scientist" in role_lower:
-            return {
-                "core_skills": ["Statistics", "Machine Learning", "Data Analysis", "Data Visualization"],
-                "programming_languages": ["Python", "R", "SQL"],
-                "tools_technologies": ["Pandas", "NumPy", "Scikit-learn", "Jupyter", "TensorFlow"],
-                "concepts": ["Supervised Learning", "Unsupervised Learning", "Feature Engineering"],
-                "description": "Data Scientist - Extract insights from data using statistical and ML methods"
-            }
-        elif "ml engineer" in role_lower:
-            return {
-                "core_skills": ["Machine Learning", "Deep Learning", "MLOps", "Model Deployment"],
-                "programming_languages": ["Python", "C++"],
-                "tools_technologies": ["TensorFlow", "PyTorch", "Docker", "Kubernetes", "AWS"],
-                "concepts": ["Neural Networks", "Model Training", "Model Serving", "A/B Testing"],
-                "description": "ML Engineer - Design and deploy machine learning systems at scale"
-            }
-        elif "frontend" in role_lower:
-            return {
-                "core_skills": ["HTML", "CSS", "JavaScript", "Responsive Design", "UI/UX"],
-                "programming_languages": ["JavaScript", "TypeScript"],
-                "tools_technologies": ["React", "Vue.js", "Angular", "Webpack", "npm"],
-                "concepts": ["Component Architecture", "State Management", "DOM Manipulation"],
-                "description": "Frontend Developer - Build user interfaces and client-side applications"
-            }
-        elif "backend" in role_lower:
-            return {
-                "core_skills": ["API Design", "Database Design", "Server Architecture", "Authentication"],
-                "programming_languages": ["Python", "Java", "Node.js", "Go"],
-                "tools_technologies": ["Django", "Flask", "Express", "PostgreSQL", "Redis"],
-                "concepts": ["REST APIs", "GraphQL", "Microservices", "Caching"],
-                "description": "Backend Developer - Build server-side applications and APIs"
-            }
-        else:
-            # Generic fallback
-            return {
-                "core_skills": ["Problem Solving", "Communication", "Technical Skills"],
-                "programming_languages": ["Python", "JavaScript"],
-                "tools_technologies": ["Git", "Linux"],
-                "concepts": ["Best Practices", "Industry Standards"],
-                "description": f"{role} - Professional role requiring technical expertise"
-            }
+        for keywords, skills in self.FALLBACK_ROLE_SKILLS:
+            if any(keyword in role_lower for keyword in keywords):
+                return dict(skills)
+        
+        # Generic fallback; only the description depends on the role
+        return {
+            **self.GENERIC_ROLE_SKILLS,
+            "description": f"{role} - Professional role requiring technical expertise"
+        }
     
     async def analyze_skill_gaps(
         self, 
@@ -163,7 +211,10 @@ Focus on beginner-to-job-ready level skills. Return ONLY valid JSON, no addition
         Returns:
             Categorized skill analysis
         """
-        resume_skills_lower = {s.lower() for s in resume_skills}
+        # Lowercased once; the first spelling of each skill is the one reported
+        resume_by_lower: Dict[str, str] = {}
+        for resume_skill in resume_skills:
+            resume_by_lower.setdefault(resume_skill.lower(), resume_skill)
         
         # Combine all role skills
         all_role_skills = []
@@ -179,26 +230,28 @@ Focus on beginner-to-job-ready level skills. Return ONLY valid JSON, no addition
         
         for skill in all_role_skills:
             skill_lower = skill.lower()
-            # Check for exact or partial match
-            matched = False
-            matched_skill = None
             
-            for resume_skill in resume_skills:
-                if skill_lower in resume_skill.lower() or resume_skill.lower() in skill_lower:
-                    matched = True
-                    matched_skill = resume_skill
-                    break
+            # Strong match: the exact skill is on the resume
+            if skill_lower in resume_by_lower:
+                skills_you_have.append(skill)
+                continue
             
-            if matched:
-                # Check if it's a strong match (exact) or weak match (needs improvement)
-                if skill_lower == matched_skill.lower():
-                    skills_you_have.append(skill)
-                else:
-                    skills_to_improve.append({
-                        "current": matched_skill,
-                        "target": skill,
-                        "gap": f"Your resume mentions '{matched_skill}' but the role requires stronger '{skill}' skills"
-                    })
+            # Weak match (needs improvement): one skill name contains the other
+            matched_skill = next(
+                (
+                    resume_skill
+                    for resume_lower, resume_skill in resume_by_lower.items()
+                    if skill_lower in resume_lower or resume_lower in skill_lower
+                ),
+                None
+            )
+            
+            if matched_skill is not None:
+                skills_to_improve.append({
+                    "current": matched_skill,
+                    "target": skill,
+                    "gap": f"Your resume mentions '{matched_skill}' but the role requires stronger '{skill}' skills"
+                })
             else:
                 skills_to_learn.append(skill)
         
@@ -231,6 +284,17 @@ Focus on beginner-to-job-ready level skills. Return ONLY valid JSON, no addition
             Personalized roadmap
         """
         if self.llm_service.is_available():
+            # Scores within the same 10-point band share a roadmap
+            cache_key = self._cache_key("roadmap", repr((
+                role,
+                sorted(resume_skills[:10]),
+                sorted(skill_gaps['skills_to_learn'][:10]),
+                round(match_score, -1)
+            )))
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+            
             prompt = f"""You are a career advisor helping a fresher/junior developer prepare for the role of {role}.
 
 Current Situation:
@@ -265,9 +329,9 @@ Make it realistic for a fresher. Return ONLY valid JSON."""
             
             try:
                 response = await self.llm_service.generate_text(prompt, max_tokens=1200)
-                json_match = re.search(r'\{.*\}', response, re.DOTALL)
-                if json_match:
-                    roadmap = json.loads(json_match.group())
+                roadmap = _extract_json(response)
+                if roadmap is not None:
+                    self.cache.set(cache_key, roadmap, self.llm_service.provider.value)
                     return roadmap
             except Exception as e:
                 print(f"Error generating roadmap with LLM: {str(e)}")
@@ -339,3 +403,5 @@ Make it realistic for a fresher. Return ONLY valid JSON."""
             )
         }
 
+
+_ROLE_MATCHER = GroupMatcher(RoleAdvisor.ROLE_KEYWORDS)
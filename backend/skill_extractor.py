@@ -3,15 +3,49 @@ Skill Extractor Module
 Extracts skills from resume and job description using NLP
 """
 
-import re
-from typing import List, Set
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Tuple
 import spacy
+from keyword_matcher import KeywordMatcher
+
+
+def _is_word_char(char: str) -> bool:
+    """Same test as the regex \\w for str patterns"""
+    return char.isalnum() or char == "_"
 
 
 class SkillExtractor:
     """Extract technical and soft skills from text"""
     
-    def __init__(self):
+    # Maximum number of texts whose extracted skills are memoized
+    CACHE_SIZE = 512
+    
+    # Only doc.noun_chunks is used, which needs the parser and the POS tags
+    # from the tagger and attribute ruler (all fed by tok2vec); the rest of
+    # the pipeline is never loaded
+    SPACY_EXCLUDE = ("ner", "lemmatizer")
+    
+    # Texts parsed per nlp.pipe batch; bounds the parser's working memory on
+    # large batches
+    NLP_BATCH_SIZE = 32
+    
+    # Texts longer than this are lowercased and scanned a chunk at a time,
+    # cut at line breaks (skills never span one)
+    SCAN_CHUNK_CHARS = 1 << 16
+    
+    def __init__(self, lazy_spacy: bool = True):
+        """
+        Args:
+            lazy_spacy: Defer loading the spaCy model until NLP extraction first
+                needs it, instead of loading it here
+        """
+        # (text digest, use_nlp) -> extracted skills, least recently used first.
+        # The same job description is often analyzed against several resumes
+        self._cache: "OrderedDict[Tuple[bytes, bool], Tuple[str, ...]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
         # Common technical skills database
         self.technical_skills = {
             # Programming Languages
@@ -54,56 +88,187 @@ class SkillExtractor:
             'presentation', 'negotiation', 'customer service', 'agile methodology'
         }
         
-        # Try to load spaCy model, fallback to basic extraction if not available
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            print("Warning: spaCy model not found. Using basic extraction.")
-            self.nlp = None
+        # Skills found in a text are collected as a bitmask over skill ids.
+        # Ids follow the sorted display names, so reading the set bits from
+        # the lowest up yields the result already sorted
+        self._skill_titles: List[str] = sorted(
+            skill.title() for skill in self.technical_skills | self.soft_skills
+        )
+        
+        # One scan finds the skills occurring anywhere in the text; only those
+        # are checked for an occurrence on word boundaries, as r'\bskill\b'
+        # would match. Lowercase skill -> (bit, starts with a word character,
+        # ends with a word character)
+        self._skill_bounds: Dict[str, Tuple[int, bool, bool]] = {
+            title.lower(): (1 << skill_id, _is_word_char(title[0]), _is_word_char(title[-1]))
+            for skill_id, title in enumerate(self._skill_titles)
+        }
+        self._skill_matcher = KeywordMatcher(self._skill_bounds)
+        
+        # Every substring a noun chunk can be (3-29 chars) -> bits of the
+        # skills containing it, so a chunk that is part of a skill name is a
+        # single lookup
+        self._all_skills_mask = (1 << len(self._skill_titles)) - 1
+        self._skill_fragments: Dict[str, int] = {}
+        for skill, (bit, _, _) in self._skill_bounds.items():
+            fragments = {
+                skill[start:end]
+                for start in range(len(skill))
+                for end in range(start + 3, min(len(skill), start + 29) + 1)
+            }
+            for fragment in fragments:
+                self._skill_fragments[fragment] = self._skill_fragments.get(fragment, 0) | bit
+        
+        # spaCy model (about a second and 50 MB to load), loaded by load_nlp()
+        self._nlp = None
+        self._nlp_loaded = False
+        self._nlp_lock = threading.Lock()
+        if not lazy_spacy:
+            self.load_nlp()
+    
+    @property
+    def nlp(self):
+        """spaCy pipeline, loaded on first access; None if the model isn't installed"""
+        return self.load_nlp()
+    
+    def load_nlp(self):
+        """Load the spaCy model once, falling back to basic extraction if not available"""
+        if not self._nlp_loaded:
+            with self._nlp_lock:
+                if not self._nlp_loaded:
+                    try:
+                        self._nlp = spacy.load("en_core_web_sm", exclude=list(self.SPACY_EXCLUDE))
+                    except OSError:
+                        print("Warning: spaCy model not found. Using basic extraction.")
+                    self._nlp_loaded = True
+        return self._nlp
     
-    def extract_skills(self, text: str) -> List[str]:
+    def extract_skills(self, text: str, use_nlp: bool = True) -> List[str]:
         """
         Extract skills from text
         
         Args:
             text: Input text (resume or job description)
+            use_nlp: Also match skills against spaCy noun chunks; False keeps
+                to the known-skill scan and never loads spaCy
         
         Returns:
             List of extracted skills
         """
-        if not text:
-            return []
+        return self.extract_skills_batch([text], use_nlp)[0]
+    
+    def extract_skills_batch(self, texts: List[str], use_nlp: bool = True) -> List[List[str]]:
+        """
+        Extract skills from several texts, running the spaCy pipeline once over all of them
         
-        text_lower = text.lower()
-        found_skills = set()
+        Args:
+            texts: Input texts (e.g. a resume and a job description)
+            use_nlp: Also match skills against spaCy noun chunks; False keeps
+                to the known-skill scan and never loads spaCy
         
-        # Extract technical skills
-        for skill in self.technical_skills:
-            # Use word boundaries for better matching
-            pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-            if re.search(pattern, text_lower, re.IGNORECASE):
-                found_skills.add(skill.title())
+        Returns:
+            List of extracted skills for each text, in input order
+        """
+        keys = [
+            (hashlib.blake2b(text.encode(), digest_size=16).digest(), use_nlp) if text else None
+            for text in texts
+        ]
+        extracted: List[List[str]] = [[] for _ in texts]
+        # Index of the first occurrence of each uncached text; repeats in the
+        # batch reuse its result
+        misses: Dict[Tuple[bytes, bool], int] = {}
+        with self._cache_lock:
+            for i, key in enumerate(keys):
+                if key is None:
+                    continue
+                cached = self._cache.get(key)
+                if cached is None:
+                    misses.setdefault(key, i)
+                else:
+                    self._cache.move_to_end(key)
+                    extracted[i] = list(cached)
+        if not misses:
+            return extracted
         
-        # Extract soft skills
-        for skill in self.soft_skills:
-            pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-            if re.search(pattern, text_lower, re.IGNORECASE):
-                found_skills.add(skill.title())
+        firsts = list(misses.values())
+        masks: List[int] = [self._match_known_skills(texts[i]) for i in firsts]
         
         # Use NLP for additional skill extraction if available
-        if self.nlp:
-            doc = self.nlp(text)
-            # Extract noun phrases that might be skills
-            for chunk in doc.noun_chunks:
-                chunk_text = chunk.text.lower().strip()
-                if len(chunk_text) > 2 and len(chunk_text) < 30:
-                    # Check if it matches known skills
-                    for skill in self.technical_skills | self.soft_skills:
-                        if skill.lower() in chunk_text or chunk_text in skill.lower():
-                            found_skills.add(skill.title())
+        nlp = self.load_nlp() if use_nlp else None
+        if nlp:
+            docs = nlp.pipe(
+                (texts[i] for i in firsts), batch_size=min(len(firsts), self.NLP_BATCH_SIZE)
+            )
+            masks = [self._add_noun_chunk_skills(doc, mask) for mask, doc in zip(masks, docs)]
         
-        return sorted(list(found_skills))
-
-
-
-
+        with self._cache_lock:
+            for i, mask in zip(firsts, masks):
+                self._cache[keys[i]] = self._skill_names(mask)
+            for i, key in enumerate(keys):
+                if key in misses:
+                    extracted[i] = list(self._cache[key])
+            while len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return extracted
+    
+    def _skill_names(self, mask: int) -> Tuple[str, ...]:
+        """Sorted display names of the skills whose bits are set in mask"""
+        names = []
+        while mask:
+            low = mask & -mask
+            names.append(self._skill_titles[low.bit_length() - 1])
+            mask ^= low
+        return tuple(names)
+    
+    def _match_known_skills(self, text: str) -> int:
+        """Find known technical and soft skills mentioned in text, as a skill bitmask"""
+        if len(text) <= self.SCAN_CHUNK_CHARS:
+            return self._match_chunk(text.lower(), 0)
+        
+        # Huge text: a lowercased copy of one chunk at a time, skipping skills
+        # already found and stopping once every skill has been
+        found = 0
+        start = 0
+        while start < len(text):
+            end = text.find("\n", start + self.SCAN_CHUNK_CHARS)
+            if end == -1:
+                end = len(text)
+            found = self._match_chunk(text[start:end].lower(), found)
+            if found == self._all_skills_mask:
+                break
+            start = end + 1
+        return found
+    
+    def _match_chunk(self, text_lower: str, found: int) -> int:
+        """Add the known skills mentioned in lowercased text to a skill bitmask"""
+        for skill in self._skill_matcher.find_all(text_lower):
+            bit, starts_word, ends_word = self._skill_bounds[skill]
+            if not found & bit and self._occurs_bounded(text_lower, skill, starts_word, ends_word):
+                found |= bit
+        return found
+    
+    @staticmethod
+    def _occurs_bounded(text: str, skill: str, starts_word: bool, ends_word: bool) -> bool:
+        """Whether skill occurs in text with a word boundary on both sides"""
+        # str.find is a C literal search, several times faster than the
+        # equivalent \b regex; a boundary is where the word-ness changes
+        index = text.find(skill)
+        while index != -1:
+            end = index + len(skill)
+            if ((index > 0 and _is_word_char(text[index - 1])) != starts_word
+                    and (end < len(text) and _is_word_char(text[end])) != ends_word):
+                return True
+            index = text.find(skill, index + 1)
+        return False
+    
+    def _add_noun_chunk_skills(self, doc, found: int) -> int:
+        """Add known skills overlapping the noun phrases of a parsed doc to a skill bitmask"""
+        # Extract noun phrases that might be skills
+        for chunk in doc.noun_chunks:
+            chunk_text = chunk.text.strip().lower()
+            if len(chunk_text) > 2 and len(chunk_text) < 30:
+                # Known skills inside the chunk, and skills the chunk is part of
+                for skill in self._skill_matcher.find_all(chunk_text):
+                    found |= self._skill_bounds[skill][0]
+                found |= self._skill_fragments.get(chunk_text, 0)
+        return found
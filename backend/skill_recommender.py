@@ -3,7 +3,8 @@ Skill Recommender Module
 Provides LinkedIn-style skill recommendations based on missing skills
 """
 
-from typing import List, Dict
+from typing import List, Dict, Set
+from keyword_matcher import GroupMatcher
 
 
 class SkillRecommender:
@@ -62,6 +63,39 @@ class SkillRecommender:
             "machine learning": "Try: Machine Learning by Andrew Ng (Coursera) or Fast.ai",
             "data science": "Try: Data Science Specialization (Coursera) or Kaggle Learn"
         }
+        
+        # Project ideas per skill
+        self.project_suggestions = {
+            "python": ["Build a web scraper", "Create a REST API", "Build a data analysis dashboard"],
+            "javascript": ["Build a todo app", "Create a weather app", "Build a calculator"],
+            "react": ["Build a portfolio website", "Create a blog app", "Build a task manager"],
+            "aws": ["Deploy a static website", "Set up a CI/CD pipeline", "Create a serverless function"],
+            "docker": ["Containerize a web app", "Set up a multi-container app", "Deploy with Docker Compose"],
+            "machine learning": ["Predict house prices", "Image classifier", "Sentiment analysis"],
+            "data science": ["Analyze a dataset", "Create visualizations", "Build a dashboard"]
+        }
+        
+        # Learning tip for every related skill, looked up by its lowercase name once
+        self._related_tips = {
+            value: self.learning_resources.get(
+                value.lower(), "Start with official documentation and build a small project to practice."
+            )
+            for values in self.skill_relationships.values()
+            for value in values
+        }
+        self._project_matcher = GroupMatcher({key: [key] for key in self.project_suggestions})
+        
+        # Lookups replacing the scans over skill_relationships, by key index:
+        # keys (or key words) inside a skill come from one matcher pass, and a
+        # skill (or skill word) inside a key is a lookup among the keys' substrings
+        self._related_values = list(self.skill_relationships.values())
+        self._key_matcher = GroupMatcher({key: [key] for key in self.skill_relationships})
+        self._key_word_matcher = GroupMatcher({key: key.split() for key in self.skill_relationships})
+        self._key_fragments: Dict[str, Set[int]] = {}
+        for index, key in enumerate(self.skill_relationships):
+            for start in range(len(key) + 1):
+                for end in range(start, len(key) + 1):
+                    self._key_fragments.setdefault(key[start:end], set()).add(index)
     
     def recommend_skills(self, missing_skills: List[str]) -> List[Dict]:
         """
@@ -79,34 +113,37 @@ class SkillRecommender:
         for skill in missing_skills[:10]:  # Top 10 missing skills
             skill_lower = skill.lower()
             
-            # Find related skills
-            related_skills = []
-            for key, values in self.skill_relationships.items():
-                if key in skill_lower or skill_lower in key:
-                    related_skills.extend(values)
-            
-            # If no direct match, try partial matching
-            if not related_skills:
-                for key, values in self.skill_relationships.items():
-                    if any(word in skill_lower for word in key.split()) or any(word in key for word in skill_lower.split()):
-                        related_skills.extend(values)
+            related_skills = self._find_related_skills(skill_lower)
             
             # Add recommendations
             for related_skill in related_skills[:3]:  # Top 3 related skills
                 if related_skill not in recommended_skill_set:
                     recommended_skill_set.add(related_skill)
-                    learning_tip = self.learning_resources.get(related_skill.lower(), 
-                        "Start with official documentation and build a small project to practice.")
-                    
                     recommendations.append({
                         "skill": related_skill,
                         "reason": f"Often used together with {skill}",
-                        "learning_tip": learning_tip,
+                        "learning_tip": self._related_tips[related_skill],
                         "priority": "high" if len(recommendations) < 5 else "medium"
                     })
         
         return recommendations[:10]  # Return top 10 recommendations
     
+    def _find_related_skills(self, skill_lower: str) -> List[str]:
+        """Related skills of every relationship key matching the skill, in key order"""
+        # Keys contained in the skill, or containing it
+        counts = self._key_matcher.group_counts(skill_lower)
+        matched = {index for index, count in enumerate(counts) if count}
+        matched |= self._key_fragments.get(skill_lower, set())
+        
+        # If no direct match, try partial matching on words
+        if not matched:
+            counts = self._key_word_matcher.group_counts(skill_lower)
+            matched = {index for index, count in enumerate(counts) if count}
+            for word in skill_lower.split():
+                matched |= self._key_fragments.get(word, set())
+        
+        return [value for index in sorted(matched) for value in self._related_values[index]]
+    
     def get_learning_path(self, skill: str) -> Dict:
         """
         Get learning path for a specific skill
@@ -119,12 +156,9 @@ class SkillRecommender:
         """
         skill_lower = skill.lower()
         
-        # Find related skills
-        related = []
-        for key, values in self.skill_relationships.items():
-            if key in skill_lower:
-                related = values
-                break
+        # Related skills of the first key contained in the skill
+        key = self._key_matcher.first_group(skill_lower)
+        related = self.skill_relationships[key] if key else []
         
         learning_tip = self.learning_resources.get(skill_lower, 
             "Start with the official documentation and build a practical project.")
@@ -138,19 +172,9 @@ class SkillRecommender:
     
     def _get_suggested_projects(self, skill: str) -> List[str]:
         """Get suggested projects for learning a skill"""
-        project_suggestions = {
-            "python": ["Build a web scraper", "Create a REST API", "Build a data analysis dashboard"],
-            "javascript": ["Build a todo app", "Create a weather app", "Build a calculator"],
-            "react": ["Build a portfolio website", "Create a blog app", "Build a task manager"],
-            "aws": ["Deploy a static website", "Set up a CI/CD pipeline", "Create a serverless function"],
-            "docker": ["Containerize a web app", "Set up a multi-container app", "Deploy with Docker Compose"],
-            "machine learning": ["Predict house prices", "Image classifier", "Sentiment analysis"],
-            "data science": ["Analyze a dataset", "Create visualizations", "Build a dashboard"]
-        }
-        
-        for key, projects in project_suggestions.items():
-            if key in skill:
-                return projects
+        key = self._project_matcher.first_group(skill)
+        if key:
+            return self.project_suggestions[key]
         
         return ["Build a small project", "Follow a tutorial", "Contribute to open source"]
 
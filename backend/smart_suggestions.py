@@ -3,14 +3,181 @@ Smart Suggestions Generator
 Provides actionable, specific suggestions (not generic advice)
 """
 
+import copy
 from typing import Dict, Any, List
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from ai_service import AIService
+from keyword_matcher import GroupMatcher
+
+
+# Suggestion tables that are the same for every analysis, built once at import.
+# Entries from them are deep-copied into each response, so that editing a
+# returned suggestion can never change what later analyses get
+_ROLE_SKILL_MAP = {
+    "Software Engineer": {
+        "high": ["System Design", "DSA", "OOP", "Git"],
+        "medium": ["REST APIs", "Database Design", "Testing"],
+        "low": ["Docker", "CI/CD", "Cloud Basics"]
+    },
+    "Backend Developer": {
+        "high": ["REST/GraphQL APIs", "Database Optimization", "Authentication"],
+        "medium": ["Microservices", "Caching", "Message Queues"],
+        "low": ["Kubernetes", "Monitoring", "API Security"]
+    },
+    "Frontend Developer": {
+        "high": ["React/Vue/Angular", "JavaScript ES6+", "State Management"],
+        "medium": ["Responsive Design", "Web Performance", "Build Tools"],
+        "low": ["PWA", "WebAssembly", "Testing Frameworks"]
+    },
+    "Data Scientist": {
+        "high": ["Pandas", "NumPy", "Scikit-learn", "SQL"],
+        "medium": ["TensorFlow/PyTorch", "Data Visualization", "Statistics"],
+        "low": ["MLOps", "Big Data Tools", "Cloud ML"]
+    }
+}
+
+_PROJECT_TEMPLATES = {
+    "Software Engineer": [
+        {
+            "name": "REST API Backend",
+            "description": "Build a REST API with authentication and database",
+            "skills": ["REST APIs", "Authentication", "Database"],
+            "complexity": "medium",
+            "timeline": "2-3 weeks"
+        },
+        {
+            "name": "Full-Stack Web App",
+            "description": "Create a full-stack application with frontend and backend",
+            "skills": ["Frontend", "Backend", "Database"],
+            "complexity": "high",
+            "timeline": "4-6 weeks"
+        },
+        {
+            "name": "System Design Project",
+            "description": "Design and implement a scalable system (e.g., URL shortener)",
+            "skills": ["System Design", "Scalability", "Architecture"],
+            "complexity": "high",
+            "timeline": "3-4 weeks"
+        }
+    ],
+    "Backend Developer": [
+        {
+            "name": "Microservices API",
+            "description": "Build a microservices architecture with 2-3 services",
+            "skills": ["Microservices", "API Design", "Docker"],
+            "complexity": "high",
+            "timeline": "3-4 weeks"
+        },
+        {
+            "name": "Authentication Service",
+            "description": "Implement JWT-based authentication with refresh tokens",
+            "skills": ["Authentication", "Security", "JWT"],
+            "complexity": "medium",
+            "timeline": "2 weeks"
+        }
+    ],
+    "Frontend Developer": [
+        {
+            "name": "React Dashboard",
+            "description": "Build a responsive dashboard with charts and data visualization",
+            "skills": ["React", "State Management", "API Integration"],
+            "complexity": "medium",
+            "timeline": "2-3 weeks"
+        },
+        {
+            "name": "E-commerce Frontend",
+            "description": "Create a modern e-commerce UI with cart and checkout",
+            "skills": ["React/Vue", "State Management", "Responsive Design"],
+            "complexity": "high",
+            "timeline": "3-4 weeks"
+        }
+    ],
+    "Data Scientist": [
+        {
+            "name": "ML Prediction Model",
+            "description": "Build and deploy a machine learning prediction model",
+            "skills": ["Machine Learning", "Python", "Model Deployment"],
+            "complexity": "medium",
+            "timeline": "3 weeks"
+        },
+        {
+            "name": "Data Analysis Dashboard",
+            "description": "Analyze a dataset and create visualizations",
+            "skills": ["Data Analysis", "Visualization", "Pandas"],
+            "complexity": "medium",
+            "timeline": "2 weeks"
+        }
+    ]
+}
+
+_TOPIC_MAP = {
+    "Software Engineer": [
+        {"topic": "Data Structures & Algorithms", "priority": "high", "resources": "LeetCode, GeeksforGeeks"},
+        {"topic": "System Design Fundamentals", "priority": "high", "resources": "System Design Primer, Grokking"},
+        {"topic": "OOP Principles", "priority": "medium", "resources": "FreeCodeCamp, MDN"},
+        {"topic": "Database Design", "priority": "medium", "resources": "SQL Tutorial, Database Design Course"}
+    ],
+    "Backend Developer": [
+        {"topic": "API Design Best Practices", "priority": "high", "resources": "REST API Tutorial"},
+        {"topic": "Database Optimization", "priority": "high", "resources": "SQL Performance Guide"},
+        {"topic": "Microservices Architecture", "priority": "medium", "resources": "Microservices Patterns"},
+        {"topic": "Authentication & Security", "priority": "medium", "resources": "OWASP Guidelines"}
+    ],
+    "Frontend Developer": [
+        {"topic": "JavaScript ES6+ Features", "priority": "high", "resources": "MDN Web Docs, JavaScript.info"},
+        {"topic": "React/Vue State Management", "priority": "high", "resources": "Official Docs"},
+        {"topic": "Web Performance Optimization", "priority": "medium", "resources": "Web.dev Performance"},
+        {"topic": "Responsive Design Patterns", "priority": "medium", "resources": "CSS-Tricks, MDN"}
+    ],
+    "Data Scientist": [
+        {"topic": "Statistics Fundamentals", "priority": "high", "resources": "Khan Academy, Coursera"},
+        {"topic": "Machine Learning Basics", "priority": "high", "resources": "Andrew Ng's Course"},
+        {"topic": "Data Visualization", "priority": "medium", "resources": "Matplotlib, Seaborn Docs"},
+        {"topic": "Feature Engineering", "priority": "medium", "resources": "Kaggle Learn"}
+    ]
+}
+
+_CERTIFICATIONS = {
+    "Software Engineer": [
+        {"name": "AWS Certified Solutions Architect", "optional": True, "cost": "Paid"},
+        {"name": "Google Cloud Professional", "optional": True, "cost": "Paid"},
+        {"name": "FreeCodeCamp Certifications", "optional": True, "cost": "Free"}
+    ],
+    "Backend Developer": [
+        {"name": "REST API Design", "optional": True, "cost": "Free (Coursera)"},
+        {"name": "Database Design", "optional": True, "cost": "Free (edX)"}
+    ],
+    "Data Scientist": [
+        {"name": "Google Data Analytics Certificate", "optional": True, "cost": "Paid (Coursera)"},
+        {"name": "Kaggle Micro-Courses", "optional": True, "cost": "Free"}
+    ]
+}
+
+_SKILL_ACTIONS = {
+    "System Design": "Study system design patterns and practice designing 2-3 systems",
+    "DSA": "Solve 50+ LeetCode problems focusing on arrays, strings, and trees",
+    "REST APIs": "Build 1 backend project using REST APIs and authentication",
+    "React": "Complete React official tutorial and build 2-3 projects",
+    "Machine Learning": "Complete Andrew Ng's ML course and build 2 prediction models"
+}
+
+_SKILL_RESOURCES = {
+    "System Design": "System Design Primer, Grokking System Design",
+    "DSA": "LeetCode, GeeksforGeeks, HackerRank",
+    "REST APIs": "REST API Tutorial, Postman Learning Center",
+    "React": "React Official Docs, FreeCodeCamp",
+    "Machine Learning": "Coursera ML Course, Fast.ai, Kaggle Learn"
+}
+
 
 
 class SmartSuggestionGenerator:
     """Generate smart, actionable suggestions"""
     
+    # Background threads for the AI suggestion call, shared by all generators
+    _EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ai-suggestions")
+    
     def __init__(self, ai_service: AIService):
         self.ai_service = ai_service
     
@@ -23,6 +190,12 @@ class SmartSuggestionGenerator:
     ) -> Dict[str, Any]:
         """Generate comprehensive smart suggestions"""
         
+        # The AI call dominates the latency; it is started first so the
+        # rule-based suggestions are built while it is in flight
+        ai_future = None
+        if self.ai_service and self.ai_service.ai_enabled:
+            ai_future = self._EXECUTOR.submit(self._get_ai_suggestions, analysis, target_role)
+        
         suggestions = {
             "skills_to_add": self._suggest_skills_to_add(missing_skills, target_role, experience_level),
             "projects_to_build": self._suggest_projects(target_role, experience_level, missing_skills),
@@ -33,9 +206,8 @@ class SmartSuggestionGenerator:
         }
         
         # Enhance with AI if available
-        if self.ai_service and self.ai_service.ai_enabled:
-            ai_suggestions = self._get_ai_suggestions(analysis, target_role)
-            suggestions["ai_enhanced"] = ai_suggestions
+        if ai_future is not None:
+            suggestions["ai_enhanced"] = ai_future.result()
         
         return suggestions
     
@@ -48,31 +220,7 @@ class SmartSuggestionGenerator:
         """Suggest specific skills to add"""
         suggestions = []
         
-        # Role-specific skill priorities
-        role_skill_map = {
-            "Software Engineer": {
-                "high": ["System Design", "DSA", "OOP", "Git"],
-                "medium": ["REST APIs", "Database Design", "Testing"],
-                "low": ["Docker", "CI/CD", "Cloud Basics"]
-            },
-            "Backend Developer": {
-                "high": ["REST/GraphQL APIs", "Database Optimization", "Authentication"],
-                "medium": ["Microservices", "Caching", "Message Queues"],
-                "low": ["Kubernetes", "Monitoring", "API Security"]
-            },
-            "Frontend Developer": {
-                "high": ["React/Vue/Angular", "JavaScript ES6+", "State Management"],
-                "medium": ["Responsive Design", "Web Performance", "Build Tools"],
-                "low": ["PWA", "WebAssembly", "Testing Frameworks"]
-            },
-            "Data Scientist": {
-                "high": ["Pandas", "NumPy", "Scikit-learn", "SQL"],
-                "medium": ["TensorFlow/PyTorch", "Data Visualization", "Statistics"],
-                "low": ["MLOps", "Big Data Tools", "Cloud ML"]
-            }
-        }
-        
-        role_skills = role_skill_map.get(target_role, role_skill_map["Software Engineer"])
+        role_skills = _ROLE_SKILL_MAP.get(target_role, _ROLE_SKILL_MAP["Software Engineer"])
         
         # Prioritize missing skills
         for priority in ["high", "medium", "low"]:
@@ -98,81 +246,7 @@ class SmartSuggestionGenerator:
     ) -> List[Dict[str, Any]]:
         """Suggest specific projects to build"""
         
-        project_templates = {
-            "Software Engineer": [
-                {
-                    "name": "REST API Backend",
-                    "description": "Build a REST API with authentication and database",
-                    "skills": ["REST APIs", "Authentication", "Database"],
-                    "complexity": "medium",
-                    "timeline": "2-3 weeks"
-                },
-                {
-                    "name": "Full-Stack Web App",
-                    "description": "Create a full-stack application with frontend and backend",
-                    "skills": ["Frontend", "Backend", "Database"],
-                    "complexity": "high",
-                    "timeline": "4-6 weeks"
-                },
-                {
-                    "name": "System Design Project",
-                    "description": "Design and implement a scalable system (e.g., URL shortener)",
-                    "skills": ["System Design", "Scalability", "Architecture"],
-                    "complexity": "high",
-                    "timeline": "3-4 weeks"
-                }
-            ],
-            "Backend Developer": [
-                {
-                    "name": "Microservices API",
-                    "description": "Build a microservices architecture with 2-3 services",
-                    "skills": ["Microservices", "API Design", "Docker"],
-                    "complexity": "high",
-                    "timeline": "3-4 weeks"
-                },
-                {
-                    "name": "Authentication Service",
-                    "description": "Implement JWT-based authentication with refresh tokens",
-                    "skills": ["Authentication", "Security", "JWT"],
-                    "complexity": "medium",
-                    "timeline": "2 weeks"
-                }
-            ],
-            "Frontend Developer": [
-                {
-                    "name": "React Dashboard",
-                    "description": "Build a responsive dashboard with charts and data visualization",
-                    "skills": ["React", "State Management", "API Integration"],
-                    "complexity": "medium",
-                    "timeline": "2-3 weeks"
-                },
-                {
-                    "name": "E-commerce Frontend",
-                    "description": "Create a modern e-commerce UI with cart and checkout",
-                    "skills": ["React/Vue", "State Management", "Responsive Design"],
-                    "complexity": "high",
-                    "timeline": "3-4 weeks"
-                }
-            ],
-            "Data Scientist": [
-                {
-                    "name": "ML Prediction Model",
-                    "description": "Build and deploy a machine learning prediction model",
-                    "skills": ["Machine Learning", "Python", "Model Deployment"],
-                    "complexity": "medium",
-                    "timeline": "3 weeks"
-                },
-                {
-                    "name": "Data Analysis Dashboard",
-                    "description": "Analyze a dataset and create visualizations",
-                    "skills": ["Data Analysis", "Visualization", "Pandas"],
-                    "complexity": "medium",
-                    "timeline": "2 weeks"
-                }
-            ]
-        }
-        
-        projects = project_templates.get(target_role, project_templates["Software Engineer"])
+        projects = _PROJECT_TEMPLATES.get(target_role, _PROJECT_TEMPLATES["Software Engineer"])
         
         # Filter by experience level
         if experience_level == "fresher":
@@ -202,39 +276,12 @@ class SmartSuggestionGenerator:
                 "specific": True
             })
         
-        return (custom_projects + projects)[:5]
+        return copy.deepcopy((custom_projects + projects)[:5])
     
     def _suggest_topics(self, target_role: str, missing_skills: List[str]) -> List[Dict[str, Any]]:
         """Suggest specific topics to learn"""
         
-        topic_map = {
-            "Software Engineer": [
-                {"topic": "Data Structures & Algorithms", "priority": "high", "resources": "LeetCode, GeeksforGeeks"},
-                {"topic": "System Design Fundamentals", "priority": "high", "resources": "System Design Primer, Grokking"},
-                {"topic": "OOP Principles", "priority": "medium", "resources": "FreeCodeCamp, MDN"},
-                {"topic": "Database Design", "priority": "medium", "resources": "SQL Tutorial, Database Design Course"}
-            ],
-            "Backend Developer": [
-                {"topic": "API Design Best Practices", "priority": "high", "resources": "REST API Tutorial"},
-                {"topic": "Database Optimization", "priority": "high", "resources": "SQL Performance Guide"},
-                {"topic": "Microservices Architecture", "priority": "medium", "resources": "Microservices Patterns"},
-                {"topic": "Authentication & Security", "priority": "medium", "resources": "OWASP Guidelines"}
-            ],
-            "Frontend Developer": [
-                {"topic": "JavaScript ES6+ Features", "priority": "high", "resources": "MDN Web Docs, JavaScript.info"},
-                {"topic": "React/Vue State Management", "priority": "high", "resources": "Official Docs"},
-                {"topic": "Web Performance Optimization", "priority": "medium", "resources": "Web.dev Performance"},
-                {"topic": "Responsive Design Patterns", "priority": "medium", "resources": "CSS-Tricks, MDN"}
-            ],
-            "Data Scientist": [
-                {"topic": "Statistics Fundamentals", "priority": "high", "resources": "Khan Academy, Coursera"},
-                {"topic": "Machine Learning Basics", "priority": "high", "resources": "Andrew Ng's Course"},
-                {"topic": "Data Visualization", "priority": "medium", "resources": "Matplotlib, Seaborn Docs"},
-                {"topic": "Feature Engineering", "priority": "medium", "resources": "Kaggle Learn"}
-            ]
-        }
-        
-        topics = topic_map.get(target_role, topic_map["Software Engineer"])
+        topics = copy.deepcopy(_TOPIC_MAP.get(target_role, _TOPIC_MAP["Software Engineer"]))
         
         # Add missing skill topics
         for skill in missing_skills[:5]:
@@ -254,23 +301,7 @@ class SmartSuggestionGenerator:
     ) -> List[Dict[str, Any]]:
         """Suggest relevant certifications (optional)"""
         
-        certs = {
-            "Software Engineer": [
-                {"name": "AWS Certified Solutions Architect", "optional": True, "cost": "Paid"},
-                {"name": "Google Cloud Professional", "optional": True, "cost": "Paid"},
-                {"name": "FreeCodeCamp Certifications", "optional": True, "cost": "Free"}
-            ],
-            "Backend Developer": [
-                {"name": "REST API Design", "optional": True, "cost": "Free (Coursera)"},
-                {"name": "Database Design", "optional": True, "cost": "Free (edX)"}
-            ],
-            "Data Scientist": [
-                {"name": "Google Data Analytics Certificate", "optional": True, "cost": "Paid (Coursera)"},
-                {"name": "Kaggle Micro-Courses", "optional": True, "cost": "Free"}
-            ]
-        }
-        
-        return certs.get(target_role, [])[:3]
+        return copy.deepcopy(_CERTIFICATIONS.get(target_role, [])[:3])
     
     def _suggest_resume_improvements(self, analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Suggest specific resume improvements"""
@@ -336,17 +367,9 @@ class SmartSuggestionGenerator:
     
     def _get_skill_action(self, skill: str, experience_level: str) -> str:
         """Get specific action for learning a skill"""
-        actions = {
-            "System Design": "Study system design patterns and practice designing 2-3 systems",
-            "DSA": "Solve 50+ LeetCode problems focusing on arrays, strings, and trees",
-            "REST APIs": "Build 1 backend project using REST APIs and authentication",
-            "React": "Complete React official tutorial and build 2-3 projects",
-            "Machine Learning": "Complete Andrew Ng's ML course and build 2 prediction models"
-        }
-        
-        for key, action in actions.items():
-            if key.lower() in skill.lower():
-                return action
+        key = _ACTION_MATCHER.first_group(skill.lower())
+        if key is not None:
+            return _SKILL_ACTIONS[key]
         
         return f"Take an online course on {skill} and build a small project"
     
@@ -361,17 +384,9 @@ class SmartSuggestionGenerator:
     
     def _get_skill_resources(self, skill: str) -> str:
         """Get learning resources for a skill"""
-        resources = {
-            "System Design": "System Design Primer, Grokking System Design",
-            "DSA": "LeetCode, GeeksforGeeks, HackerRank",
-            "REST APIs": "REST API Tutorial, Postman Learning Center",
-            "React": "React Official Docs, FreeCodeCamp",
-            "Machine Learning": "Coursera ML Course, Fast.ai, Kaggle Learn"
-        }
-        
-        for key, resource in resources.items():
-            if key.lower() in skill.lower():
-                return resource
+        key = _RESOURCE_MATCHER.first_group(skill.lower())
+        if key is not None:
+            return _SKILL_RESOURCES[key]
         
         return "Online courses, official documentation, and practice projects"
     
@@ -404,3 +419,5 @@ Format as JSON only."""
             return {}
 
 
+_ACTION_MATCHER = GroupMatcher({key: [key.lower()] for key in _SKILL_ACTIONS})
+_RESOURCE_MATCHER = GroupMatcher({key: [key.lower()] for key in _SKILL_RESOURCES})
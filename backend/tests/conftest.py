@@ -0,0 +1,9 @@
+"""
+Shared test setup: the backend modules are flat and import each other by
+name, so the backend directory goes on sys.path
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
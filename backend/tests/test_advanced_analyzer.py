@@ -0,0 +1,150 @@
+"""AdvancedResumeAnalyzer memoization and AI insight scheduling"""
+
+import threading
+
+import pytest
+
+from advanced_analyzer import AdvancedResumeAnalyzer
+
+RESUME = """John Doe
+Software Engineer
+EXPERIENCE
+Built REST APIs in Python and Django, deployed with Docker on AWS.
+Led a team of 4 engineers and improved latency by 40%.
+EDUCATION
+B.S. Computer Science
+SKILLS
+Python, Django, SQL, Docker, Git"""
+JOB = "Backend developer: Python, Django, REST APIs, PostgreSQL, Docker, Kubernetes"
+RESUME_SKILLS = ["Python", "Django", "SQL", "Docker", "Git"]
+JOB_SKILLS = ["Python", "Django", "PostgreSQL", "Docker", "Kubernetes"]
+
+
+PLACEHOLDER = {"message": "AI analysis unavailable"}
+
+
+class FakeAIService:
+    def __init__(self, ai_enabled=False, response=None, gate=None, error=None):
+        self.ai_enabled = ai_enabled
+        self.response = response or {"summary": "solid backend profile"}
+        self.gate = gate
+        self.error = error
+        self.calls = 0
+
+    def _call_ai(self, prompt, task="chat"):
+        self.calls += 1
+        if self.gate is not None:
+            self.gate.wait(timeout=5)
+        if self.error is not None:
+            raise self.error
+        return self.response
+
+    def _get_fallback_response(self, task):
+        return dict(PLACEHOLDER)
+
+
+def analyze(analyzer, resume=RESUME):
+    return analyzer.analyze_resume(resume, JOB, RESUME_SKILLS, JOB_SKILLS)
+
+
+def test_repeat_analysis_is_served_from_the_cache():
+    analyzer = AdvancedResumeAnalyzer(FakeAIService())
+    first = analyze(analyzer)
+    assert len(analyzer._cache) == 1
+    assert analyze(analyzer) == first
+
+
+def test_cached_result_is_handed_out_as_a_copy():
+    analyzer = AdvancedResumeAnalyzer(FakeAIService())
+    first = analyze(analyzer)
+    expected = analyze(analyzer)
+    first["strengths"]["tampered"] = True
+    second = analyze(analyzer)
+    second["target_role"] = "tampered"
+    assert analyze(analyzer) == expected
+
+
+def test_cache_is_bounded_least_recently_used(monkeypatch):
+    monkeypatch.setattr(AdvancedResumeAnalyzer, "CACHE_SIZE", 2)
+    analyzer = AdvancedResumeAnalyzer(FakeAIService())
+    keys = []
+    for i in range(3):
+        analyze(analyzer, RESUME + f"\nProject {i}")
+        keys.append(analyzer._cache_key(RESUME + f"\nProject {i}", JOB, RESUME_SKILLS, JOB_SKILLS))
+    assert list(analyzer._cache) == keys[1:]
+    analyzer.invalidate()
+    assert not analyzer._cache
+
+
+def test_concurrent_analyses_share_one_bounded_cache(monkeypatch):
+    monkeypatch.setattr(AdvancedResumeAnalyzer, "CACHE_SIZE", 4)
+    analyzer = AdvancedResumeAnalyzer(FakeAIService())
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(10):
+                analyze(analyzer, RESUME + f"\nProject {(n + i) % 6}")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert len(analyzer._cache) == 4
+
+
+def test_ai_insights_are_included_and_cached():
+    ai = FakeAIService(ai_enabled=True)
+    analyzer = AdvancedResumeAnalyzer(ai)
+    assert analyze(analyzer)["ai_insights"] == {"summary": "solid backend profile"}
+    analyze(analyzer)
+    assert ai.calls == 1
+
+
+def test_timed_out_ai_insights_are_not_cached(monkeypatch):
+    monkeypatch.setattr(AdvancedResumeAnalyzer, "AI_INSIGHTS_TIMEOUT", 0.05)
+    gate = threading.Event()
+    analyzer = AdvancedResumeAnalyzer(FakeAIService(ai_enabled=True, gate=gate))
+    try:
+        assert analyze(analyzer)["ai_insights"] == {}
+        assert not analyzer._cache
+    finally:
+        gate.set()
+
+
+def test_analysis_skips_ai_when_every_worker_is_busy(monkeypatch):
+    slots = threading.BoundedSemaphore(1)
+    monkeypatch.setattr(AdvancedResumeAnalyzer, "_AI_SLOTS", slots)
+    gate = threading.Event()
+    ai = FakeAIService(ai_enabled=True, gate=gate)
+    analyzer = AdvancedResumeAnalyzer(ai)
+    monkeypatch.setattr(AdvancedResumeAnalyzer, "AI_INSIGHTS_TIMEOUT", 0.05)
+    try:
+        analyze(analyzer)  # times out, its call keeps the only slot
+        result = analyze(analyzer, RESUME + "\nAnother project")
+        assert result["ai_insights"] == {}
+        assert ai.calls == 1
+        assert not analyzer._cache
+    finally:
+        gate.set()
+        # The stalled call frees the slot once it returns
+        assert slots.acquire(timeout=5)
+
+
+@pytest.mark.parametrize("ai", [
+    lambda: FakeAIService(ai_enabled=True, response=dict(PLACEHOLDER)),
+    lambda: FakeAIService(ai_enabled=True, error=RuntimeError("provider down")),
+])
+def test_failed_ai_insights_are_not_cached(ai):
+    ai = ai()
+    analyzer = AdvancedResumeAnalyzer(ai)
+    analyze(analyzer)
+    assert not analyzer._cache
+    # Once the provider recovers the re-analysis picks up real insights
+    ai.response, ai.error = {"summary": "recovered"}, None
+    assert analyze(analyzer)["ai_insights"] == {"summary": "recovered"}
+    assert len(analyzer._cache) == 1
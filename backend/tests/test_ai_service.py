@@ -0,0 +1,171 @@
+"""Prompt truncation and circuit breaker helpers in ai_service"""
+
+import pytest
+
+import ai_service
+
+
+@pytest.fixture
+def no_encoding(monkeypatch):
+    class BrokenTiktoken:
+        @staticmethod
+        def get_encoding(name):
+            raise OSError("vocabulary download failed")
+
+    monkeypatch.setattr(ai_service, "tiktoken", BrokenTiktoken)
+    ai_service._get_encoding.cache_clear()
+    yield
+    ai_service._get_encoding.cache_clear()
+
+
+def test_encoding_load_failure_falls_back_to_old_character_limits(no_encoding):
+    text = "x" * 5000
+    assert len(ai_service._truncate_tokens(text, ai_service.RESUME_TOKEN_BUDGET)) == 2000
+    assert len(ai_service._truncate_tokens(text, ai_service.IMPROVEMENT_JOB_TOKEN_BUDGET)) == 1500
+
+
+def test_short_text_is_kept_whole(no_encoding):
+    assert ai_service._truncate_tokens("python developer", 800) == "python developer"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(ai_service.time, "monotonic", fake)
+    return fake
+
+
+@pytest.fixture
+def open_breaker(clock):
+    breaker = ai_service.CircuitBreaker("test", max_failures=3, cooldown=60)
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    return breaker
+
+
+def test_breaker_stays_closed_below_the_failure_limit(clock):
+    breaker = ai_service.CircuitBreaker("test", max_failures=3, cooldown=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.allow() and breaker.allow()
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = ai_service.CircuitBreaker("test", max_failures=3, cooldown=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.allow()
+
+
+def test_breaker_opens_for_the_cooldown(clock, open_breaker):
+    assert not open_breaker.allow()
+    clock.now += 59
+    assert not open_breaker.allow()
+
+
+def test_only_one_trial_after_the_cooldown(clock, open_breaker):
+    clock.now += 60
+    assert open_breaker.allow()
+    assert open_breaker.half_open
+    assert not open_breaker.allow()
+    assert not open_breaker.allow()
+
+
+def test_successful_trial_closes_the_breaker(clock, open_breaker):
+    clock.now += 60
+    assert open_breaker.allow()
+    open_breaker.record_success()
+    assert not open_breaker.half_open
+    assert open_breaker.allow() and open_breaker.allow()
+
+
+def test_failed_trial_reopens_for_a_full_cooldown(clock, open_breaker):
+    clock.now += 60
+    assert open_breaker.allow()
+    clock.now += 10
+    open_breaker.record_failure()
+    clock.now += 59
+    assert not open_breaker.allow()
+    clock.now += 1
+    assert open_breaker.allow()
+
+
+def test_unreported_trial_frees_the_slot_after_another_cooldown(clock, open_breaker):
+    clock.now += 60
+    assert open_breaker.allow()
+    clock.now += 59
+    assert not open_breaker.allow()
+    clock.now += 1
+    assert open_breaker.allow()
+
+
+@pytest.fixture
+def providers(monkeypatch):
+    """AIService with both providers faked; hf_result/gemini_result set per test"""
+    from llm_cache import LLMCache
+
+    svc = ai_service.AIService()
+    svc.cache = LLMCache(path=None)
+    svc.hf_available = svc.gemini_available = svc.ai_enabled = True
+    svc.hf_result, svc.gemini_result = {"answer": "hf"}, {"answer": "gemini"}
+    svc.calls = []
+    monkeypatch.setattr(svc, "HEDGE_DELAY", 0.05)
+
+    def fake_huggingface(prompt, task):
+        svc.calls.append("hf")
+        return svc.hf_result
+
+    def fake_gemini(prompt):
+        svc.calls.append("gemini")
+        svc._gemini_breaker.record_success()
+        return svc.gemini_result
+
+    svc._call_huggingface = fake_huggingface
+    svc._call_gemini = fake_gemini
+    return svc
+
+
+def half_open(breaker):
+    """Put a breaker past its cool-down, waiting to hand out the trial call"""
+    breaker.failures = breaker.max_failures
+    breaker.open_until = ai_service.time.monotonic() - 1
+
+
+def test_gemini_trial_is_kept_while_hugging_face_answers(providers):
+    half_open(providers._gemini_breaker)
+    assert providers._call_ai("first prompt") == {"answer": "hf"}
+    assert providers.calls == ["hf"]
+    assert not providers._gemini_breaker.half_open
+
+    # The first Hugging Face failure gets the trial and Gemini recovers
+    providers.hf_result = None
+    assert providers._call_ai("second prompt") == {"answer": "gemini"}
+    assert providers.calls == ["hf", "hf", "gemini"]
+    assert providers._gemini_breaker.open_until == 0.0
+
+
+def test_open_gemini_breaker_leaves_hugging_face_alone(providers):
+    half_open(providers._gemini_breaker)
+    providers._gemini_breaker.open_until += 3600
+    providers.hf_result = None
+    assert providers._call_ai("prompt") == providers._get_fallback_response("chat")
+    assert providers.calls == ["hf"]
+
+
+def test_sequential_path_only_asks_gemini_after_hugging_face_fails(providers):
+    half_open(providers._gemini_breaker)
+    half_open(providers._hf_breaker)
+    providers._hf_breaker.open_until += 3600
+    assert providers._call_ai("prompt") == {"answer": "gemini"}
+    assert providers.calls == ["gemini"]
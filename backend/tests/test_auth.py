@@ -0,0 +1,105 @@
+"""AuthManager sessions: expiry, periodic sweep, cap and thread safety"""
+
+import hashlib
+import threading
+
+import pytest
+
+import auth
+from auth import AuthManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(auth.time, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    # scrypt is deliberately slow; these tests are about sessions
+    monkeypatch.setattr(
+        AuthManager, "_hash_password",
+        lambda self, password, salt: hashlib.sha256(salt + password.encode()).hexdigest()
+    )
+    manager = AuthManager(db_path=str(tmp_path / "users.db"), legacy_path=str(tmp_path / "users.json"))
+    manager.register("Ada@Example.com", "correct horse", "Ada")
+    return manager
+
+
+def login(manager):
+    result = manager.login("ada@example.com", "correct horse")
+    assert result["success"]
+    return result["session_token"]
+
+
+def test_login_verify_logout(manager):
+    token = login(manager)
+    assert manager.verify_session(token)["email"] == "ada@example.com"
+    manager.logout(token)
+    assert manager.verify_session(token) is None
+    # Logging out twice is harmless
+    manager.logout(token)
+
+
+def test_wrong_password_creates_no_session(manager):
+    assert not manager.login("ada@example.com", "wrong password")["success"]
+    assert not manager.sessions
+
+
+def test_expired_session_is_rejected_and_dropped(manager, clock):
+    token = login(manager)
+    clock.now += AuthManager.SESSION_TTL.total_seconds() + 1
+    assert manager.verify_session(token) is None
+    assert token not in manager.sessions
+
+
+def test_expired_sessions_are_swept_periodically(manager, clock, monkeypatch):
+    monkeypatch.setattr(AuthManager, "SESSION_GC_INTERVAL", 4)
+    old = [login(manager) for _ in range(3)]
+    clock.now += AuthManager.SESSION_TTL.total_seconds() + 1
+    fresh = login(manager)
+    # The sweep runs every fourth session operation and stops at the first
+    # live session, so only the expired ones are dropped
+    assert list(manager.sessions) == [fresh]
+    assert all(token not in manager.sessions for token in old)
+
+
+def test_sessions_are_capped_oldest_first(manager, monkeypatch):
+    monkeypatch.setattr(AuthManager, "MAX_SESSIONS", 2)
+    first, second, third = (login(manager) for _ in range(3))
+    assert list(manager.sessions) == [second, third]
+    assert manager.verify_session(first) is None
+
+
+def test_concurrent_logins_and_lookups(manager, monkeypatch):
+    monkeypatch.setattr(AuthManager, "SESSION_GC_INTERVAL", 3)
+    monkeypatch.setattr(AuthManager, "MAX_SESSIONS", 20)
+    errors = []
+
+    def worker():
+        try:
+            for _ in range(25):
+                token = login(manager)
+                manager.verify_session(token)
+                manager.logout(token)
+                manager.verify_session("unknown")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert not manager.sessions
@@ -0,0 +1,101 @@
+"""KeywordMatcher / GroupMatcher lookups, on every matching backend"""
+
+import pytest
+
+import keyword_matcher
+from keyword_matcher import GroupMatcher, KeywordMatcher
+
+BACKENDS = ["numba", "ahocorasick", "substring"]
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request, monkeypatch):
+    """Force the backend chosen by matchers built inside the test"""
+    if request.param == "numba" and keyword_matcher.njit is None:
+        pytest.skip("numba not installed")
+    if request.param == "ahocorasick" and keyword_matcher.ahocorasick is None:
+        pytest.skip("pyahocorasick not installed")
+    if request.param != "numba":
+        monkeypatch.setattr(keyword_matcher, "njit", None)
+    if request.param == "substring":
+        monkeypatch.setattr(keyword_matcher, "ahocorasick", None)
+    return request.param
+
+
+def test_backend_selection(backend):
+    matcher = KeywordMatcher(["python"])
+    assert (matcher._dfa is not None) == (backend == "numba")
+    assert (matcher._automaton is not None) == (backend == "ahocorasick")
+    assert matcher.has_automaton == (backend != "substring")
+
+
+def test_find_all_reports_overlapping_and_nested_phrases(backend):
+    matcher = KeywordMatcher(["java", "javascript", "script", "sql", "nosql"])
+    assert matcher.find_all("javascript and nosql") == {"java", "javascript", "script", "sql", "nosql"}
+
+
+def test_find_all_handles_non_ascii_text(backend):
+    matcher = KeywordMatcher(["c++", "c#", "node.js", "résumé"])
+    assert matcher.find_all("c# and node.js — résumé writing") == {"c#", "node.js", "résumé"}
+
+
+def test_find_all_on_empty_or_unmatched_text(backend):
+    matcher = KeywordMatcher(["python"])
+    assert matcher.find_all("") == set()
+    assert matcher.find_all("pyth") == set()
+
+
+def test_empty_vocabulary(backend):
+    matcher = KeywordMatcher(["", ""])
+    assert not matcher.has_automaton
+    assert matcher.find_all("anything") == set()
+
+
+def test_first_group_prefers_the_earliest_group(backend):
+    matcher = GroupMatcher({
+        "ml": ["machine learning", "pytorch"],
+        "data": ["sql", "pandas"],
+        "web": ["react"],
+    })
+    assert matcher.first_group("react, sql and pytorch") == "ml"
+    assert matcher.first_group("react and pandas") == "data"
+    assert matcher.first_group("golang") is None
+    assert matcher.first_group("") is None
+
+
+def test_group_counts_counts_shared_phrases_in_every_group(backend):
+    matcher = GroupMatcher({
+        "backend": ["python", "sql", "docker"],
+        "data": ["python", "sql", "pandas"],
+        "frontend": ["react"],
+    })
+    assert matcher.group_counts("python, sql and docker") == [3, 2, 0]
+
+
+def test_line_groups_masks_each_line(backend):
+    matcher = GroupMatcher({
+        "skills": ["skills"],
+        "experience": ["experience", "work history"],
+        "education": ["education"],
+    })
+    text = "skills\npython\nwork history and education\n\nexperience"
+    assert matcher.line_groups(text) == [0b001, 0, 0b110, 0, 0b010]
+
+
+def test_group_limit_fits_an_int64_line_mask(backend):
+    groups = {f"group{i}": [f"<{i}>"] for i in range(62)}
+    masks = GroupMatcher(groups).line_groups("<61>\n<0>")
+    assert masks == [1 << 61, 1]
+
+
+def test_too_many_groups_is_rejected():
+    with pytest.raises(ValueError):
+        GroupMatcher({f"group{i}": [f"<{i}>"] for i in range(63)})
+
+
+def test_short_text_only_checks_phrases_that_fit(backend):
+    matcher = KeywordMatcher(["go", "sql", "kubernetes", "machine learning"])
+    assert matcher.find_all("go") == {"go"}
+    assert matcher.find_all("sql, go") == {"sql", "go"}
+    # A phrase exactly as long as the text still matches
+    assert matcher.find_all("kubernetes") == {"kubernetes"}
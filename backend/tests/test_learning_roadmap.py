@@ -0,0 +1,102 @@
+"""AI roadmap memoization and its circuit breaker"""
+
+import threading
+
+from learning_roadmap import LearningRoadmapGenerator
+
+PLACEHOLDER = {"message": "AI unavailable"}
+
+
+class FakeAIService:
+    ai_enabled = True
+
+    def __init__(self, response):
+        self.response = response
+        self.calls = 0
+
+    def _call_ai(self, prompt, task="chat"):
+        self.calls += 1
+        return self.response
+
+    def _get_fallback_response(self, task):
+        return dict(PLACEHOLDER)
+
+
+def test_placeholder_responses_open_the_breaker():
+    ai = FakeAIService(dict(PLACEHOLDER))
+    generator = LearningRoadmapGenerator(ai)
+    for i in range(10):
+        generator._get_ai_roadmap("Data Scientist", [f"skill{i}"])
+    assert ai.calls == generator._ai_breaker.max_failures
+    assert not generator._ai_breaker.allow()
+
+
+def test_placeholder_is_not_cached():
+    ai = FakeAIService(dict(PLACEHOLDER))
+    generator = LearningRoadmapGenerator(ai)
+    generator._get_ai_roadmap("Data Scientist", ["SQL"])
+    generator._get_ai_roadmap("Data Scientist", ["SQL"])
+    assert ai.calls == 2
+
+
+def test_real_roadmap_is_cached_regardless_of_skill_order_and_case():
+    ai = FakeAIService({"roadmap_steps": ["learn SQL"]})
+    generator = LearningRoadmapGenerator(ai)
+    first = generator._get_ai_roadmap("Data Scientist", ["SQL", "Python"])
+    second = generator._get_ai_roadmap("Data Scientist", ["python", "sql"])
+    assert ai.calls == 1
+    assert first == second == {"roadmap_steps": ["learn SQL"]}
+
+
+def test_cached_roadmap_is_handed_out_as_a_copy():
+    ai = FakeAIService({"roadmap_steps": ["learn SQL"]})
+    generator = LearningRoadmapGenerator(ai)
+    generator._get_ai_roadmap("Data Scientist", ["SQL"])["roadmap_steps"].append("tampered")
+    generator._get_ai_roadmap("Data Scientist", ["SQL"])["roadmap_steps"].append("tampered")
+    assert generator._get_ai_roadmap("Data Scientist", ["SQL"]) == {"roadmap_steps": ["learn SQL"]}
+
+
+def test_concurrent_lookups_and_evictions(monkeypatch):
+    monkeypatch.setattr(LearningRoadmapGenerator, "CACHE_SIZE", 3)
+    generator = LearningRoadmapGenerator(FakeAIService({"roadmap_steps": ["practice"]}))
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(200):
+                generator._get_ai_roadmap("Data Scientist", [f"skill{(n + i) % 7}"])
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert len(generator._ai_cache) == 3
+
+
+def test_cached_roadmap_is_served_while_the_breaker_is_open():
+    ai = FakeAIService({"roadmap_steps": ["learn SQL"]})
+    generator = LearningRoadmapGenerator(ai)
+    generator._get_ai_roadmap("Data Scientist", ["SQL"])
+    ai.response = dict(PLACEHOLDER)
+    for i in range(generator._ai_breaker.max_failures):
+        generator._get_ai_roadmap("Data Scientist", [f"skill{i}"])
+    assert not generator._ai_breaker.allow()
+    assert generator._get_ai_roadmap("Data Scientist", ["SQL"]) == {"roadmap_steps": ["learn SQL"]}
+
+
+def test_cache_hit_does_not_use_up_the_half_open_trial():
+    ai = FakeAIService({"roadmap_steps": ["learn SQL"]})
+    generator = LearningRoadmapGenerator(ai)
+    generator._get_ai_roadmap("Data Scientist", ["SQL"])
+    breaker = generator._ai_breaker
+    breaker.failures, breaker.open_until = breaker.max_failures, 1.0  # cool-down long over
+    generator._get_ai_roadmap("Data Scientist", ["SQL"])
+    assert not breaker.half_open
+    # The trial goes to the next real call, which closes the circuit
+    generator._get_ai_roadmap("Data Scientist", ["Python"])
+    assert ai.calls == 2
+    assert breaker.open_until == 0.0
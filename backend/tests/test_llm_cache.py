@@ -0,0 +1,119 @@
+"""LLMCache: LRU order, TTL, copies, thread safety and background persistence"""
+
+import json
+import os
+import threading
+from datetime import timedelta
+
+import pytest
+
+from llm_cache import LLMCache
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "llm_cache.json")
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LLMCache(path=None, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_hits_and_misses_are_counted():
+    cache = LLMCache(path=None)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("missing")
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.clear()
+    assert (cache.hits, cache.misses) == (0, 0)
+    assert cache.get("a") is None
+
+
+def test_expired_entry_is_a_miss():
+    cache = LLMCache(path=None, ttl=timedelta(seconds=-1))
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+
+def test_stored_and_returned_responses_are_copies():
+    cache = LLMCache(path=None)
+    response = {"skills": ["python"]}
+    cache.set("a", response)
+    response["skills"].append("sql")
+    first = cache.get("a")
+    first["skills"].append("go")
+    assert cache.get("a") == {"skills": ["python"]}
+
+
+def test_concurrent_sets_respect_the_size_limit():
+    cache = LLMCache(path=None, max_entries=50)
+
+    def worker(n):
+        for i in range(200):
+            cache.set(f"{n}-{i}", i)
+            cache.get(f"{n}-{i // 2}")
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(cache._entries) == 50
+
+
+def test_saves_are_deferred_until_flush(cache_path, monkeypatch):
+    monkeypatch.setattr(LLMCache, "SAVE_DELAY", 60)
+    cache = LLMCache(path=cache_path)
+    cache.set("a", {"answer": 1})
+    cache.set("b", {"answer": 2})
+    assert not os.path.exists(cache_path)
+    cache.flush()
+    assert cache._save_timer is None
+    with open(cache_path) as f:
+        assert [entry["inputHash"] for entry in json.load(f)] == ["a", "b"]
+
+
+def test_background_save_writes_one_file(cache_path, monkeypatch):
+    monkeypatch.setattr(LLMCache, "SAVE_DELAY", 0.01)
+    cache = LLMCache(path=cache_path)
+    cache.set("a", 1)
+    timer = cache._save_timer
+    timer.join(timeout=5)
+    # The temp file is renamed into place, nothing is left behind
+    assert os.listdir(os.path.dirname(cache_path)) == ["llm_cache.json"]
+
+
+def test_entries_survive_a_restart(cache_path):
+    cache = LLMCache(path=cache_path)
+    cache.set("a", {"answer": 1}, model="gemini-pro")
+    cache.flush()
+    reloaded = LLMCache(path=cache_path)
+    assert reloaded.get("a") == {"answer": 1}
+
+
+def test_stale_prompt_version_and_expired_entries_are_not_loaded(cache_path):
+    cache = LLMCache(path=cache_path)
+    cache.set("a", 1)
+    cache.flush()
+    with open(cache_path) as f:
+        entries = json.load(f)
+    entries.append(dict(entries[0], inputHash="old", promptVersion="v0"))
+    entries.append(dict(entries[0], inputHash="expired", expiresAt="2000-01-01T00:00:00"))
+    with open(cache_path, "w") as f:
+        json.dump(entries, f)
+
+    reloaded = LLMCache(path=cache_path)
+    assert list(reloaded._entries) == ["a"]
+
+
+def test_unreadable_cache_file_is_ignored(cache_path):
+    with open(cache_path, "w") as f:
+        f.write("{not json")
+    assert LLMCache(path=cache_path).get("a") is None
@@ -0,0 +1,116 @@
+"""Semantic cache: near-duplicate roadmaps hit, resume prompts never do"""
+
+import copy
+import hashlib
+
+import numpy as np
+import pytest
+
+from ai_service import AIService
+from config import get_settings
+from llm_cache import LLMCache, SemanticCache
+
+
+class FakeEncoder:
+    """Bag-of-words stand-in for MiniLM that, like it, only reads the first 256 tokens"""
+
+    DIM = 512
+    MAX_TOKENS = 256
+
+    def encode(self, texts, normalize_embeddings=True):
+        rows = np.zeros((len(texts), self.DIM))
+        for row, text in zip(rows, texts):
+            for word in text.lower().replace(",", " ").split()[:self.MAX_TOKENS]:
+                row[int(hashlib.md5(word.encode()).hexdigest(), 16) % self.DIM] += 1
+            norm = np.linalg.norm(row)
+            if norm:
+                row /= norm
+        return rows
+
+
+# Two different people's resumes from the same template: identical for far
+# more than the encoder's 256-token window, yet within the prompt budget
+TEMPLATE = " ".join(f"w{i % 7}" for i in range(300))
+RESUME_A = TEMPLATE + " built payment apis in django for a fintech startup"
+RESUME_B = TEMPLATE + " triaged icu patients and managed medication charting"
+JOB = "Backend developer with Python and REST APIs"
+SKILLS = ["Docker", "Kubernetes", "AWS", "Terraform"]
+
+
+@pytest.fixture
+def service():
+    svc = AIService()
+    svc.cache = LLMCache(path=None)
+    svc.semantic_cache = SemanticCache(FakeEncoder(), threshold=0.92)
+    svc.hf_available, svc.gemini_available, svc.ai_enabled = True, False, True
+    svc.provider_calls = []
+
+    def fake_huggingface(prompt, task):
+        svc.provider_calls.append(prompt)
+        return {"answer": len(svc.provider_calls)}
+
+    svc._call_huggingface = fake_huggingface
+    return svc
+
+
+def test_semantic_cache_reuses_the_given_encoder():
+    settings = copy.copy(get_settings())
+    settings.huggingface_api_key = "hf_test"
+    encoder = FakeEncoder()
+    assert AIService(settings).semantic_cache is None
+    assert AIService(settings, encoder=encoder).semantic_cache._model is encoder
+
+
+def test_resumes_sharing_a_template_embed_alike():
+    # Why resume prompts must not use the semantic cache
+    a, b = FakeEncoder().encode([RESUME_A, RESUME_B])
+    assert a @ b > 0.99
+
+
+@pytest.mark.parametrize("call", [
+    lambda svc, resume: svc.analyze_resume(resume, JOB),
+    lambda svc, resume: svc.get_role_recommendations(resume, "Backend Developer"),
+    lambda svc, resume: svc.get_resume_improvement_advice(resume, JOB),
+])
+def test_resume_prompts_never_share_a_response(service, call):
+    first = call(service, RESUME_A)
+    second = call(service, RESUME_B)
+    assert len(service.provider_calls) == 2
+    assert first != second
+    assert service.semantic_cache.hits == service.semantic_cache.misses == 0
+
+
+def test_reordered_skill_list_hits(service):
+    first = service.generate_learning_roadmap(SKILLS, "DevOps Engineer")
+    second = service.generate_learning_roadmap(SKILLS[::-1], "DevOps Engineer")
+    assert len(service.provider_calls) == 1
+    assert second == first
+    assert service.semantic_cache.hits == 1
+
+
+def test_different_skills_do_not_hit(service):
+    service.generate_learning_roadmap(SKILLS, "DevOps Engineer")
+    service.generate_learning_roadmap(["Figma", "Branding", "Typography"], "DevOps Engineer")
+    assert len(service.provider_calls) == 2
+
+
+def test_hit_requires_the_same_role(service):
+    service.generate_learning_roadmap(SKILLS, "DevOps Engineer")
+    service.generate_learning_roadmap(SKILLS[::-1], "Backend Developer")
+    assert len(service.provider_calls) == 2
+
+
+def test_hit_requires_the_same_task():
+    cache = SemanticCache(FakeEncoder())
+    vecs = cache.embed(["docker, kubernetes"])
+    cache.set(vecs, "roadmap", {"answer": 1}, scope="DevOps Engineer")
+    assert cache.get(vecs, "roadmap", "DevOps Engineer") == {"answer": 1}
+    assert cache.get(vecs, "chat", "DevOps Engineer") is None
+
+
+def test_prompts_without_semantic_fields_only_use_the_exact_cache(service):
+    service._call_ai("Suggest something for Docker, AWS", task="suggestions")
+    service._call_ai("Suggest something for AWS, Docker", task="suggestions")
+    assert len(service.provider_calls) == 2
+    service._call_ai("Suggest something for Docker, AWS", task="suggestions")
+    assert len(service.provider_calls) == 2
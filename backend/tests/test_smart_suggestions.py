@@ -0,0 +1,23 @@
+"""SmartSuggestionGenerator hands out copies of its shared suggestion tables"""
+
+import copy
+
+import pytest
+
+from smart_suggestions import SmartSuggestionGenerator
+
+
+class FakeAIService:
+    ai_enabled = False
+
+
+@pytest.mark.parametrize("role", ["Software Engineer", "Backend Developer", "Data Scientist"])
+def test_editing_suggestions_does_not_change_later_ones(role):
+    generator = SmartSuggestionGenerator(FakeAIService())
+    first = generator.generate_suggestions({}, role, "senior", [])
+    expected = copy.deepcopy(first)
+    for key in ("projects_to_build", "topics_to_learn", "certifications"):
+        first[key][0]["name"] = "tampered"
+        first[key][0].setdefault("skills", []).append("tampered")
+        first[key].clear()
+    assert generator.generate_suggestions({}, role, "senior", []) == expected